@@ -122,6 +122,9 @@ def main():
     
     # Render the current page
     page_manager.render()
+    
+    # Save the session so it survives reconnects
+    page_manager.save_session()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
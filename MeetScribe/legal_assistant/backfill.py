@@ -0,0 +1,111 @@
+"""
+Reprocess archived meeting transcripts through the OpenAI Batch API and store the results.
+
+Run from this directory, for example:
+
+    python backfill.py                          # every meeting with an archived transcript
+    python backfill.py --meetings m1,m2 --local # against the local stand-in server
+    python backfill.py --resume data/batches/batch_20250423_101500.json
+
+All meetings go into one batch, billed at the batch price and outside the
+interactive rate limits. The batch can take up to its completion window to
+finish; if this script stops while waiting, ``--resume`` picks the job up
+from its manifest. Results are ingested into the shared workspace the same
+way as the Re-run Analysis button, and the workspace is saved.
+"""
+import argparse
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+import openai
+
+from models.legal_tasks import LegalTaskManager
+from services.batch_analyzer import BatchAnalyzer, BatchJob, BATCH_POLL_INTERVAL
+from services.local_batch_server import LocalBatchServer
+from services.transcript_archive import TranscriptArchive
+from services.workspace import get_workspace
+
+def load_transcripts(meeting_ids=None):
+    """Load the archived transcripts of the given meetings, or of every meeting that has one."""
+    snapshot = get_workspace().snapshot()
+    archive = TranscriptArchive()
+    wanted = set(meeting_ids) if meeting_ids else None
+
+    transcripts = {}
+    for meeting in snapshot.meetings:
+        if wanted is not None and meeting.id not in wanted:
+            continue
+        if not archive.has(meeting.id):
+            print(f"Skipping {meeting.id}: no archived transcript")
+            continue
+        transcript_data = archive.load(meeting.id)
+        transcript_data["speaker_analytics"] = meeting.speaker_analytics
+        transcripts[meeting.id] = transcript_data
+    return transcripts
+
+def ingest(results, transcripts=None):
+    """Store each meeting's batch results in the shared workspace."""
+    workspace = get_workspace()
+    transcripts = transcripts or {}
+    for meeting_id, ai_results in results.items():
+        meeting = workspace.snapshot().get_meeting_by_id(meeting_id)
+        if meeting is None:
+            print(f"Skipping {meeting_id}: meeting no longer exists")
+            continue
+        transcript_data = transcripts.get(meeting_id) or {"speaker_analytics": meeting.speaker_analytics}
+        ids = workspace.update(LegalTaskManager.process_ai_results, meeting_id, meeting.title, ai_results,
+                               transcript_data)
+        print(f"Ingested {meeting_id}: {len(ids['action_ids'])} actions, {len(ids['insight_ids'])} insights")
+    workspace.save()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--meetings", help="comma-separated meeting ids; defaults to every archived meeting")
+    parser.add_argument("--resume", help="manifest of a submitted batch to wait for and ingest")
+    parser.add_argument("--prepare-only", action="store_true", help="write the batch file without submitting it")
+    parser.add_argument("--local", action="store_true", help="submit to a local stand-in server instead of OpenAI")
+    parser.add_argument("--poll-interval", type=float, default=BATCH_POLL_INTERVAL)
+    parser.add_argument("--timeout", type=float, help="give up waiting after this many seconds")
+    args = parser.parse_args(argv)
+
+    server = LocalBatchServer().start() if args.local else None
+    try:
+        client = openai.OpenAI(api_key="local", base_url=server.url) if server else None
+        analyzer = BatchAnalyzer(client=client, poll_interval=1.0 if server else args.poll_interval)
+
+        transcripts = None
+        if args.resume:
+            job = BatchJob.load(args.resume)
+        else:
+            transcripts = load_transcripts(args.meetings.split(",") if args.meetings else None)
+            if not transcripts:
+                print("No archived transcripts to reprocess")
+                return 1
+            job = analyzer.prepare(transcripts)
+            if args.prepare_only:
+                return 0
+            analyzer.submit(job)
+
+        try:
+            batch = analyzer.wait(job, args.timeout)
+        except TimeoutError as e:
+            print(f"{str(e)}; resume with --resume {job.manifest_path}")
+            return 1
+        if batch.status != "completed":
+            # An expired batch still returns the requests it got through
+            print(f"Batch {job.batch_id} ended as {batch.status}")
+            if not batch.output_file_id:
+                return 1
+
+        ingest(analyzer.collect(job, batch), transcripts)
+        return 0
+    finally:
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+"""
+Load test for the Streamlit app: simulates concurrent users against a synthetic workspace.
+
+Run from this directory, for example:
+
+    python load_test.py --levels 1,2,4,8,16 --rounds 3 --meetings 100 --slo-ms 1000
+
+The app is served by a real Streamlit server in a separate process, seeded
+with a synthetic workspace. Each simulated user is a websocket client that
+speaks the browser's protocol: it opens its own session, picks pages from
+the sidebar and opens Meeting Details with a meeting's View Details button,
+so every run goes through ``PageManager.render`` as a browser's would.
+Users run concurrently, so their script runs overlap on the server's
+threads as real sessions do.
+
+A run's latency is measured from sending the rerun to receiving the
+server's script-finished message: the wait for a thread and the interpreter,
+the render and the delivery of its output. The report gives per-page
+latency percentiles and throughput at each concurrency level, memory per
+session and the first level whose p95 latency misses the latency SLO.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import websockets
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.testing.v1 import AppTest
+
+from config import LEGAL_DOMAINS
+from models.legal_tasks import (
+    LegalTaskManager, LegalAction, LegalInsight, MeetingRecord, ACTION_STATUSES, IMPORTANCE_RANK, PRIORITY_RANK
+)
+import services.session_store as session_store
+import services.workspace as shared_workspace
+from utils.tracing import set_exporter
+
+APP_PATH = os.path.join(APP_DIR, "app.py")
+PAGES = ("Dashboard", "Action Items", "Legal Insights", "Meeting Details")
+PERCENTILES = (50, 90, 95, 99)
+
+# A level degrades once its p95 end-to-end latency is above this many milliseconds
+LATENCY_SLO_MS = 1000.0
+RUN_TIMEOUT = 120
+SERVER_START_TIMEOUT = 60
+
+_WORDS = ("contract", "renewal", "vendor", "GDPR", "consent", "audit", "license", "board", "shareholder",
+          "patent", "trademark", "dispute", "settlement", "policy", "privacy", "breach", "indemnity",
+          "clause", "supplier", "safety", "inspection", "filing", "deadline", "review", "approval")
+
+def build_synthetic_workspace(meetings: int = 50, actions_per_meeting: int = 8, insights_per_meeting: int = 6,
+                              seed: int = 7) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Generate a task manager snapshot (``LegalTaskManager.to_dict`` output) with random records."""
+    rng = random.Random(seed)
+    manager = LegalTaskManager()
+    domains = list(LEGAL_DOMAINS.keys())
+    start = datetime.now() - timedelta(days=2 * meetings)
+
+    def sentence(length: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(length)).capitalize()
+
+    for m in range(meetings):
+        meeting_id = f"load_meeting_{m}"
+        held_at = start + timedelta(days=2 * m)
+        meeting_domains = rng.sample(domains, k=min(3, len(domains)))
+        manager.add_meeting(MeetingRecord(
+            id=meeting_id,
+            title=f"Synthetic Meeting {m}",
+            date=held_at.strftime("%Y-%m-%d"),
+            bot_id=meeting_id,
+            participants=[f"Speaker {i}" for i in range(rng.randint(2, 6))],
+            duration=rng.randint(900, 5400),
+            transcript_summary=sentence(40),
+            domains_processed=meeting_domains,
+            has_action_items=actions_per_meeting > 0,
+            has_insights=insights_per_meeting > 0,
+            created_at=held_at.isoformat()
+        ))
+        for i in range(actions_per_meeting):
+            due = held_at + timedelta(days=rng.randint(1, 60))
+            manager.add_action(LegalAction(
+                id=f"act-{meeting_id}-{i}",
+                domain=rng.choice(meeting_domains),
+                title=sentence(5),
+                description=f"{sentence(18)} ({meeting_id} #{i})",
+                priority=rng.choice(list(PRIORITY_RANK)),
+                deadline=due.strftime("%B %d, %Y"),
+                due_date=due.strftime("%Y-%m-%d"),
+                status=rng.choice(ACTION_STATUSES),
+                source_meetings=[meeting_id],
+                created_at=held_at.isoformat()
+            ))
+        for i in range(insights_per_meeting):
+            domain = rng.choice(meeting_domains)
+            manager.add_insight(LegalInsight(
+                id=f"ins-{meeting_id}-{i}",
+                domain=domain,
+                title=sentence(5),
+                description=f"{sentence(24)} ({meeting_id} #{i})",
+                source_meeting=meeting_id,
+                importance=rng.choice(list(IMPORTANCE_RANK)),
+                tags=[domain],
+                created_at=held_at.isoformat()
+            ))
+    return manager.to_dict()
+
+def _run_failed(message: ForwardMsg) -> bool:
+    """Whether a forward message shows an exception raised by the script."""
+    return message.WhichOneof("type") == "delta" and message.delta.WhichOneof("type") == "new_element" and \
+        message.delta.new_element.WhichOneof("type") == "exception"
+
+class SimulatedUser:
+    """One browser session, driven over the app's websocket, that visits each page in turn."""
+
+    def __init__(self, user_id: int, url: str, rng: random.Random):
+        self.user_id = user_id
+        self.url = url
+        self.rng = rng
+        self.session_id = f"{user_id:04d}{rng.getrandbits(112):028x}"
+        self.errors = 0
+        self._websocket = None
+        self._navigation_id = None
+        self._widgets: Dict[str, WidgetState] = {}
+        self._view_buttons: List[str] = []
+
+    async def open(self) -> float:
+        """Connect and load the landing page, which renders the sidebar used for navigation."""
+        self._websocket = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return await self._run()
+
+    async def close(self):
+        if self._websocket is not None:
+            await self._websocket.close()
+
+    async def visit(self, page: str) -> Dict[str, float]:
+        """Go to a page the way a user would; returns the latency of each page rendered on the way."""
+        latencies = {}
+        if page == "Meeting Details":
+            # Meeting Details opens from a meeting's View Details button on Meeting History
+            latencies["Meeting History"] = await self._select("Meeting History")
+            if self._view_buttons:
+                latencies[page] = await self._run(trigger=self.rng.choice(self._view_buttons))
+        else:
+            latencies[page] = await self._select(page)
+        return latencies
+
+    async def _select(self, page: str) -> float:
+        self._widgets[self._navigation_id] = WidgetState(id=self._navigation_id, string_value=page)
+        return await self._run()
+
+    async def _run(self, trigger: Optional[str] = None) -> float:
+        """Rerun the script with the session's widget values and return the seconds until it finished."""
+        message = BackMsg()
+        message.rerun_script.query_string = f"session={self.session_id}"
+        message.rerun_script.widget_states.widgets.extend(self._widgets.values())
+        if trigger:
+            message.rerun_script.widget_states.widgets.append(WidgetState(id=trigger, trigger_value=True))
+
+        started = time.perf_counter()
+        await self._websocket.send(message.SerializeToString())
+        buttons = []
+        while True:
+            reply = ForwardMsg()
+            reply.ParseFromString(await asyncio.wait_for(self._websocket.recv(), RUN_TIMEOUT))
+            kind = reply.WhichOneof("type")
+            if _run_failed(reply):
+                self.errors += 1
+            elif kind == "delta" and reply.delta.WhichOneof("type") == "new_element":
+                element = reply.delta.new_element
+                if element.WhichOneof("type") == "radio" and self._navigation_id is None:
+                    self._navigation_id = element.radio.id
+                elif element.WhichOneof("type") == "button" and "-view_" in element.button.id:
+                    buttons.append(element.button.id)
+            elif kind == "script_finished" and reply.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                self._view_buttons = buttons
+                return time.perf_counter() - started
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    values = np.percentile(np.asarray(samples) * 1000, PERCENTILES)
+    result = {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, values)}
+    result["mean"] = round(float(np.mean(samples) * 1000), 1)
+    result["samples"] = len(samples)
+    return result
+
+def measure_session_memory(workspace: Dict[str, Any], sessions: int = 3, seed: int = 7) -> float:
+    """
+    Return the average bytes retained per session after it has rendered every page once.
+
+    Sessions run one after another in this process as headless ``AppTest``
+    sessions of the app, so allocations can be traced.
+    """
+    meeting_ids = list(workspace.get("meetings", {}))
+
+    def tour(rng: random.Random):
+        app = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+        app.run()
+        for page in PAGES:
+            if page == "Meeting Details":
+                app.sidebar.radio[0].set_value("Meeting History").run()
+                if meeting_ids:
+                    app.button(key=f"view_{rng.choice(meeting_ids)}").click().run()
+            else:
+                app.sidebar.radio[0].set_value(page).run()
+        return app
+
+    # Import modules and fill process-wide caches first so they are not counted against a session
+    tour(random.Random(seed))
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        apps = [tour(random.Random(seed + i)) for i in range(sessions)]
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del apps
+    return retained / max(sessions, 1)
+
+async def run_level(url: str, users: int, rounds: int, seed: int = 7) -> Dict[str, Any]:
+    """Run ``users`` concurrent sessions through ``rounds`` passes over the pages."""
+    sessions = [SimulatedUser(i, url, random.Random(seed + i)) for i in range(users)]
+    latencies = defaultdict(list)
+
+    async def drive(user: SimulatedUser):
+        await user.open()
+        # Start each user on a different page so requests for different pages interleave
+        order = list(PAGES[user.user_id % len(PAGES):] + PAGES[:user.user_id % len(PAGES)])
+        for _ in range(rounds):
+            for page in order:
+                for visited, elapsed in (await user.visit(page)).items():
+                    latencies[visited].append(elapsed)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(drive(user) for user in sessions))
+    finally:
+        await asyncio.gather(*(user.close() for user in sessions), return_exceptions=True)
+    wall = time.perf_counter() - started
+
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "users": users,
+        "renders": len(all_samples),
+        "throughput": round(len(all_samples) / wall, 2) if wall else 0.0,
+        "errors": sum(user.errors for user in sessions),
+        "overall": _percentiles(all_samples),
+        "pages": {page: _percentiles(samples) for page, samples in sorted(latencies.items())}
+    }
+
+def find_degradation(levels: List[Dict[str, Any]], slo_ms: float = LATENCY_SLO_MS) -> Optional[int]:
+    """Return the first user count whose p95 end-to-end latency is above ``slo_ms``, or None."""
+    for level in levels:
+        if level["overall"].get("p95", 0.0) > slo_ms:
+            return level["users"]
+    return None
+
+def print_report(report: Dict[str, Any]):
+    workspace = report["workspace"]
+    print(f"\nWorkspace: {workspace['meetings']} meetings, {workspace['actions']} actions, "
+          f"{workspace['insights']} insights")
+    print(f"Memory per session: {report['memory_per_session'] / 1024 / 1024:.1f} MiB")
+    print(f"\n{'users':>5} {'page':<16} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for level in report["levels"]:
+        for page, stats in list(level["pages"].items()) + [("all", level["overall"])]:
+            if not stats:
+                continue
+            print(f"{level['users']:>5} {page:<16} {stats['p50']:>8.1f} {stats['p90']:>8.1f} "
+                  f"{stats['p95']:>8.1f} {stats['p99']:>8.1f}")
+        print(f"{'':>5} {level['throughput']} renders/s, {level['errors']} errors\n")
+
+    if report["degrades_at"]:
+        print(f"Latency degrades at {report['degrades_at']} concurrent users "
+              f"(p95 above the {report['slo_ms']:g} ms SLO).")
+    else:
+        print(f"p95 latency stayed within the {report['slo_ms']:g} ms SLO at the levels tested.")
+
+def serve(port: int, store_dir: str, trace: bool):
+    """Serve the app on ``port`` from the workspace saved in ``store_dir``; runs until the process is stopped."""
+    from streamlit.web import bootstrap
+
+    # The app runs in this process, so its singletons can be pointed at the load test's store first
+    session_store._store = session_store.SessionSnapshotStore(root_dir=store_dir)
+    if not trace:
+        set_exporter(None)
+
+    flag_options = {
+        "server.port": port,
+        "server.address": "127.0.0.1",
+        "server.headless": True,
+        "server.enableXsrfProtection": False,
+        "server.fileWatcherType": "none",
+        "browser.gatherUsageStats": False
+    }
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(APP_PATH, False, [], flag_options)
+
+def start_server(store_dir: str, trace: bool) -> Tuple[subprocess.Popen, str]:
+    """Start the app server in a child process and wait until it is healthy; returns it and its websocket URL."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    command = [sys.executable, os.path.abspath(__file__), "--serve", str(port), "--store-dir", store_dir]
+    server = subprocess.Popen(command + (["--trace"] if trace else []), cwd=APP_DIR,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server, f"ws://127.0.0.1:{port}/_stcore/stream"
+        except OSError:
+            if server.poll() is not None or time.monotonic() >= deadline:
+                server.kill()
+                raise RuntimeError("The app server did not start")
+            time.sleep(0.5)
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of the Legal Assistant app.")
+    parser.add_argument("--levels", default="1,2,4,8", help="comma-separated concurrent user counts")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the pages per user")
+    parser.add_argument("--meetings", type=int, default=50)
+    parser.add_argument("--actions-per-meeting", type=int, default=8)
+    parser.add_argument("--insights-per-meeting", type=int, default=6)
+    parser.add_argument("--memory-sessions", type=int, default=3, help="sessions used to measure memory")
+    parser.add_argument("--slo-ms", type=float, default=LATENCY_SLO_MS, help="p95 latency target per page run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--trace", action="store_true", help="keep exporting spans during the run")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--store-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.store_dir, args.trace)
+        return {}
+
+    levels = sorted({int(level) for level in args.levels.split(",") if level.strip()})
+
+    # Keep session snapshots out of the app's data directory, and skip span export unless asked
+    snapshot_dir = tempfile.mkdtemp(prefix="load_test_sessions_")
+    session_store._store = session_store.SessionSnapshotStore(root_dir=snapshot_dir)
+    if not args.trace:
+        set_exporter(None)
+
+    server = None
+    try:
+        workspace = build_synthetic_workspace(args.meetings, args.actions_per_meeting,
+                                              args.insights_per_meeting, args.seed)
+        shared_workspace._workspace = shared_workspace.SharedWorkspace(session_store._store)
+        shared_workspace._workspace.reset(LegalTaskManager.from_dict(workspace))
+        print(f"Measuring memory over {args.memory_sessions} sessions...")
+        memory = measure_session_memory(workspace, args.memory_sessions, args.seed)
+
+        # The server loads the workspace from its own snapshot store, as the app does at startup
+        server_store = os.path.join(snapshot_dir, "server")
+        session_store.SessionSnapshotStore(root_dir=server_store).save(shared_workspace.WORKSPACE_SNAPSHOT_ID,
+                                                                      workspace)
+        print("Starting the app server...")
+        server, url = start_server(server_store, args.trace)
+
+        # One session first, so module imports and caches are not counted against the first level
+        asyncio.run(run_level(url, 1, 1, args.seed - 1))
+
+        results = []
+        for users in levels:
+            print(f"Running {users} concurrent users x {args.rounds} rounds...")
+            results.append(asyncio.run(run_level(url, users, args.rounds, args.seed)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    report = {
+        "workspace": {collection: len(records) for collection, records in workspace.items()},
+        "memory_per_session": memory,
+        "levels": results,
+        "slo_ms": args.slo_ms,
+        "degrades_at": find_degradation(results, args.slo_ms)
+    }
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Containers whose copies share storage until they change, for copy-on-write snapshots.
+"""
+from collections.abc import MutableMapping, Sequence
+from itertools import chain
+from typing import Any, Iterable, Iterator, List, Optional, Set
+
+# A write after a copy copies one shard or chunk, not the whole container
+SHARDS = 64
+CHUNK_SIZE = 512
+
+
+class ShardedDict(MutableMapping):
+    """
+    A dict split into shards by key hash.
+
+    ``copy`` shares every shard with the copy, and each side copies a shard
+    before its first change to it, so the first write after a copy costs
+    one shard's size rather than the whole dict's. Iteration follows the
+    shards, not insertion order.
+    """
+
+    def __init__(self, items: Any = (), shards: int = SHARDS):
+        self._shards: List[dict] = [{} for _ in range(shards)]
+        # Shards this side may change in place; None means all of them
+        self._owned: Optional[Set[int]] = None
+        self._len = 0
+        self.update(items)
+
+    def copy(self) -> "ShardedDict":
+        clone = ShardedDict.__new__(ShardedDict)
+        clone._shards = list(self._shards)
+        clone._len = self._len
+        clone._owned = set()
+        self._owned = set()
+        return clone
+
+    def _shard(self, key: Any) -> dict:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _writable_shard(self, key: Any) -> dict:
+        index = hash(key) % len(self._shards)
+        if self._owned is not None and index not in self._owned:
+            self._shards[index] = dict(self._shards[index])
+            self._owned.add(index)
+        return self._shards[index]
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._shard(key)[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._shard(key).get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._shard(key)
+
+    def __setitem__(self, key: Any, value: Any):
+        shard = self._writable_shard(key)
+        if key not in shard:
+            self._len += 1
+        shard[key] = value
+
+    def __delitem__(self, key: Any):
+        if key not in self._shard(key):
+            raise KeyError(key)
+        del self._writable_shard(key)[key]
+        self._len -= 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(list(shard) for shard in self._shards)
+
+    def __repr__(self) -> str:
+        return f"ShardedDict({dict(self.items())!r})"
+
+
+class ShardedSet:
+    """A set split into shards by hash, copied shard by shard like ``ShardedDict``."""
+
+    def __init__(self, items: Iterable[Any] = ()):
+        self._items = ShardedDict()
+        for item in items:
+            self.add(item)
+
+    def copy(self) -> "ShardedSet":
+        clone = ShardedSet.__new__(ShardedSet)
+        clone._items = self._items.copy()
+        return clone
+
+    def add(self, item: Any):
+        if item not in self._items:
+            self._items[item] = None
+
+    def discard(self, item: Any):
+        if item in self._items:
+            del self._items[item]
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"ShardedSet({set(self)!r})"
+
+
+class ChunkedList(Sequence):
+    """
+    An append-only list stored in fixed-size chunks.
+
+    ``copy`` shares every chunk with the copy, and each side copies a chunk
+    before its first change to it. Items can be appended or replaced by
+    position, but not inserted or removed, which keeps positions stable.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._chunks: List[list] = []
+        # Chunks this side may change in place; None means all of them
+        self._owned: Optional[Set[int]] = None
+        self._len = 0
+        for item in items:
+            self.append(item)
+
+    def copy(self) -> "ChunkedList":
+        clone = ChunkedList.__new__(ChunkedList)
+        clone.chunk_size = self.chunk_size
+        clone._chunks = list(self._chunks)
+        clone._len = self._len
+        clone._owned = set()
+        self._owned = set()
+        return clone
+
+    def _writable_chunk(self, index: int) -> list:
+        if self._owned is not None and index not in self._owned:
+            self._chunks[index] = list(self._chunks[index])
+            self._owned.add(index)
+        return self._chunks[index]
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("list index out of range")
+        return index
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        chunk, offset = divmod(self._position(index), self.chunk_size)
+        return self._chunks[chunk][offset]
+
+    def __setitem__(self, index: int, value: Any):
+        chunk, offset = divmod(self._position(index), self.chunk_size)
+        self._writable_chunk(chunk)[offset] = value
+
+    def append(self, item: Any):
+        if self._chunks and len(self._chunks[-1]) < self.chunk_size:
+            self._writable_chunk(len(self._chunks) - 1).append(item)
+        else:
+            self._chunks.append([item])
+            if self._owned is not None:
+                self._owned.add(len(self._chunks) - 1)
+        self._len += 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._chunks)
+
+    def __repr__(self) -> str:
+        return f"ChunkedList({list(self)!r})"
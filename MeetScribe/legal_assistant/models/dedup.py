@@ -0,0 +1,177 @@
+"""
+Content fingerprinting and near-duplicate detection for actions and insights.
+"""
+import hashlib
+import random
+import re
+import zlib
+from typing import List, MutableMapping, Optional, Set, Tuple
+
+from models.cow import ShardedDict
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_STOPWORDS = frozenset([
+    "a", "an", "and", "any", "all", "as", "at", "be", "by", "for", "from", "in",
+    "into", "is", "it", "of", "on", "or", "our", "that", "the", "their", "this",
+    "to", "we", "with"
+])
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and collapse it to alphanumeric tokens."""
+    return " ".join(_TOKEN_RE.findall((text or "").lower()))
+
+
+def content_fingerprint(text: str) -> str:
+    """Return a stable fingerprint for exact-match deduplication."""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hash the word n-grams of a text into a set of 32-bit shingles."""
+    tokens = [t for t in normalize_text(text).split() if t not in _STOPWORDS]
+    if not tokens:
+        return set()
+
+    # Short texts fall back to a single shingle of all their words
+    size = min(size, len(tokens))
+    return {
+        zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8"))
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+class MinHasher:
+    """Computes MinHash signatures that estimate Jaccard similarity of shingle sets."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set: Set[int]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set."""
+        if not shingle_set:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingle_set)
+            for a, b in self._params
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimate the Jaccard similarity of two signatures."""
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class DuplicateIndex:
+    """
+    Index of record texts that finds exact and near duplicates.
+
+    Exact matches are found through content fingerprints. Near matches use
+    MinHash signatures bucketed with locality-sensitive hashing, so a lookup
+    only compares against records that share at least one band.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._fingerprints: MutableMapping[str, str] = ShardedDict()
+        self._signatures: MutableMapping[str, Tuple[int, ...]] = ShardedDict()
+        self._record_keys: MutableMapping[str, Tuple[str, List[Tuple[int, int]]]] = ShardedDict()
+        self._buckets: MutableMapping[Tuple[int, int], Set[str]] = ShardedDict()
+
+        # Keys of the buckets this index may change in place; None means all of them.
+        # A copy shares its source's bucket sets and copies each one before changing it.
+        self._private_buckets: Optional[Set[Tuple[int, int]]] = None
+
+    def copy(self) -> "DuplicateIndex":
+        """Return an independent copy of the index, sharing the hasher, shards and bucket sets until they change."""
+        clone = DuplicateIndex.__new__(DuplicateIndex)
+        clone.threshold = self.threshold
+        clone.bands = self.bands
+        clone.rows = self.rows
+        clone.hasher = self.hasher
+        clone._fingerprints = self._fingerprints.copy()
+        clone._signatures = self._signatures.copy()
+        clone._record_keys = self._record_keys.copy()
+        clone._buckets = self._buckets.copy()
+        clone._private_buckets = set()
+        self._private_buckets = set()
+        return clone
+
+    def _writable_bucket(self, key: Tuple[int, int]) -> Set[str]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = set()
+        elif self._private_buckets is not None and key not in self._private_buckets:
+            bucket = self._buckets[key] = set(bucket)
+        if self._private_buckets is not None:
+            self._private_buckets.add(key)
+        return bucket
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        return [
+            (band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def find(self, text: str) -> Optional[str]:
+        """Return the id of a record duplicating ``text``, if any."""
+        fingerprint = content_fingerprint(text)
+        if fingerprint in self._fingerprints:
+            return self._fingerprints[fingerprint]
+
+        signature = self.hasher.signature(shingles(text))
+        best_id, best_score = None, self.threshold
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        for record_id in candidates:
+            score = MinHasher.similarity(signature, self._signatures[record_id])
+            if score >= best_score:
+                best_id, best_score = record_id, score
+
+        return best_id
+
+    def add(self, record_id: str, text: str):
+        """Register a record's text under its id."""
+        self.remove(record_id)
+
+        fingerprint = content_fingerprint(text)
+        signature = self.hasher.signature(shingles(text))
+        band_keys = self._band_keys(signature)
+
+        self._fingerprints.setdefault(fingerprint, record_id)
+        self._signatures[record_id] = signature
+        self._record_keys[record_id] = (fingerprint, band_keys)
+        for key in band_keys:
+            self._writable_bucket(key).add(record_id)
+
+    def remove(self, record_id: str):
+        """Remove a record from the index."""
+        if record_id not in self._record_keys:
+            return
+
+        fingerprint, band_keys = self._record_keys.pop(record_id)
+        self._signatures.pop(record_id, None)
+        if self._fingerprints.get(fingerprint) == record_id:
+            del self._fingerprints[fingerprint]
+        for key in band_keys:
+            if record_id in self._buckets.get(key, ()):
+                bucket = self._writable_bucket(key)
+                bucket.discard(record_id)
+                if not bucket:
+                    del self._buckets[key]
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Sorted due-date index for answering "due soon" and "overdue" queries.
+"""
+from bisect import bisect_left, insort
+from datetime import date
+from typing import List, MutableMapping, Optional, Tuple
+
+from models.cow import CHUNK_SIZE, ShardedDict
+
+
+class DueDateIndex:
+    """
+    Record IDs ordered by due date.
+
+    Entries are ``(date ordinal, record id)`` pairs kept sorted across
+    chunks of at most twice ``CHUNK_SIZE``, so a range of due dates is found
+    with binary searches and read off as slices. A copy shares its source's
+    chunks and copies one before changing it. Each record has at most one
+    entry; adding it again moves it.
+    """
+
+    def __init__(self):
+        self._chunks: List[List[Tuple[int, str]]] = []
+        # Last entry of each chunk, for finding the chunk an entry belongs in
+        self._maxes: List[Tuple[int, str]] = []
+        # Whether this index may change each chunk in place
+        self._owned: List[bool] = []
+        self._due_by_id: MutableMapping[str, int] = ShardedDict()
+
+    def copy(self) -> "DueDateIndex":
+        """Return an independent copy of the index, sharing chunks until they change."""
+        clone = DueDateIndex()
+        clone._chunks = list(self._chunks)
+        clone._maxes = list(self._maxes)
+        clone._owned = [False] * len(self._chunks)
+        self._owned = [False] * len(self._chunks)
+        clone._due_by_id = self._due_by_id.copy()
+        return clone
+
+    def _writable_chunk(self, position: int) -> List[Tuple[int, str]]:
+        if not self._owned[position]:
+            self._chunks[position] = list(self._chunks[position])
+            self._owned[position] = True
+        return self._chunks[position]
+
+    def _ids_between(self, low: Tuple[int, str], high: Tuple[int, str]) -> List[str]:
+        """Return the IDs of entries from ``low`` up to but excluding ``high``."""
+        ids = []
+        for position in range(bisect_left(self._maxes, low), len(self._chunks)):
+            chunk = self._chunks[position]
+            stop = bisect_left(chunk, high)
+            ids.extend(record_id for _, record_id in chunk[bisect_left(chunk, low):stop])
+            if stop < len(chunk):
+                break
+        return ids
+
+    def __len__(self) -> int:
+        return len(self._due_by_id)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._due_by_id
+
+    def add(self, record_id: str, due: date):
+        """Index a record under its due date, replacing any earlier entry."""
+        self.remove(record_id)
+        entry = (due.toordinal(), record_id)
+        self._due_by_id[record_id] = entry[0]
+        if not self._chunks:
+            self._chunks.append([entry])
+            self._maxes.append(entry)
+            self._owned.append(True)
+            return
+        position = min(bisect_left(self._maxes, entry), len(self._chunks) - 1)
+        chunk = self._writable_chunk(position)
+        insort(chunk, entry)
+        self._maxes[position] = chunk[-1]
+        if len(chunk) > 2 * CHUNK_SIZE:
+            self._chunks[position:position + 1] = [chunk[:CHUNK_SIZE], chunk[CHUNK_SIZE:]]
+            self._maxes[position:position + 1] = [chunk[CHUNK_SIZE - 1], chunk[-1]]
+            self._owned[position:position + 1] = [True, True]
+
+    def remove(self, record_id: str):
+        """Drop a record from the index; unknown IDs are ignored."""
+        ordinal = self._due_by_id.pop(record_id, None)
+        if ordinal is None:
+            return
+        entry = (ordinal, record_id)
+        position = bisect_left(self._maxes, entry)
+        if position == len(self._chunks):
+            return
+        offset = bisect_left(self._chunks[position], entry)
+        if offset == len(self._chunks[position]) or self._chunks[position][offset] != entry:
+            return
+        chunk = self._writable_chunk(position)
+        del chunk[offset]
+        if chunk:
+            self._maxes[position] = chunk[-1]
+        else:
+            del self._chunks[position], self._maxes[position], self._owned[position]
+
+    def due_date(self, record_id: str) -> Optional[date]:
+        ordinal = self._due_by_id.get(record_id)
+        return date.fromordinal(ordinal) if ordinal is not None else None
+
+    def between(self, start: date, end: date) -> List[str]:
+        """Return the IDs due from ``start`` to ``end`` inclusive, soonest first."""
+        return self._ids_between((start.toordinal(), ""), (end.toordinal() + 1, ""))
+
+    def before(self, day: date) -> List[str]:
+        """Return the IDs due strictly before ``day``, oldest first."""
+        return self._ids_between((0, ""), (day.toordinal(), ""))
+
+    def next_due(self) -> Optional[date]:
+        """Return the earliest indexed due date."""
+        return date.fromordinal(self._chunks[0][0][0]) if self._chunks else None
@@ -1,11 +1,59 @@
 """
 Legal task definitions and handlers for processing meeting insights.
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+import copy
+from datetime import datetime, date, timedelta
 import json
 
+from models.cow import ChunkedList, ShardedDict, ShardedSet
+from models.dedup import DuplicateIndex, content_fingerprint
+from models.due_index import DueDateIndex
+from models.rollups import RollupStore
+from utils.deadlines import parse_deadline, normalize_deadlines, match_deadline
+from utils.speaker_analytics import compute_speaker_analytics
+from utils.tracing import traced
+
+PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+IMPORTANCE_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+ACTION_STATUSES = ("pending", "in_progress", "completed", "cancelled")
+
+# Actions in these statuses are left out of the due-date index
+CLOSED_STATUSES = ("completed", "cancelled")
+
+# Fields with an inverted index (value -> record IDs) used to filter large lists
+ACTION_INDEX_FIELDS = ("domain", "status", "priority")
+INSIGHT_INDEX_FIELDS = ("domain", "importance")
+
+# Methods that change a task manager; a shared workspace applies these to a copy
+WRITE_METHODS = frozenset([
+    "add_meeting", "add_action", "add_insight", "upsert_action", "upsert_insight",
+    "process_ai_results", "begin_meeting", "ingest_domain_results", "complete_meeting",
+    "set_action_deadline", "update_action_status", "bulk_update_actions"
+])
+
+def _record_text(record) -> str:
+    """The text an action or insight is deduplicated on."""
+    return record.description or record.title
+
+def _content_id(prefix: str, meeting_id: str, domain_key: str, text: str) -> str:
+    """Build a record ID from its meeting, domain and text, so re-analysis maps the same item to the same ID."""
+    return f"{prefix}-{meeting_id}-{domain_key}-{content_fingerprint(text)[:12]}"
+
+def _copy_record(record):
+    """Copy a record along with its list and dict fields, so changing the copy leaves the original alone."""
+    clone = copy.copy(record)
+    for record_field in fields(record):
+        value = getattr(record, record_field.name)
+        if isinstance(value, (list, dict)):
+            setattr(clone, record_field.name, copy.copy(value))
+    return clone
+
+def _copy_field_index(field_index: Dict[str, Dict[Any, ShardedSet]]) -> Dict[str, Dict[Any, ShardedSet]]:
+    return {field_name: {value: ids.copy() for value, ids in buckets.items()}
+            for field_name, buckets in field_index.items()}
+
 @dataclass
 class LegalAction:
     """Represents a legal follow-up action derived from meeting insights."""
@@ -15,8 +63,10 @@ class LegalAction:
     description: str
     priority: str  # "high", "medium", "low"
     deadline: Optional[str] = None
+    due_date: Optional[str] = None  # ISO date parsed from the deadline
     status: str = "pending"  # "pending", "in_progress", "completed", "cancelled"
     assignee: Optional[str] = None
+    source_meetings: List[str] = field(default_factory=list)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
@@ -29,8 +79,10 @@ class LegalAction:
             "description": self.description,
             "priority": self.priority,
             "deadline": self.deadline,
+            "due_date": self.due_date,
             "status": self.status,
             "assignee": self.assignee,
+            "source_meetings": self.source_meetings,
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -45,8 +97,13 @@ class LegalInsight:
     source_meeting: str
     importance: str  # "critical", "high", "medium", "low"
     tags: List[str] = field(default_factory=list)
+    source_meetings: List[str] = field(default_factory=list)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
+    def __post_init__(self):
+        if self.source_meeting and not self.source_meetings:
+            self.source_meetings = [self.source_meeting]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert insight to dictionary."""
         return {
@@ -57,6 +114,7 @@ class LegalInsight:
             "source_meeting": self.source_meeting,
             "importance": self.importance,
             "tags": self.tags,
+            "source_meetings": self.source_meetings,
             "created_at": self.created_at
         }
 
@@ -73,6 +131,8 @@ class MeetingRecord:
     domains_processed: List[str]
     has_action_items: bool
     has_insights: bool
+    speaker_analytics: Dict[str, Any] = field(default_factory=dict)
+    deadlines: List[Dict[str, Any]] = field(default_factory=list)
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_dict(self) -> Dict[str, Any]:
@@ -88,116 +148,534 @@ class MeetingRecord:
             "domains_processed": self.domains_processed,
             "has_action_items": self.has_action_items,
             "has_insights": self.has_insights,
+            "speaker_analytics": self.speaker_analytics,
+            "deadlines": self.deadlines,
             "created_at": self.created_at
         }
 
 class LegalTaskManager:
-    """Manages legal tasks, insights and meeting records."""
+    """
+    Manages legal tasks, insights and meeting records.
+    
+    ``copy`` freezes this manager and returns one that shares its records
+    and indexes. Collections and indexes are stored in shards, and the copy
+    copies a shard only when it first changes it, so a change costs the
+    shards it touches rather than the whole state. A frozen manager rejects
+    changes; shared workspace snapshots are frozen.
+    """
+    
+    # Containers a copy shares with its source until it first changes them, with how to copy each
+    _SHARED_CONTAINERS = {
+        "actions": ChunkedList.copy,
+        "insights": ChunkedList.copy,
+        "meetings": ChunkedList.copy,
+        "_actions_by_id": ShardedDict.copy,
+        "_insights_by_id": ShardedDict.copy,
+        "_action_positions": ShardedDict.copy,
+        "_insight_positions": ShardedDict.copy,
+        "_action_index": DuplicateIndex.copy,
+        "_insight_index": DuplicateIndex.copy,
+        "_action_fields": _copy_field_index,
+        "_insight_fields": _copy_field_index,
+        "_due_index": DueDateIndex.copy,
+        "rollups": RollupStore.copy
+    }
     
     def __init__(self):
-        self.actions = []
-        self.insights = []
-        self.meetings = []
+        self.actions = ChunkedList()
+        self.insights = ChunkedList()
+        self.meetings = ChunkedList()
+        self._actions_by_id = ShardedDict()
+        self._insights_by_id = ShardedDict()
+        self._action_positions = ShardedDict()
+        self._insight_positions = ShardedDict()
+        self._action_index = DuplicateIndex()
+        self._insight_index = DuplicateIndex()
+        self._action_fields = {field_name: {} for field_name in ACTION_INDEX_FIELDS}
+        self._insight_fields = {field_name: {} for field_name in INSIGHT_INDEX_FIELDS}
+        self._due_index = DueDateIndex()
+        
+        # Time-bucketed counts for trend charts, kept current as records change
+        self.rollups = RollupStore()
+        
+        # Bumped on every change so callers can tell when the state needs saving
+        self.revision = 0
+        
+        # Copy-on-write bookkeeping: containers still shared with the source of a copy, and
+        # the (kind, ID) of records this manager owns. None means it owns every record.
+        self._shared = set()
+        self._owned_records = None
+        self.frozen = False
+    
+    def copy(self) -> "LegalTaskManager":
+        """
+        Return a manager with the same contents that shares records and indexes until it changes them.
+        
+        Freezes this manager, since the shared shards may only change through the copy.
+        """
+        self.freeze()
+        clone = LegalTaskManager.__new__(LegalTaskManager)
+        clone.__dict__.update(self.__dict__)
+        clone._shared = set(self._SHARED_CONTAINERS)
+        clone._owned_records = set()
+        clone.frozen = False
+        return clone
+    
+    def freeze(self):
+        """Reject any further changes, so the manager can be read safely from many threads."""
+        self.frozen = True
+    
+    def _touch(self):
+        """Count a change, refusing it on a frozen manager."""
+        if self.frozen:
+            raise RuntimeError("Task manager snapshots are read-only; apply changes through the shared workspace")
+        self.revision += 1
+    
+    def _writable(self, name: str):
+        """Return a container for changing, first copying it if it is still shared."""
+        if name in self._shared:
+            self._shared.discard(name)
+            setattr(self, name, self._SHARED_CONTAINERS[name](getattr(self, name)))
+        return getattr(self, name)
+    
+    def _own(self, kind: str, record_id: str):
+        if self._owned_records is not None:
+            self._owned_records.add((kind, record_id))
+    
+    def _writable_record(self, kind: str, record):
+        """Return a record for changing, first replacing it with a private copy if it is shared."""
+        if self._owned_records is None or (kind, record.id) in self._owned_records:
+            return record
+        clone = _copy_record(record)
+        if kind == "meeting":
+            meetings = self._writable("meetings")
+            meetings[next(i for i, meeting in enumerate(meetings) if meeting is record)] = clone
+        else:
+            self._writable(f"{kind}s")[getattr(self, f"_{kind}_positions")[record.id]] = clone
+            self._writable(f"_{kind}s_by_id")[record.id] = clone
+        self._own(kind, record.id)
+        return clone
+    
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Convert all records to dictionaries keyed by collection and ID."""
+        return {
+            "actions": {action.id: action.to_dict() for action in self.actions},
+            "insights": {insight.id: insight.to_dict() for insight in self.insights},
+            "meetings": {meeting.id: meeting.to_dict() for meeting in self.meetings}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Dict[str, Any]]]) -> "LegalTaskManager":
+        """Rebuild a task manager, including its lookup and duplicate indexes, from ``to_dict`` output."""
+        manager = cls()
+        for record in data.get("meetings", {}).values():
+            manager.add_meeting(MeetingRecord(**record))
+        for record in data.get("actions", {}).values():
+            manager.add_action(LegalAction(**record))
+        for record in data.get("insights", {}).values():
+            manager.add_insight(LegalInsight(**record))
+        manager.revision = 0
+        return manager
     
     def add_meeting(self, meeting: MeetingRecord) -> str:
-        """Add a meeting record and return its ID."""
-        self.meetings.append(meeting)
+        """Add a meeting record, replacing any existing record with the same ID."""
+        self._touch()
+        self._own("meeting", meeting.id)
+        meetings = self._writable("meetings")
+        for i, existing in enumerate(meetings):
+            if existing.id == meeting.id:
+                meetings[i] = meeting
+                return meeting.id
+        meetings.append(meeting)
         return meeting.id
     
     def add_action(self, action: LegalAction) -> str:
         """Add an action and return its ID."""
-        self.actions.append(action)
+        self._touch()
+        self._own("action", action.id)
+        self._writable("_action_positions")[action.id] = len(self.actions)
+        self._writable("actions").append(action)
+        self._writable("_actions_by_id")[action.id] = action
+        self._writable("_action_index").add(action.id, action.description or action.title)
+        self._index_fields(self._writable("_action_fields"), action)
+        self._index_due_date(action)
+        self._writable("rollups").add("action", action.created_at, action.domain, action.priority, action.status)
         return action.id
     
     def add_insight(self, insight: LegalInsight) -> str:
         """Add an insight and return its ID."""
-        self.insights.append(insight)
+        self._touch()
+        self._own("insight", insight.id)
+        self._writable("_insight_positions")[insight.id] = len(self.insights)
+        self._writable("insights").append(insight)
+        self._writable("_insights_by_id")[insight.id] = insight
+        self._writable("_insight_index").add(insight.id, insight.description or insight.title)
+        self._index_fields(self._writable("_insight_fields"), insight)
+        self._writable("rollups").add("insight", insight.created_at, insight.domain, insight.importance)
         return insight.id
     
+    @staticmethod
+    def _index_fields(field_index: Dict[str, Dict[Any, ShardedSet]], record):
+        for field_name, buckets in field_index.items():
+            buckets.setdefault(getattr(record, field_name), ShardedSet()).add(record.id)
+    
+    def _index_due_date(self, action: LegalAction):
+        """Keep an action in the due-date index while it is open and has a due date."""
+        due = None
+        if action.due_date and action.status not in CLOSED_STATUSES:
+            try:
+                due = date.fromisoformat(action.due_date)
+            except ValueError:
+                pass
+        if due is None:
+            if action.id in self._due_index:
+                self._writable("_due_index").remove(action.id)
+        elif self._due_index.due_date(action.id) != due:
+            self._writable("_due_index").add(action.id, due)
+    
+    @staticmethod
+    def _set_indexed_field(field_index: Dict[str, Dict[Any, ShardedSet]], record, field_name: str, value: Any):
+        """Change an indexed field, moving the record to the matching index bucket."""
+        old_value = getattr(record, field_name)
+        if old_value == value:
+            return
+        field_index[field_name].get(old_value, ShardedSet()).discard(record.id)
+        field_index[field_name].setdefault(value, ShardedSet()).add(record.id)
+        setattr(record, field_name, value)
+    
+    def _set_action_field(self, action: LegalAction, field_name: str, value: Any):
+        """Change an action's status or priority, keeping its indexes and rollups in step."""
+        old = (action.domain, action.priority, action.status)
+        if getattr(action, field_name) == value:
+            return
+        self._set_indexed_field(self._writable("_action_fields"), action, field_name, value)
+        self._writable("rollups").move("action", action.created_at, old, (action.domain, action.priority, action.status))
+    
+    def _set_insight_importance(self, insight: LegalInsight, importance: str):
+        """Change an insight's importance, keeping its indexes and rollups in step."""
+        old = (insight.domain, insight.importance, "")
+        if insight.importance == importance:
+            return
+        self._set_indexed_field(self._writable("_insight_fields"), insight, "importance", importance)
+        self._writable("rollups").move("insight", insight.created_at, old, (insight.domain, insight.importance, ""))
+    
+    @staticmethod
+    def _query(records: List[Any], field_index: Dict[str, Dict[Any, ShardedSet]],
+               filters: Dict[str, Optional[List[Any]]]) -> List[Any]:
+        """Intersect the index buckets for each filter, keeping records in insertion order."""
+        matched_ids = None
+        for field_name, values in filters.items():
+            if values is None:
+                continue
+            buckets = field_index[field_name]
+            ids = set().union(*(buckets.get(value, set()) for value in values))
+            matched_ids = ids if matched_ids is None else matched_ids & ids
+            if not matched_ids:
+                return []
+        
+        if matched_ids is None or len(matched_ids) == len(records):
+            return list(records)
+        return [record for record in records if record.id in matched_ids]
+    
+    def query_actions(self, domains: Optional[List[str]] = None, statuses: Optional[List[str]] = None,
+                      priorities: Optional[List[str]] = None) -> List[LegalAction]:
+        """Get the actions matching every given filter; a filter of None matches everything."""
+        return self._query(self.actions, self._action_fields,
+                           {"domain": domains, "status": statuses, "priority": priorities})
+    
+    def query_insights(self, domains: Optional[List[str]] = None,
+                       importances: Optional[List[str]] = None) -> List[LegalInsight]:
+        """Get the insights matching every given filter; a filter of None matches everything."""
+        return self._query(self.insights, self._insight_fields,
+                           {"domain": domains, "importance": importances})
+    
+    def upsert_action(self, action: LegalAction) -> str:
+        """
+        Add an action unless it duplicates an existing one.
+        
+        An action is a duplicate when it has the same ID and text (the same
+        meeting processed again) or its text matches an existing action
+        exactly or nearly. Duplicates are merged into the existing record,
+        which keeps links to every source meeting. Returns the ID of the
+        stored action.
+        """
+        existing = self._actions_by_id.get(action.id)
+        fingerprint = content_fingerprint(_record_text(action))
+        if existing is not None and content_fingerprint(_record_text(existing)) != fingerprint:
+            # The ID was used for other text, e.g. a positional ID from an earlier analysis
+            action.id = f"{action.id}-{fingerprint[:8]}"
+            existing = self._actions_by_id.get(action.id)
+        if existing is None:
+            duplicate_id = self._action_index.find(action.description or action.title)
+            existing = self._actions_by_id.get(duplicate_id) if duplicate_id else None
+        
+        if existing is None:
+            return self.add_action(action)
+        
+        self._touch()
+        existing = self._writable_record("action", existing)
+        for meeting_id in action.source_meetings:
+            if meeting_id not in existing.source_meetings:
+                existing.source_meetings.append(meeting_id)
+        if PRIORITY_RANK.get(action.priority, 0) > PRIORITY_RANK.get(existing.priority, 0):
+            self._set_action_field(existing, "priority", action.priority)
+        if action.deadline and not existing.deadline:
+            existing.deadline = action.deadline
+        if action.due_date and not existing.due_date:
+            existing.due_date = action.due_date
+            self._index_due_date(existing)
+        existing.updated_at = datetime.now().isoformat()
+        return existing.id
+    
+    def upsert_insight(self, insight: LegalInsight) -> str:
+        """
+        Add an insight unless it duplicates an existing one.
+        
+        Uses the same matching rules as ``upsert_action``. Merged insights
+        keep the highest importance and the union of tags.
+        """
+        existing = self._insights_by_id.get(insight.id)
+        fingerprint = content_fingerprint(_record_text(insight))
+        if existing is not None and content_fingerprint(_record_text(existing)) != fingerprint:
+            insight.id = f"{insight.id}-{fingerprint[:8]}"
+            existing = self._insights_by_id.get(insight.id)
+        if existing is None:
+            duplicate_id = self._insight_index.find(insight.description or insight.title)
+            existing = self._insights_by_id.get(duplicate_id) if duplicate_id else None
+        
+        if existing is None:
+            return self.add_insight(insight)
+        
+        self._touch()
+        existing = self._writable_record("insight", existing)
+        for meeting_id in insight.source_meetings:
+            if meeting_id not in existing.source_meetings:
+                existing.source_meetings.append(meeting_id)
+        if IMPORTANCE_RANK.get(insight.importance, 0) > IMPORTANCE_RANK.get(existing.importance, 0):
+            self._set_insight_importance(existing, insight.importance)
+        for tag in insight.tags:
+            if tag not in existing.tags:
+                existing.tags.append(tag)
+        return existing.id
+    
+    @traced()
     def process_ai_results(self, meeting_id: str, meeting_title: str, 
-                          ai_results: Dict[str, Any]) -> Dict[str, List[str]]:
-        """Process AI analysis results to create actions and insights."""
+                          ai_results: Dict[str, Any],
+                          transcript_data: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
+        """
+        Process AI analysis results to create actions and insights.
+        
+        When the transcript is given, its speaker analytics are stored on the
+        meeting record so participants, duration and talk time are available
+        without recomputing them.
+        """
         action_ids = []
         insight_ids = []
         
+        self.begin_meeting(meeting_id, meeting_title, transcript_data)
+        
         # Extract domain-specific results
-        domains_processed = []
         for domain_key, domain_results in ai_results.get("domains", {}).items():
-            domains_processed.append(domain_key)
-            
-            # Process actions
-            if isinstance(domain_results, dict) and "action_items" in domain_results:
-                for i, action_item in enumerate(domain_results["action_items"]):
-                    if isinstance(action_item, str):
-                        # Simple string action
-                        action = LegalAction(
-                            id=f"act-{meeting_id}-{domain_key}-{i}",
-                            domain=domain_key,
-                            title=action_item[:50] + "..." if len(action_item) > 50 else action_item,
-                            description=action_item,
-                            priority="medium"  # Default priority
-                        )
-                    elif isinstance(action_item, dict):
-                        # Structured action
-                        action = LegalAction(
-                            id=f"act-{meeting_id}-{domain_key}-{i}",
-                            domain=domain_key,
-                            title=action_item.get("title", "Untitled Action"),
-                            description=action_item.get("description", ""),
-                            priority=action_item.get("priority", "medium"),
-                            deadline=action_item.get("deadline")
-                        )
-                    
-                    action_ids.append(self.add_action(action))
-            
-            # Process key issues as insights
-            if isinstance(domain_results, dict) and "key_issues" in domain_results:
-                for i, issue in enumerate(domain_results["key_issues"]):
-                    if isinstance(issue, str):
-                        insight = LegalInsight(
-                            id=f"ins-{meeting_id}-{domain_key}-{i}",
-                            domain=domain_key,
-                            title=issue[:50] + "..." if len(issue) > 50 else issue,
-                            description=issue,
-                            source_meeting=meeting_id,
-                            importance="medium",
-                            tags=[domain_key]
-                        )
-                    elif isinstance(issue, dict):
-                        insight = LegalInsight(
-                            id=f"ins-{meeting_id}-{domain_key}-{i}",
-                            domain=domain_key,
-                            title=issue.get("title", "Untitled Insight"),
-                            description=issue.get("description", ""),
-                            source_meeting=meeting_id,
-                            importance=issue.get("importance", "medium"),
-                            tags=[domain_key] + issue.get("tags", [])
-                        )
-                    
-                    insight_ids.append(self.add_insight(insight))
+            domain_ids = self.ingest_domain_results(meeting_id, domain_key, domain_results)
+            action_ids.extend(i for i in domain_ids["action_ids"] if i not in action_ids)
+            insight_ids.extend(i for i in domain_ids["insight_ids"] if i not in insight_ids)
+        
+        self.complete_meeting(meeting_id, ai_results.get("summary", "No summary available"))
+        
+        return {
+            "action_ids": action_ids,
+            "insight_ids": insight_ids,
+            "meeting_id": meeting_id
+        }
+    
+    @traced()
+    def begin_meeting(self, meeting_id: str, meeting_title: str,
+                      transcript_data: Optional[Dict[str, Any]] = None) -> MeetingRecord:
+        """
+        Create the record for a meeting whose results will be ingested domain by domain.
+        
+        A meeting that is analyzed again keeps its date, bot and creation
+        time, so its relative deadlines and trend buckets stay where they were.
+        """
+        # Use analytics computed at ingest, falling back to utterance-level timings
+        speaker_analytics = {}
+        if isinstance(transcript_data, dict):
+            speaker_analytics = transcript_data.get("speaker_analytics") or \
+                compute_speaker_analytics(transcript_data.get("transcript", []))
+        
+        previous = self.get_meeting_by_id(meeting_id)
+        if previous and not speaker_analytics:
+            speaker_analytics = previous.speaker_analytics
         
         # Create meeting record
         meeting = MeetingRecord(
             id=meeting_id,
             title=meeting_title,
-            date=datetime.now().strftime("%Y-%m-%d"),
-            bot_id=meeting_id,  # Using meeting_id as bot_id for simplicity
-            participants=[],  # Would extract from transcript in real app
-            duration=0,  # Would calculate from transcript in real app
-            transcript_summary=ai_results.get("summary", "No summary available"),
-            domains_processed=domains_processed,
-            has_action_items=len(action_ids) > 0,
-            has_insights=len(insight_ids) > 0
+            date=previous.date if previous else datetime.now().strftime("%Y-%m-%d"),
+            bot_id=previous.bot_id if previous else meeting_id,  # Using meeting_id as bot_id for simplicity
+            participants=speaker_analytics.get("participants", []),
+            duration=speaker_analytics.get("duration", 0),
+            transcript_summary="Analysis in progress...",
+            domains_processed=[],
+            has_action_items=False,
+            has_insights=False,
+            speaker_analytics=speaker_analytics
         )
+        if previous:
+            meeting.created_at = previous.created_at
         
         self.add_meeting(meeting)
+        return meeting
+    
+    @traced()
+    def ingest_domain_results(self, meeting_id: str, domain_key: str,
+                              domain_results: Any) -> Dict[str, List[str]]:
+        """
+        Create actions and insights from one domain's analysis results.
+        
+        Can be called as soon as each domain finishes, so results show up
+        before the whole analysis is complete.
+        """
+        action_ids = []
+        insight_ids = []
+        
+        # Relative deadlines are resolved against the meeting date, and items date from the meeting
+        meeting = self.get_meeting_by_id(meeting_id)
+        anchor = meeting.date if meeting else None
+        created_at = meeting.created_at if meeting else datetime.now().isoformat()
+        
+        # Process actions
+        if isinstance(domain_results, dict) and "action_items" in domain_results:
+            for action_item in domain_results["action_items"]:
+                if isinstance(action_item, str):
+                    # Simple string action
+                    action = LegalAction(
+                        id=_content_id("act", meeting_id, domain_key, action_item),
+                        domain=domain_key,
+                        title=action_item[:50] + "..." if len(action_item) > 50 else action_item,
+                        description=action_item,
+                        priority="medium",  # Default priority
+                        source_meetings=[meeting_id],
+                        created_at=created_at
+                    )
+                elif isinstance(action_item, dict):
+                    # Structured action
+                    action = LegalAction(
+                        id=_content_id("act", meeting_id, domain_key,
+                                       action_item.get("description") or action_item.get("title", "")),
+                        domain=domain_key,
+                        title=action_item.get("title", "Untitled Action"),
+                        description=action_item.get("description", ""),
+                        priority=action_item.get("priority", "medium"),
+                        deadline=action_item.get("deadline"),
+                        due_date=self._parse_due_date(action_item.get("deadline"), anchor),
+                        source_meetings=[meeting_id],
+                        created_at=created_at
+                    )
+                else:
+                    continue
+                
+                action_id = self.upsert_action(action)
+                if action_id not in action_ids:
+                    action_ids.append(action_id)
+        
+        # Process key issues as insights
+        if isinstance(domain_results, dict) and "key_issues" in domain_results:
+            for issue in domain_results["key_issues"]:
+                if isinstance(issue, str):
+                    insight = LegalInsight(
+                        id=_content_id("ins", meeting_id, domain_key, issue),
+                        domain=domain_key,
+                        title=issue[:50] + "..." if len(issue) > 50 else issue,
+                        description=issue,
+                        source_meeting=meeting_id,
+                        importance="medium",
+                        tags=[domain_key],
+                        created_at=created_at
+                    )
+                elif isinstance(issue, dict):
+                    insight = LegalInsight(
+                        id=_content_id("ins", meeting_id, domain_key,
+                                       issue.get("description") or issue.get("title", "")),
+                        domain=domain_key,
+                        title=issue.get("title", "Untitled Insight"),
+                        description=issue.get("description", ""),
+                        source_meeting=meeting_id,
+                        importance=issue.get("importance", "medium"),
+                        tags=[domain_key] + issue.get("tags", []),
+                        created_at=created_at
+                    )
+                else:
+                    continue
+                
+                insight_id = self.upsert_insight(insight)
+                if insight_id not in insight_ids:
+                    insight_ids.append(insight_id)
+        
+        # Normalize the domain's deadlines and link each to the action it is about
+        deadlines = []
+        if isinstance(domain_results, dict) and isinstance(domain_results.get("deadlines"), list):
+            deadlines = self._link_deadlines(domain_results["deadlines"], action_ids, anchor)
+    
+        # Record the domain on the meeting
+        if meeting:
+            self._touch()
+            meeting = self._writable_record("meeting", meeting)
+            if domain_key not in meeting.domains_processed:
+                meeting.domains_processed.append(domain_key)
+            meeting.has_action_items = meeting.has_action_items or len(action_ids) > 0
+            meeting.has_insights = meeting.has_insights or len(insight_ids) > 0
+            meeting.deadlines.extend(dict(entry, domain=domain_key) for entry in deadlines)
         
         return {
             "action_ids": action_ids,
-            "insight_ids": insight_ids,
-            "meeting_id": meeting_id
+            "insight_ids": insight_ids
         }
     
+    @staticmethod
+    def _parse_due_date(deadline: Any, anchor: Optional[str]) -> Optional[str]:
+        due = parse_deadline(deadline, anchor) if isinstance(deadline, str) else None
+        return due.isoformat() if due else None
+    
+    def _link_deadlines(self, entries: List[Any], action_ids: List[str],
+                        anchor: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Parse a domain's ``deadlines`` entries and attach them to matching actions.
+        
+        Each entry is matched against the domain's actions by the words they
+        share. A matched action without a deadline of its own takes the
+        entry's text and date. Returns the normalized entries with the ID of
+        the linked action, if any.
+        """
+        candidates = []
+        for action_id in action_ids:
+            action = self._actions_by_id.get(action_id)
+            if action:
+                candidates.append((action_id, action.description or action.title))
+        
+        linked = []
+        for entry in normalize_deadlines(entries, anchor):
+            action_id = match_deadline(entry["text"], candidates)
+            action = self._actions_by_id.get(action_id) if action_id else None
+            if action and entry["due_date"] and not action.due_date:
+                self._touch()
+                action = self._writable_record("action", action)
+                action.deadline = action.deadline or entry["text"]
+                action.due_date = entry["due_date"]
+                self._index_due_date(action)
+            entry["action_id"] = action_id
+            linked.append(entry)
+        return linked
+    
+    @traced()
+    def complete_meeting(self, meeting_id: str, summary: Optional[str]):
+        """Store the executive summary once a meeting's analysis has finished."""
+        meeting = self.get_meeting_by_id(meeting_id)
+        if meeting:
+            self._touch()
+            meeting = self._writable_record("meeting", meeting)
+            meeting.transcript_summary = summary or "No summary available"
+    
     def get_meeting_by_id(self, meeting_id: str) -> Optional[MeetingRecord]:
         """Get a meeting record by ID."""
         for meeting in self.meetings:
@@ -205,29 +683,98 @@ class LegalTaskManager:
                 return meeting
         return None
     
+    def get_action_by_id(self, action_id: str) -> Optional[LegalAction]:
+        """Get an action by ID."""
+        return self._actions_by_id.get(action_id)
+    
+    def get_insight_by_id(self, insight_id: str) -> Optional[LegalInsight]:
+        """Get an insight by ID."""
+        return self._insights_by_id.get(insight_id)
+    
     def get_actions_by_meeting(self, meeting_id: str) -> List[LegalAction]:
         """Get all actions associated with a meeting."""
-        return [action for action in self.actions if meeting_id in action.id]
+        return [action for action in self.actions if meeting_id in action.source_meetings]
     
     def get_insights_by_meeting(self, meeting_id: str) -> List[LegalInsight]:
         """Get all insights associated with a meeting."""
-        return [insight for insight in self.insights if insight.source_meeting == meeting_id]
+        return [insight for insight in self.insights if meeting_id in insight.source_meetings]
     
     def get_actions_by_domain(self, domain: str) -> List[LegalAction]:
         """Get all actions for a specific legal domain."""
-        return [action for action in self.actions if action.domain == domain]
+        return self.query_actions(domains=[domain])
     
     def get_insights_by_domain(self, domain: str) -> List[LegalInsight]:
         """Get all insights for a specific legal domain."""
-        return [insight for insight in self.insights if insight.domain == domain]
+        return self.query_insights(domains=[domain])
+    
+    def due_within(self, days: int, today: Optional[date] = None) -> List[LegalAction]:
+        """Get the open actions due from today through the next ``days`` days, soonest first."""
+        today = today or date.today()
+        return [self._actions_by_id[i] for i in self._due_index.between(today, today + timedelta(days=days))]
+    
+    def overdue(self, today: Optional[date] = None) -> List[LegalAction]:
+        """Get the open actions whose due date has passed, most overdue first."""
+        return [self._actions_by_id[i] for i in self._due_index.before(today or date.today())]
+    
+    def set_action_deadline(self, action_id: str, deadline: Optional[str],
+                            anchor: Optional[str] = None) -> bool:
+        """Replace an action's deadline text and re-derive its due date."""
+        action = self._actions_by_id.get(action_id)
+        if action is None:
+            return False
+        self._touch()
+        action = self._writable_record("action", action)
+        action.deadline = deadline or None
+        action.due_date = self._parse_due_date(deadline, anchor or action.created_at)
+        action.updated_at = datetime.now().isoformat()
+        self._index_due_date(action)
+        return True
     
     def update_action_status(self, action_id: str, status: str, assignee: Optional[str] = None) -> bool:
         """Update the status of an action."""
-        for action in self.actions:
-            if action.id == action_id:
-                action.status = status
-                if assignee:
-                    action.assignee = assignee
-                action.updated_at = datetime.now().isoformat()
-                return True
-        return False
\ No newline at end of file
+        action = self._actions_by_id.get(action_id)
+        if action is None:
+            return False
+        self._touch()
+        action = self._writable_record("action", action)
+        self._set_action_field(action, "status", status)
+        self._index_due_date(action)
+        if assignee:
+            action.assignee = assignee
+        action.updated_at = datetime.now().isoformat()
+        return True
+    
+    def bulk_update_actions(self, action_ids: Optional[List[str]] = None,
+                            query: Optional[Dict[str, Any]] = None,
+                            status: Optional[str] = None, assignee: Optional[str] = None) -> List[str]:
+        """
+        Apply a status and/or assignee change to many actions in one pass.
+        
+        Targets the given ``action_ids``, or every action matching ``query``
+        (keyword arguments for ``query_actions``). The change counts as a
+        single revision, so the session snapshot records it in one write.
+        Unknown IDs are ignored. Returns the IDs of the updated actions.
+        """
+        if status is not None and status not in ACTION_STATUSES:
+            raise ValueError(f"Unknown action status: {status}")
+        if status is None and not assignee:
+            return []
+        
+        if action_ids is not None:
+            actions = [self._actions_by_id[i] for i in dict.fromkeys(action_ids) if i in self._actions_by_id]
+        else:
+            actions = self.query_actions(**(query or {}))
+        if not actions:
+            return []
+        
+        self._touch()
+        updated_at = datetime.now().isoformat()
+        for action in actions:
+            action = self._writable_record("action", action)
+            if status is not None:
+                self._set_action_field(action, "status", status)
+                self._index_due_date(action)
+            if assignee:
+                action.assignee = assignee
+            action.updated_at = updated_at
+        return [action.id for action in actions]
\ No newline at end of file
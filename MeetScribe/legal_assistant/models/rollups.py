@@ -0,0 +1,131 @@
+"""
+Incrementally maintained time-bucketed counts of actions and insights.
+"""
+from datetime import date, datetime
+from itertools import product
+from typing import Dict, List, MutableMapping, Optional, Set, Tuple
+
+from models.cow import ShardedDict
+
+GRANULARITIES = ("day", "week", "month")
+
+# Stands for "any value" of a dimension in a series key
+ALL = "*"
+
+
+def bucket_key(day: date, granularity: str) -> str:
+    """Return the label of the day, ISO week or month bucket a date falls in."""
+    if granularity == "day":
+        return day.isoformat()
+    if granularity == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return f"{day.year}-{day.month:02d}"
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _as_date(timestamp: str) -> date:
+    try:
+        return datetime.fromisoformat(str(timestamp)).date()
+    except ValueError:
+        return date.today()
+
+
+class RollupStore:
+    """
+    Counts of records per time bucket, domain, level and status.
+
+    A record is counted in the bucket of its creation date at every
+    granularity, under each combination of its own dimension values and the
+    ``ALL`` wildcard, so any filtered or unfiltered series is a single
+    dictionary lookup however many records there are. ``level`` is an
+    action's priority or an insight's importance. Adding a record or changing
+    one of its dimensions updates a fixed number of counters, and a copy
+    copies only the series those counters are in.
+    """
+
+    def __init__(self):
+        # (granularity, kind, domain, level, status) -> {bucket: count}
+        self._series: MutableMapping[Tuple[str, str, str, str, str], Dict[str, int]] = ShardedDict()
+        self._values: Dict[Tuple[str, str], set] = {}
+
+        # Keys of the series this store may change in place; None means all of them.
+        # A copy shares its source's series and copies each one before changing it.
+        self._private_series: Optional[Set[Tuple[str, str, str, str, str]]] = None
+
+    def copy(self) -> "RollupStore":
+        """Return an independent copy of the counts, sharing each series until it changes."""
+        clone = RollupStore()
+        clone._series = self._series.copy()
+        clone._values = {key: set(values) for key, values in self._values.items()}
+        clone._private_series = set()
+        self._private_series = set()
+        return clone
+
+    def _writable_series(self, key: Tuple[str, str, str, str, str]) -> Dict[str, int]:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = {}
+        elif self._private_series is not None and key not in self._private_series:
+            series = self._series[key] = dict(series)
+        if self._private_series is not None:
+            self._private_series.add(key)
+        return series
+
+    def _apply(self, kind: str, created_at: str, domain: str, level: str, status: str, delta: int):
+        day = _as_date(created_at)
+        buckets = {granularity: bucket_key(day, granularity) for granularity in GRANULARITIES}
+        for dimension, value in (("domain", domain), ("level", level), ("status", status)):
+            self._values.setdefault((kind, dimension), set()).add(value)
+
+        for dims in product((domain, ALL), (level, ALL), (status, ALL)):
+            for granularity, bucket in buckets.items():
+                series = self._writable_series((granularity, kind) + dims)
+                count = series.get(bucket, 0) + delta
+                if count > 0:
+                    series[bucket] = count
+                else:
+                    series.pop(bucket, None)
+
+    def add(self, kind: str, created_at: str, domain: str, level: str, status: str = ""):
+        """Count a new record."""
+        self._apply(kind, created_at, domain, level, status, 1)
+
+    def remove(self, kind: str, created_at: str, domain: str, level: str, status: str = ""):
+        """Stop counting a record."""
+        self._apply(kind, created_at, domain, level, status, -1)
+
+    def move(self, kind: str, created_at: str, old: Tuple[str, str, str], new: Tuple[str, str, str]):
+        """Re-count a record whose ``(domain, level, status)`` changed."""
+        if old != new:
+            self.remove(kind, created_at, *old)
+            self.add(kind, created_at, *new)
+
+    def series(self, kind: str, granularity: str, domain: str = ALL, level: str = ALL,
+               status: str = ALL) -> List[Tuple[str, int]]:
+        """Return ``(bucket, count)`` pairs in time order for the records matching the given dimensions."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        return sorted(self._series.get((granularity, kind, domain, level, status), {}).items())
+
+    def total(self, kind: str, domain: str = ALL, level: str = ALL, status: str = ALL) -> int:
+        """Return the number of records matching the given dimensions."""
+        return sum(self._series.get(("month", kind, domain, level, status), {}).values())
+
+    def dimension_values(self, kind: str, dimension: str) -> List[str]:
+        """Return the values seen for a dimension ("domain", "level" or "status") of a record kind."""
+        return sorted(self._values.get((kind, dimension), set()))
+
+    def breakdown(self, kind: str, granularity: str, dimension: str,
+                  filters: Optional[Dict[str, str]] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """Return one series per value of ``dimension``, with the other dimensions fixed by ``filters``."""
+        dims = {"domain": ALL, "level": ALL, "status": ALL}
+        dims.update(filters or {})
+        result = {}
+        for value in self.dimension_values(kind, dimension):
+            dims[dimension] = value
+            series = self.series(kind, granularity, **dims)
+            if series:
+                result[value] = series
+        return result
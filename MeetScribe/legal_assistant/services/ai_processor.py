@@ -3,22 +3,182 @@ AI processing service to analyze meeting transcripts and extract legal insights.
 """
 import openai
 import json
-from typing import Dict, Any, List, Optional, Tuple
+import queue
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterator
 import time
 from datetime import datetime
 
 from config import OPENAI_API_KEY, OPENAI_MODEL, LEGAL_DOMAINS
+from services.llm_scheduler import get_scheduler, estimate_tokens
+from services.llm_metrics import get_metrics, CallRecord, usage_counts
+from services.llm_hedging import HedgePolicy, HedgeCancelled
+from services.transcript_compressor import TranscriptCompressor, CompressionStats
+from services.prompt_templates import build_messages, get_template, render_cached, prefix_fingerprint
+from utils.json_repair import parse_json_response
+from utils.tracing import span, traced, propagate, current_span
+
+# What each domain call looks for, shared by the domain and cascade prompts
+DOMAIN_DESCRIPTIONS = {
+    "compliance": "Identify any compliance issues, regulatory concerns, ethical considerations, or workplace safety matters mentioned in the meeting.",
+    "contracts": "Extract information about contracts, renewals, legal documents, software licenses, or tech agreements discussed in the meeting.",
+    "ip_tech": "Identify discussions about intellectual property, software licensing, data privacy, cybersecurity, or technology law matters.",
+    "governance": "Extract information about board governance, shareholder matters, corporate structure, business strategy, or finance law topics.",
+    "litigation": "Identify any mentions of disputes, internal investigations, legal proceedings, or merger and acquisition activities."
+}
+
+# Keywords used by the local triage stage to decide which domains need an LLM call.
+# Each keyword matches as a word prefix, so "contract" also matches "contractor".
+DOMAIN_KEYWORDS = {
+    "compliance": ["compliance", "compliant", "regulat", "gdpr", "hipaa", "osha", "ethic",
+                   "safety", "audit", "policy", "policies", "consent", "violation"],
+    "contracts": ["contract", "agreement", "renewal", "renew", "clause", "vendor", "supplier",
+                  "license", "licensing", "nda", "terms", "indemn", "sla", "signature"],
+    "ip_tech": ["intellectual property", "patent", "trademark", "copyright", "trade secret",
+                "open source", "data privacy", "privacy", "cybersecurity", "breach", "encrypt",
+                "software licens", "personal data"],
+    "governance": ["board", "shareholder", "stockholder", "bylaw", "director", "governance",
+                   "resolution", "equity", "corporate structure", "subsidiar", "fiduciary"],
+    "litigation": ["litigat", "lawsuit", "dispute", "court", "plaintiff", "defendant", "subpoena",
+                   "investigation", "settlement", "arbitration", "merger", "acquisition", "sue"]
+}
+
+# Minimum number of keyword hits before a domain is sent to the LLM.
+# A threshold of 0 always sends the domain.
+DEFAULT_TRIAGE_THRESHOLDS = {domain_key: 1 for domain_key in DOMAIN_KEYWORDS}
+
+# Model cascade: a small model assesses every candidate domain in one call, and
+# only relevant or uncertain domains are escalated to the main model.
+DEFAULT_CASCADE_MODEL = "gpt-4o-mini"
+CASCADE_ESCALATION_THRESHOLD = 0.5   # escalate when relevance is at least this
+CASCADE_CONFIDENCE_THRESHOLD = 0.6   # escalate when the small model is less sure than this
+CASCADE_MAX_TOKENS = 2000
+
+# Seconds between checks that the workers of a streaming analysis are still running
+EVENT_POLL_INTERVAL = 1.0
+
+# Domain calls wait for the summary to start answering, so the provider has cached the
+# transcript prefix they share with it, but no longer than this many seconds
+PREFIX_WARM_TIMEOUT = 10.0
+
+# Retrieval Q&A: passages are added best first until this many (estimated) tokens are used
+QA_MAX_CONTEXT_TOKENS = 2000
+QA_MAX_PASSAGE_CHARS = 800
+QA_MAX_TOKENS = 600
+
+JSON_REASK_PROMPT = "Your previous reply was not valid JSON. Reply again with only the JSON object in the requested structure."
+
+# Models that rejected JSON mode, and process-wide counts of structured call outcomes
+_JSON_MODE_UNSUPPORTED = set()
+_json_outcomes = Counter()
+_json_outcomes_lock = threading.Lock()
+
+def get_json_outcome_counts() -> Dict[str, int]:
+    """Return how many structured calls were parsed, salvaged, retried, lost or failed."""
+    with _json_outcomes_lock:
+        return {
+            outcome: _json_outcomes.get(outcome, 0)
+            for outcome in ("parsed", "salvaged", "retried", "lost", "failed")
+        }
+
+def is_json_mode_error(error: Exception) -> bool:
+    """Whether a 400 from the API is a rejection of JSON mode, rather than of something else in the request."""
+    if getattr(error, "param", None) == "response_format":
+        return True
+    text = f"{getattr(error, 'code', '') or ''} {getattr(error, 'message', '') or str(error)}".lower()
+    return "response_format" in text or "json_object" in text or "json mode" in text
+
+def record_json_outcome(outcome: str):
+    """Count the outcome of one structured call."""
+    with _json_outcomes_lock:
+        _json_outcomes[outcome] += 1
 
 class AIProcessor:
     """Processes meeting transcripts using OpenAI to extract legal insights."""
     
-    def __init__(self):
+    def __init__(self, triage_thresholds: Optional[Dict[str, int]] = None, max_workers: int = 6,
+                 session_id: str = "default", cascade_model: Optional[str] = DEFAULT_CASCADE_MODEL,
+                 escalation_threshold: float = CASCADE_ESCALATION_THRESHOLD,
+                 confidence_threshold: float = CASCADE_CONFIDENCE_THRESHOLD,
+                 compress_transcripts: bool = True, hedge_policy: Optional[HedgePolicy] = None):
         self.api_key = OPENAI_API_KEY
         self.model = OPENAI_MODEL
+        self.cascade_model = cascade_model
+        self.escalation_threshold = escalation_threshold
+        self.confidence_threshold = confidence_threshold
+        self.max_workers = max_workers
+        self.session_id = session_id
+        self.scheduler = get_scheduler()
+        self.metrics = get_metrics()
+        self.compressor = TranscriptCompressor() if compress_transcripts else None
+        self.hedge_policy = hedge_policy
         openai.api_key = self.api_key
+        
+        # Retries are driven by the shared scheduler so 429s pause every session
+        openai.max_retries = 0
+        
+        self.triage_thresholds = dict(DEFAULT_TRIAGE_THRESHOLDS)
+        if triage_thresholds:
+            self.triage_thresholds.update(triage_thresholds)
+        self._triage_patterns = {
+            domain_key: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + ")", re.IGNORECASE)
+            for domain_key, keywords in DOMAIN_KEYWORDS.items()
+        }
+    
+    def process_transcript(self, transcript_data: Dict[str, Any],
+                           on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           priority: str = "interactive", meeting_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process a transcript to extract legal insights and action items.
+        
+        ``on_event`` is called with each event from ``stream_transcript`` as it
+        arrives, so callers can show partial results before the full analysis
+        is complete. ``priority`` is the scheduler class for the calls: "live",
+        "interactive" or "backfill". Token, cost and latency metrics for the
+        calls are recorded against ``meeting_id``.
+        """
+        for event in self.stream_transcript(transcript_data, priority=priority, meeting_id=meeting_id):
+            if on_event:
+                on_event(event)
+            if event["type"] == "done":
+                return event["results"]
+            if event["type"] == "error":
+                return {
+                    "error": event["error"],
+                    "processed_at": datetime.now().isoformat()
+                }
+        return {
+            "error": "Analysis finished without results",
+            "processed_at": datetime.now().isoformat()
+        }
     
-    def process_transcript(self, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a transcript to extract legal insights and action items."""
+    def stream_transcript(self, transcript_data: Dict[str, Any],
+                          priority: str = "interactive",
+                          meeting_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a transcript and yield events as results become available.
+        
+        The executive summary is sent first, and domain calls follow once its
+        first tokens arrive: by then the provider has cached the transcript
+        prefix the calls share, so they are billed and served from the cache.
+        When a cascade model is set, it assesses all candidate domains first
+        and only relevant or low-confidence domains are escalated to the main
+        model. Events are:
+        
+        - ``{"type": "summary_delta", "text": ...}`` for each streamed summary token chunk
+        - ``{"type": "cascade", "escalated": [...]}`` once the cascade model has assessed the domains
+        - ``{"type": "domain", "domain": ..., "result": ...}`` when a domain finishes
+        - ``{"type": "summary", "summary": ...}`` when the summary is complete
+        - ``{"type": "done", "results": ...}`` with the combined results, last
+        - ``{"type": "error", "error": ...}`` if the analysis could not run
+        """
+        # Usage and hedges in the results cover this run only, not earlier analyses of the meeting
+        run_started = datetime.now()
+        if self.hedge_policy and meeting_id:
+            self.hedge_policy.start_run(meeting_id)
         try:
             # Extract transcript content
             if isinstance(transcript_data, dict) and "transcript" in transcript_data:
@@ -26,33 +186,264 @@ class AIProcessor:
             else:
                 transcript_entries = transcript_data
             
-            # Format transcript for AI processing
-            formatted_transcript = self._format_transcript(transcript_entries)
+            # Format transcript for AI processing, compressed to cut prompt tokens
+            formatted_transcript, compression = self._prepare_transcript(transcript_entries)
+            
+            # Score domains locally so only relevant ones are sent to the LLM
+            triage_scores = self.triage_domains(transcript_entries)
+        except Exception as e:
+            yield {"type": "error", "error": str(e)}
+            return
+        
+        results = {}
+        skipped_calls = 0
+        events = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = []
+        deferred = []
+        prefix_warm = threading.Event()
+        
+        def submit(fn, *args):
+            futures.append(executor.submit(propagate(fn), *args))
+        
+        try:
+            # Stream the summary so its first tokens show up within about a second
+            summary_prompt = self._get_summary_prompt()
+            submit(self._run_summary, summary_prompt, formatted_transcript, events, priority, meeting_id,
+                   prefix_warm)
+            summary_sent = time.monotonic()
+            pending = 1
             
             # Process with OpenAI
-            results = {}
+            candidates = []
             for domain_key, domain_name in LEGAL_DOMAINS.items():
-                domain_prompt = self._get_domain_prompt(domain_key, domain_name, formatted_transcript)
-                domain_results = self._call_openai(domain_prompt)
-                results[domain_key] = domain_results
+                if triage_scores.get(domain_key, 0) < self.triage_thresholds.get(domain_key, 0):
+                    results[domain_key] = self._no_relevant_content(domain_name)
+                    skipped_calls += 1
+                    yield {"type": "domain", "domain": domain_key, "result": results[domain_key]}
+                    continue
+                candidates.append(domain_key)
+                pending += 1
             
-            # Generate overall summary
-            summary_prompt = self._get_summary_prompt(formatted_transcript)
-            summary = self._call_openai(summary_prompt)
+            if candidates and self.cascade_model:
+                # The cascade model has its own cache, so only its escalations wait for the summary
+                submit(self._run_cascade, candidates, formatted_transcript, events, submit, priority, meeting_id,
+                       prefix_warm)
+            else:
+                for domain_key in candidates:
+                    domain_prompt = self._get_domain_prompt(domain_key, LEGAL_DOMAINS[domain_key])
+                    deferred.append((self._run_domain, domain_key, domain_prompt, formatted_transcript, events,
+                                     priority, meeting_id))
             
-            # Combine and return results
-            return {
+            summary = None
+            summary_done = False
+            llm_calls = 1
+            escalated_calls = 0
+            json_outcomes = Counter()
+            while pending:
+                if deferred and (prefix_warm.is_set() or time.monotonic() - summary_sent >= PREFIX_WARM_TIMEOUT):
+                    for args in deferred:
+                        submit(*args)
+                    deferred = []
+                try:
+                    event = events.get(timeout=EVENT_POLL_INTERVAL)
+                except queue.Empty:
+                    if deferred:
+                        continue
+                    # Workers report every item before returning, so once they have all
+                    # finished with nothing queued, the missing items will never arrive
+                    if not all(future.done() for future in futures) or not events.empty():
+                        continue
+                    for future in futures:
+                        if future.exception():
+                            print(f"Analysis worker failed: {str(future.exception())}")
+                    error = "Error processing with AI: the analysis stopped without a result"
+                    for domain_key in candidates:
+                        if domain_key not in results:
+                            results[domain_key] = error
+                            yield {"type": "domain", "domain": domain_key, "result": error}
+                    if not summary_done:
+                        summary = error
+                        yield {"type": "summary", "summary": error}
+                    break
+                
+                if event.get("json_outcome"):
+                    json_outcomes[event["json_outcome"]] += 1
+                if event["type"] == "domain":
+                    results[event["domain"]] = event["result"]
+                    llm_calls += 1 if event.get("llm_call") else 0
+                    pending -= 1
+                elif event["type"] == "cascade":
+                    llm_calls += 1
+                    escalated_calls = len(event["escalated"])
+                elif event["type"] == "summary":
+                    summary = event["summary"]
+                    summary_done = True
+                    pending -= 1
+                yield event
+        finally:
+            executor.shutdown(wait=False)
+        
+        # Combine and return results, keeping domains in their configured order
+        yield {
+            "type": "done",
+            "results": {
                 "summary": summary,
-                "domains": results,
+                "domains": {domain_key: results[domain_key] for domain_key in LEGAL_DOMAINS if domain_key in results},
                 "processed_at": datetime.now().isoformat(),
-                "model_used": self.model
+                "model_used": self.model,
+                "stats": {
+                    "llm_calls": llm_calls,
+                    "skipped_calls": skipped_calls,
+                    "escalated_calls": escalated_calls,
+                    "triage_scores": triage_scores,
+                    "json_outcomes": dict(json_outcomes),
+                    "compression": compression.to_dict() if compression else None,
+                    "hedged_calls": self.hedge_policy.hedges_used(meeting_id) if self.hedge_policy and meeting_id else 0,
+                    "usage": self.metrics.meeting_summary(meeting_id, since=run_started) if meeting_id else {}
+                }
             }
+        }
+    
+    def _run_domain(self, domain_key: str, prompt: str, transcript: str, events: queue.Queue, priority: str,
+                    meeting_id: Optional[str] = None, cascade: Optional[Dict[str, Any]] = None):
+        """Run one domain call on a worker thread and report its result."""
+        try:
+            result, outcome = self._call_structured(prompt, priority, call=f"domain:{domain_key}",
+                                                    meeting_id=meeting_id, transcript=transcript)
+            if isinstance(result, dict):
+                result["model_used"] = self.model
+                if cascade:
+                    result["cascade"] = cascade
         except Exception as e:
-            return {
-                "error": str(e),
-                "processed_at": datetime.now().isoformat()
-            }
+            result, outcome = f"Error processing with AI: {str(e)}", "failed"
+        events.put({"type": "domain", "domain": domain_key, "result": result,
+                    "json_outcome": outcome, "llm_call": True})
+    
+    def _run_cascade(self, candidates: List[str], transcript: str, events: queue.Queue,
+                     submit: Callable[..., None], priority: str, meeting_id: Optional[str] = None,
+                     prefix_warm: Optional[threading.Event] = None):
+        """
+        Assess candidate domains with the cascade model and escalate where needed.
+        
+        Escalated domain calls are held until ``prefix_warm`` is set, as in
+        ``stream_transcript``. Every candidate is either handed to a domain
+        call or reported here, with an error result if the cascade itself fails.
+        """
+        reported = set()
+        try:
+            prompt = self._get_cascade_prompt(candidates)
+            assessment, outcome = self._call_structured(prompt, priority, model=self.cascade_model,
+                                                        max_tokens=CASCADE_MAX_TOKENS, call="cascade",
+                                                        meeting_id=meeting_id, transcript=transcript)
+            # Valid JSON in another shape counts as no assessment, which escalates every domain
+            assessments = assessment.get("domains") if isinstance(assessment, dict) else None
+            if not isinstance(assessments, dict):
+                assessments = {}
+            
+            decisions = {}
+            for domain_key in candidates:
+                relevance, confidence = self._assessment_scores(assessments.get(domain_key))
+                decisions[domain_key] = {
+                    "model": self.cascade_model,
+                    "relevance": relevance,
+                    "confidence": confidence,
+                    "escalated": relevance >= self.escalation_threshold or confidence < self.confidence_threshold
+                }
+            
+            # Report the cascade before any domain result so the consumer counts it
+            escalated = [domain_key for domain_key in candidates if decisions[domain_key]["escalated"]]
+            events.put({"type": "cascade", "escalated": escalated, "json_outcome": outcome})
+            
+            if escalated and prefix_warm is not None:
+                prefix_warm.wait(PREFIX_WARM_TIMEOUT)
+            for domain_key in candidates:
+                cascade = decisions[domain_key]
+                if cascade["escalated"]:
+                    domain_prompt = self._get_domain_prompt(domain_key, LEGAL_DOMAINS[domain_key])
+                    submit(self._run_domain, domain_key, domain_prompt, transcript, events, priority, meeting_id,
+                           cascade)
+                else:
+                    result = self._cascade_result(assessments.get(domain_key), cascade)
+                    events.put({"type": "domain", "domain": domain_key, "result": result})
+                reported.add(domain_key)
+        except Exception as e:
+            for domain_key in candidates:
+                if domain_key not in reported:
+                    events.put({"type": "domain", "domain": domain_key,
+                                "result": f"Error processing with AI: {str(e)}", "json_outcome": "failed"})
     
+    def _assessment_scores(self, assessment: Any) -> Tuple[float, float]:
+        """Read relevance and confidence from a cascade assessment; missing data forces escalation."""
+        if not isinstance(assessment, dict):
+            return 1.0, 0.0
+        try:
+            return float(assessment.get("relevance", 1.0)), float(assessment.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            return 1.0, 0.0
+    
+    def _cascade_result(self, assessment: Dict[str, Any], cascade: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a domain result from the cascade model's candidate items."""
+        result = {
+            key: assessment.get(key, []) if isinstance(assessment.get(key), list) else []
+            for key in ("key_issues", "action_items", "deadlines", "legal_requirements")
+        }
+        result["summary"] = assessment.get("summary", "")
+        result["model_used"] = self.cascade_model
+        result["cascade"] = cascade
+        return result
+    
+    def _run_summary(self, prompt: str, transcript: str, events: queue.Queue, priority: str,
+                     meeting_id: Optional[str] = None, prefix_warm: Optional[threading.Event] = None):
+        """Stream the executive summary on a worker thread, reporting each chunk; ``prefix_warm`` is set at the first."""
+        def on_delta(text: str):
+            if prefix_warm is not None:
+                prefix_warm.set()
+            events.put({"type": "summary_delta", "text": text})
+        
+        try:
+            summary = self._stream_openai(prompt, on_delta, priority, meeting_id=meeting_id, transcript=transcript)
+        except Exception as e:
+            summary = f"Error processing with AI: {str(e)}"
+        finally:
+            if prefix_warm is not None:
+                prefix_warm.set()
+        events.put({"type": "summary", "summary": summary})
+    
+    def triage_domains(self, transcript_entries: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Score each legal domain by counting keyword hits in the transcript text."""
+        text = "\n".join(entry.get("text", "") for entry in transcript_entries)
+        return {
+            domain_key: len(pattern.findall(text))
+            for domain_key, pattern in self._triage_patterns.items()
+        }
+    
+    def _no_relevant_content(self, domain_name: str) -> Dict[str, Any]:
+        """Build the result for a domain skipped by triage."""
+        return {
+            "key_issues": [],
+            "action_items": [],
+            "deadlines": [],
+            "legal_requirements": [],
+            "summary": f"No relevant content for {domain_name} was found in this meeting.",
+            "skipped": True
+        }
+    
+    @traced()
+    def _prepare_transcript(self, transcript_entries: List[Dict[str, Any]]) -> Tuple[str, Optional[CompressionStats]]:
+        """Build the transcript text for prompts, compressed unless compression is turned off."""
+        formatted = self._format_transcript(transcript_entries)
+        if self.compressor is None:
+            return formatted, None
+        
+        compressed = self.compressor.compress(transcript_entries, original_text=formatted)
+        active_span = current_span()
+        if active_span:
+            active_span.set_attribute("tokens.original", compressed.stats.original_tokens)
+            active_span.set_attribute("tokens.compressed", compressed.stats.compressed_tokens)
+        return compressed.text, compressed.stats
+    
+    @traced()
     def _format_transcript(self, transcript_entries: List[Dict[str, Any]]) -> str:
         """Format transcript entries into a readable string."""
         formatted_text = "MEETING TRANSCRIPT:\n\n"
@@ -66,84 +457,336 @@ class AIProcessor:
         
         return formatted_text
     
-    def _get_domain_prompt(self, domain_key: str, domain_name: str, transcript: str) -> str:
-        """Generate a prompt specific to a legal domain."""
-        domain_descriptions = {
-            "compliance": "Identify any compliance issues, regulatory concerns, ethical considerations, or workplace safety matters mentioned in the meeting.",
-            "contracts": "Extract information about contracts, renewals, legal documents, software licenses, or tech agreements discussed in the meeting.",
-            "ip_tech": "Identify discussions about intellectual property, software licensing, data privacy, cybersecurity, or technology law matters.",
-            "governance": "Extract information about board governance, shareholder matters, corporate structure, business strategy, or finance law topics.",
-            "litigation": "Identify any mentions of disputes, internal investigations, legal proceedings, or merger and acquisition activities."
-        }
+    def _get_domain_prompt(self, domain_key: str, domain_name: str) -> str:
+        """Generate the instruction for one legal domain; the transcript is sent ahead of it."""
+        return render_cached("domain", domain_name=domain_name,
+                             domain_description=DOMAIN_DESCRIPTIONS.get(domain_key, ""))
+    
+    def _get_cascade_prompt(self, domain_keys: List[str]) -> str:
+        """Generate the instruction asking the cascade model to assess several domains at once."""
+        domain_lines = "\n".join(
+            f"- {domain_key} ({LEGAL_DOMAINS[domain_key]}): {DOMAIN_DESCRIPTIONS.get(domain_key, '')}"
+            for domain_key in domain_keys
+        )
+        return get_template("cascade").render(domain_lines=domain_lines)
+    
+    def _get_summary_prompt(self) -> str:
+        """Generate the instruction for the overall legal summary."""
+        return render_cached("summary")
+    
+    def answer_question(self, question: str, passages: List[Dict[str, Any]],
+                        meeting_titles: Optional[Dict[str, str]] = None,
+                        max_context_tokens: int = QA_MAX_CONTEXT_TOKENS) -> Dict[str, Any]:
+        """
+        Answer a question from retrieved passages, citing them by number.
         
-        prompt = f"""
-        You are a specialized legal AI assistant focused on {domain_name}.
+        ``passages`` come from ``ArchiveSearchIndex.search``, best first. They
+        are added until the context budget is used, so the prompt stays the
+        same size however large the archive grows. Returns the answer and the
+        passages it was given, numbered as the answer cites them.
+        """
+        meeting_titles = meeting_titles or {}
+        citations = []
+        excerpts = []
+        used_tokens = 0
+        for passage in passages:
+            text = passage["text"]
+            if len(text) > QA_MAX_PASSAGE_CHARS:
+                text = text[:QA_MAX_PASSAGE_CHARS].rsplit(" ", 1)[0] + " ..."
+            title = meeting_titles.get(passage["meeting_id"], passage["meeting_id"])
+            source = f"{title} at {passage['timestamp']}" if passage.get("timestamp") else f"{title} ({passage['kind']})"
+            line = f"[{len(citations) + 1}] {source}: {text}"
+            tokens = estimate_tokens([{"content": line}])
+            if citations and used_tokens + tokens > max_context_tokens:
+                break
+            used_tokens += tokens
+            excerpts.append(line)
+            citations.append(dict(passage, number=len(citations) + 1, title=title))
         
-        {domain_descriptions.get(domain_key, "")}
+        if not citations:
+            return {"answer": "No relevant passages were found in the meeting archive.", "citations": []}
         
-        Based on the following meeting transcript, please:
-        1. Identify key issues, risks, or opportunities relevant to {domain_name}
-        2. Extract action items that legal staff should follow up on
-        3. Note any deadlines or important dates mentioned
-        4. Highlight any specific legal or regulatory requirements discussed
+        prompt = get_template("qa").render(excerpts="\n".join(excerpts), question=question.strip())
+        try:
+            answer = self._call_openai(prompt, priority="interactive", max_tokens=QA_MAX_TOKENS, call="qa")
+        except Exception as e:
+            answer = f"Error processing with AI: {str(e)}"
         
-        Format your response as JSON with the following structure:
-        {{
-            "key_issues": [list of issues identified],
-            "action_items": [list of specific actions with priority levels],
-            "deadlines": [list of dates and associated tasks],
-            "legal_requirements": [list of legal or regulatory requirements mentioned],
-            "summary": "A brief summary of findings for this domain"
-        }}
+        cited = {int(number) for number in re.findall(r"\[(\d+)\]", answer)}
+        for citation in citations:
+            citation["cited"] = citation["number"] in cited
+        return {"answer": answer, "citations": citations, "context_tokens": used_tokens}
+    
+    def _get_messages(self, prompt: str, transcript: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt, with the transcript in the shared prefix."""
+        return build_messages(prompt, transcript)
+    
+    def _call_openai(self, prompt: str, json_mode: bool = False,
+                     history: Optional[List[Dict[str, str]]] = None,
+                     priority: str = "interactive", model: Optional[str] = None,
+                     max_tokens: int = 1000, call: str = "adhoc",
+                     meeting_id: Optional[str] = None, transcript: Optional[str] = None) -> str:
+        """
+        Call OpenAI API with the given prompt and return the completion text.
         
-        If there is no relevant information for this domain, include an empty list for each category and note that in the summary.
+        ``json_mode`` requests the API's JSON object output. Models that reject
+        it are remembered and called without it from then on. ``history`` is
+        appended after the prompt for follow-up turns. ``transcript`` is sent
+        ahead of the prompt so calls on the same transcript share a cacheable
+        prefix. The call waits for the
+        shared scheduler to admit it at the given priority, and its usage is
+        recorded in the LLM metrics under ``call`` and ``meeting_id``.
+        """
+        request = self._build_request(prompt, json_mode, history, model, max_tokens, transcript)
+        
+        with span("AIProcessor._call_openai", model=request["model"], call=call, priority=priority,
+                  json_mode="response_format" in request):
+            try:
+                response = self._schedule(request, priority, call, meeting_id)
+            except openai.BadRequestError as e:
+                # Only a rejection of JSON mode itself is retried without it
+                if "response_format" not in request or not is_json_mode_error(e):
+                    raise
+                _JSON_MODE_UNSUPPORTED.add(request["model"])
+                del request["response_format"]
+                response = self._schedule(request, priority, call, meeting_id)
+            
+            return (response.choices[0].message.content or "").strip()
+    
+    def _build_request(self, prompt: str, json_mode: bool = False,
+                       history: Optional[List[Dict[str, str]]] = None, model: Optional[str] = None,
+                       max_tokens: int = 1000, transcript: Optional[str] = None) -> Dict[str, Any]:
+        """Build the chat completion request body for a prompt."""
+        request = {
+            "model": model or self.model,
+            "messages": self._get_messages(prompt, transcript) + (history or []),
+            "temperature": 0.2,
+            "max_tokens": max_tokens
+        }
+        if json_mode and request["model"] not in _JSON_MODE_UNSUPPORTED:
+            request["response_format"] = {"type": "json_object"}
+        return request
+    
+    def _schedule(self, request: Dict[str, Any], priority: str, call: str = "adhoc",
+                  meeting_id: Optional[str] = None, call_stats: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Send a chat completion request through the shared scheduler.
         
-        {transcript}
+        Completed and failed calls are recorded in the LLM metrics, except
+        successful streaming calls, which the caller records once the stream
+        has been read. Calls the hedge policy covers are sent with a
+        duplicate once they run into the tail of recent latencies.
         """
-        return prompt
+        call_stats = {} if call_stats is None else call_stats
+        hedging = self.hedge_policy is not None and not request.get("stream") and \
+            self.hedge_policy.applies_to(call, priority)
+        if hedging:
+            hedge_delay = self.hedge_policy.hedge_delay(request["model"])
+            if hedge_delay is not None:
+                return self._schedule_hedged(request, priority, call, meeting_id, call_stats, hedge_delay)
+        
+        def send():
+            started = time.monotonic()
+            try:
+                return openai.chat.completions.create(**request)
+            finally:
+                call_stats["latency"] = time.monotonic() - started
+        
+        try:
+            response = self.scheduler.run(
+                send,
+                priority=priority,
+                session_id=self.session_id,
+                estimated_tokens=estimate_tokens(request["messages"], request.get("max_tokens", 0)),
+                call_stats=call_stats
+            )
+        except Exception:
+            self._record_call(request, call, meeting_id, call_stats, status="error")
+            raise
+        
+        if not request.get("stream"):
+            self._record_call(request, call, meeting_id, call_stats, getattr(response, "usage", None))
+        if hedging:
+            self.hedge_policy.observe(request["model"], call_stats["latency"])
+        return response
     
-    def _get_summary_prompt(self, transcript: str) -> str:
-        """Generate a prompt for creating an overall legal summary."""
-        prompt = f"""
-        You are a senior legal advisor to the executive team.
+    def _schedule_hedged(self, request: Dict[str, Any], priority: str, call: str, meeting_id: Optional[str],
+                         call_stats: Dict[str, Any], hedge_delay: float) -> Any:
+        """
+        Send a call, and a duplicate if it has not answered ``hedge_delay`` seconds after it was sent.
+        
+        The first successful reply is returned. The other request is dropped
+        if the scheduler has not sent it yet. The OpenAI client cannot abort a
+        request in flight, so a late reply is discarded once it arrives; its
+        usage is still recorded, under ``<call>:hedge`` for the duplicate. An
+        error is raised only when no request that could still succeed is left.
+        """
+        replies = queue.Queue()
+        cancelled = threading.Event()
+        sent = threading.Event()
+        estimated_tokens = estimate_tokens(request["messages"], request.get("max_tokens", 0))
+        
+        def attempt(hedge: bool, stats: Dict[str, Any]):
+            def send():
+                if cancelled.is_set():
+                    raise HedgeCancelled()
+                if not hedge:
+                    sent.set()
+                started = time.monotonic()
+                try:
+                    return openai.chat.completions.create(**request)
+                finally:
+                    stats["latency"] = time.monotonic() - started
+            
+            name = f"{call}:hedge" if hedge else call
+            try:
+                response = self.scheduler.run(send, priority=priority, session_id=self.session_id,
+                                              estimated_tokens=estimated_tokens, call_stats=stats)
+            except HedgeCancelled:
+                return
+            except Exception as e:
+                self._record_call(request, name, meeting_id, stats, status="error")
+                replies.put((hedge, None, e))
+                return
+            finally:
+                sent.set()
+            
+            self._record_call(request, name, meeting_id, stats, getattr(response, "usage", None))
+            if not hedge:
+                # Latencies of slow originals are kept even when the duplicate won, so the tail stays visible
+                self.hedge_policy.observe(request["model"], stats["latency"])
+            replies.put((hedge, response, None))
+        
+        primary_stats, hedge_stats = {}, {}
+        threading.Thread(target=propagate(attempt), args=(False, primary_stats), daemon=True).start()
         
-        Based on the following meeting transcript, please provide a comprehensive legal summary addressing:
-        1. The most critical legal issues discussed in the meeting
-        2. High-priority action items that require immediate attention
-        3. Strategic legal considerations for the business
-        4. Risk assessment of issues mentioned
+        # The hedge delay counts from when the original is sent, not from when it was queued
+        sent.wait()
+        outstanding = 1
+        hedged = False
+        timeout = hedge_delay
+        errors = {}
+        while True:
+            try:
+                hedge, response, error = replies.get(timeout=timeout)
+            except queue.Empty:
+                timeout = None
+                if self.hedge_policy.try_spend(meeting_id):
+                    hedged = True
+                    outstanding += 1
+                    threading.Thread(target=propagate(attempt), args=(True, hedge_stats), daemon=True).start()
+                continue
+            
+            outstanding -= 1
+            if error is None:
+                break
+            errors[hedge] = error
+            if outstanding == 0:
+                cancelled.set()
+                raise errors.get(False, error)
         
-        Format your response as a professional executive summary that could be presented to senior leadership.
-        Keep your response concise but thorough.
+        cancelled.set()
+        if hedge:
+            self.hedge_policy.record_win()
+        call_stats.update(hedge_stats if hedge else primary_stats)
+        call_stats["hedged"] = hedged
+        call_stats["hedge_won"] = hedge
+        return response
+    
+    def _record_call(self, request: Dict[str, Any], call: str, meeting_id: Optional[str],
+                     call_stats: Dict[str, Any], usage: Any = None, status: str = "ok", batch: bool = False):
+        """Record token usage, latency and retries for one call, and its cache use on the current span."""
+        prompt_tokens, completion_tokens, cached_tokens = usage_counts(usage)
+        prefix = prefix_fingerprint(request["messages"])
+        active_span = current_span()
+        if active_span and status == "ok":
+            attribute = "llm.hedge" if call.endswith(":hedge") else "llm"
+            active_span.set_attribute(f"{attribute}.prompt_tokens", prompt_tokens)
+            active_span.set_attribute(f"{attribute}.cached_tokens", cached_tokens)
+            active_span.set_attribute(f"{attribute}.prompt_prefix", prefix)
+        self.metrics.record(CallRecord(
+            meeting_id=meeting_id,
+            call=call,
+            model=request["model"],
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            latency=round(call_stats.get("latency", 0.0), 3),
+            queue_wait=round(call_stats.get("queue_wait", 0.0), 3),
+            retries=call_stats.get("retries", 0),
+            prompt_prefix=prefix,
+            status=status,
+            batch=batch
+        ))
+    
+    def _call_structured(self, prompt: str, priority: str = "interactive", model: Optional[str] = None,
+                         max_tokens: int = 1000, call: str = "adhoc",
+                         meeting_id: Optional[str] = None, transcript: Optional[str] = None) -> Tuple[Any, str]:
+        """
+        Call OpenAI for a JSON object, repairing or re-asking when the output is malformed.
         
-        {transcript}
+        Returns the parsed object (or the raw text if nothing could be
+        recovered) and the outcome: "parsed", "salvaged" by local repair,
+        "retried" after a re-ask, "lost", or "failed" when the call errored.
         """
-        return prompt
+        try:
+            result_text = self._call_openai(prompt, json_mode=True, priority=priority, model=model,
+                                            max_tokens=max_tokens, call=call, meeting_id=meeting_id,
+                                            transcript=transcript)
+            parsed, repaired = parse_json_response(result_text)
+            if parsed is not None:
+                outcome = "salvaged" if repaired else "parsed"
+            else:
+                # Local repair failed, so ask once more for just the JSON object
+                retry_text = self._call_openai(prompt, json_mode=True, priority=priority, model=model,
+                                               max_tokens=max_tokens, call=call, meeting_id=meeting_id,
+                                               transcript=transcript, history=[
+                    {"role": "assistant", "content": result_text},
+                    {"role": "user", "content": JSON_REASK_PROMPT}
+                ])
+                parsed, _ = parse_json_response(retry_text)
+                outcome = "retried" if parsed is not None else "lost"
+        except Exception as e:
+            parsed, outcome, result_text = None, "failed", f"Error processing with AI: {str(e)}"
+        
+        record_json_outcome(outcome)
+        
+        return (parsed if parsed is not None else result_text), outcome
     
-    def _call_openai(self, prompt: str) -> Any:
-        """Call OpenAI API with the given prompt."""
+    @traced()
+    def _stream_openai(self, prompt: str, on_delta: Callable[[str], None],
+                       priority: str = "interactive", meeting_id: Optional[str] = None,
+                       transcript: Optional[str] = None) -> str:
+        """Call OpenAI API with streaming, passing each text chunk to ``on_delta``."""
         try:
-            response = openai.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a specialized legal AI assistant for corporate legal departments."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=1000
-            )
-            
-            # Extract and parse response content
-            result_text = response.choices[0].message.content.strip()
+            request = {
+                "model": self.model,
+                "messages": self._get_messages(prompt, transcript),
+                "temperature": 0.2,
+                "max_tokens": 1000,
+                "stream": True,
+                "stream_options": {"include_usage": True}
+            }
+            call_stats = {}
+            stream = self._schedule(request, priority, "summary", meeting_id, call_stats)
+            started = time.monotonic()
             
-            # If result is JSON, parse it
-            if result_text.startswith('{') and result_text.endswith('}'):
-                try:
-                    return json.loads(result_text)
-                except json.JSONDecodeError:
-                    pass
+            parts = []
+            usage = None
+            for chunk in stream:
+                # Usage arrives on a final chunk with no choices
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
             
-            return result_text
+            call_stats["latency"] = call_stats.get("latency", 0.0) + time.monotonic() - started
+            self._record_call(request, "summary", meeting_id, call_stats, usage)
+            return "".join(parts).strip()
             
         except Exception as e:
             return f"Error processing with AI: {str(e)}"
\ No newline at end of file
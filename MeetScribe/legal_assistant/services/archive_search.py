@@ -0,0 +1,275 @@
+"""
+Lexical search over archived transcripts, actions and insights for question answering.
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from services.transcript_archive import TranscriptArchive
+
+# Okapi BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Consecutive utterances grouped into one searchable passage
+CHUNK_UTTERANCES = 4
+
+# The index is rebuilt once removed passages outnumber live ones
+COMPACT_RATIO = 1.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset([
+    "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "but", "by", "can", "did",
+    "do", "does", "for", "from", "had", "has", "have", "how", "i", "if", "in", "into", "is", "it",
+    "its", "me", "of", "on", "or", "our", "so", "that", "the", "their", "them", "there", "these",
+    "they", "this", "those", "to", "us", "was", "we", "were", "what", "when", "where", "which",
+    "who", "why", "will", "with", "you", "your"
+])
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text into search terms, dropping stopwords and folding simple plurals."""
+    terms = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+def _record_text(title: str, description: str) -> str:
+    """Join a record's title and description, skipping titles that just truncate the description."""
+    title = (title or "").rstrip(". ")
+    if not description or not title:
+        return description or title
+    if description.startswith(title):
+        return description
+    return f"{title}. {description}"
+
+@dataclass
+class SearchDocument:
+    """A searchable passage and where it came from."""
+    kind: str  # "transcript", "action" or "insight"
+    meeting_id: str
+    text: str
+    speaker: str = ""
+    timestamp: str = ""
+    ref: str = ""  # utterance number range or record ID
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+class BM25Index:
+    """
+    An Okapi BM25 index held in memory.
+
+    Postings are kept per term as growing lists and converted to NumPy arrays
+    the first time a term is queried after it changed, so a query scores only
+    the documents containing its terms with a few vector operations. Removed
+    documents are tombstoned and scored as zero until the index is rebuilt.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[SearchDocument] = []
+        self._lengths: List[int] = []
+        self._length_array = np.zeros(0)
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._removed = set()
+        self._removed_array: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.documents) - len(self._removed)
+
+    @property
+    def removed(self) -> int:
+        return len(self._removed)
+
+    def remove(self, doc_id: int):
+        """Tombstone a document so searches no longer return it."""
+        self._removed.add(doc_id)
+        self._removed_array = None
+
+    def add(self, document: SearchDocument) -> int:
+        """Add a document and return its ID."""
+        doc_id = len(self.documents)
+        counts = Counter(tokenize(document.text))
+        self.documents.append(document)
+        self._lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            ids, tfs = self._postings.setdefault(term, ([], []))
+            ids.append(doc_id)
+            tfs.append(tf)
+            self._compiled.pop(term, None)
+        return doc_id
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._compiled.get(term)
+        if arrays is None and term in self._postings:
+            ids, tfs = self._postings[term]
+            arrays = self._compiled[term] = (np.asarray(ids, dtype=np.int64), np.asarray(tfs, dtype=np.float64))
+        return arrays
+
+    def search(self, query: str, top_k: int = 8) -> List[Tuple[float, SearchDocument]]:
+        """Return up to ``top_k`` ``(score, document)`` pairs, best first."""
+        count = len(self.documents)
+        live = len(self)
+        terms = set(tokenize(query))
+        if not live or not terms:
+            return []
+
+        if len(self._length_array) != count:
+            self._length_array = np.asarray(self._lengths, dtype=np.float64)
+        lengths = self._length_array
+        average_length = max(lengths.mean(), 1.0)
+
+        scores = np.zeros(count)
+        for term in terms:
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            ids, tfs = arrays
+            # Postings of removed documents still count towards df until the index is rebuilt
+            idf = math.log(1 + max(live - len(ids) + 0.5, 0.0) / (len(ids) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[ids] / average_length)
+            scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        if self._removed:
+            if self._removed_array is None:
+                self._removed_array = np.fromiter(self._removed, dtype=np.int64, count=len(self._removed))
+            scores[self._removed_array] = 0.0
+
+        matched = int(np.count_nonzero(scores))
+        if not matched:
+            return []
+        k = min(top_k, matched)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(float(scores[i]), self.documents[i]) for i in best]
+
+class ArchiveSearchIndex:
+    """
+    Search over a session's meetings: archived transcript passages plus actions and insights.
+
+    ``sync`` brings the index in line with the task manager and archive.
+    Each meeting transcript, action and insight is indexed under a key with a
+    digest of its content, so only new or changed items are (re)indexed and
+    items that no longer exist are removed, instead of rebuilding the index.
+    """
+
+    def __init__(self, archive: Optional[TranscriptArchive] = None, chunk_size: int = CHUNK_UTTERANCES):
+        self.archive = archive or TranscriptArchive()
+        self.chunk_size = chunk_size
+        self.index = BM25Index()
+        self._entries: Dict[Tuple[str, str], Tuple[str, List[int]]] = {}  # key -> (digest, document IDs)
+        self._lock = threading.Lock()
+
+    def sync(self, task_manager) -> int:
+        """Index new and changed transcripts, actions and insights and drop removed ones; returns passages added."""
+        with self._lock:
+            added = 0
+            seen = set()
+            for meeting in task_manager.meetings:
+                key = ("transcript", meeting.id)
+                version = self.archive.version(meeting.id)
+                if version is None:
+                    continue
+                seen.add(key)
+                if self._entries.get(key, ("",))[0] != version:
+                    added += self._replace(key, version, self._transcript_documents(meeting.id))
+
+            for action in task_manager.actions:
+                key = ("action", action.id)
+                seen.add(key)
+                added += self._replace_record(key, SearchDocument(
+                    kind="action",
+                    meeting_id=action.source_meetings[0] if action.source_meetings else "",
+                    text=_record_text(action.title, action.description) +
+                         (f" Deadline: {action.deadline}" if action.deadline else ""),
+                    ref=action.id
+                ))
+            for insight in task_manager.insights:
+                key = ("insight", insight.id)
+                seen.add(key)
+                added += self._replace_record(key, SearchDocument(
+                    kind="insight",
+                    meeting_id=insight.source_meeting,
+                    text=_record_text(insight.title, insight.description),
+                    ref=insight.id
+                ))
+
+            for key in [key for key in self._entries if key not in seen]:
+                self._replace(key, None, [])
+
+            if self.index.removed > COMPACT_RATIO * max(len(self.index), 1):
+                self._compact()
+            return added
+
+    def reset(self):
+        """Drop everything indexed, for when the workspace is cleared."""
+        with self._lock:
+            self.index = BM25Index()
+            self._entries = {}
+
+    def _replace_record(self, key: Tuple[str, str], document: SearchDocument) -> int:
+        digest = hashlib.sha1(f"{document.meeting_id}\n{document.text}".encode("utf-8")).hexdigest()
+        if self._entries.get(key, ("",))[0] == digest:
+            return 0
+        return self._replace(key, digest, [document])
+
+    def _replace(self, key: Tuple[str, str], digest: Optional[str], documents: List[SearchDocument]) -> int:
+        """Remove the key's indexed passages and index ``documents`` in their place; a None digest drops the key."""
+        _, doc_ids = self._entries.pop(key, ("", []))
+        for doc_id in doc_ids:
+            self.index.remove(doc_id)
+        if digest is not None:
+            self._entries[key] = (digest, [self.index.add(document) for document in documents])
+        return len(documents)
+
+    def _compact(self):
+        """Rebuild the index from its live passages, discarding removed ones."""
+        index = BM25Index(self.index.k1, self.index.b)
+        for key, (digest, doc_ids) in self._entries.items():
+            self._entries[key] = (digest, [index.add(self.index.documents[doc_id]) for doc_id in doc_ids])
+        self.index = index
+
+    def _transcript_documents(self, meeting_id: str) -> List[SearchDocument]:
+        entries = self.archive.read(meeting_id)
+        documents = []
+        for first in range(0, len(entries), self.chunk_size):
+            chunk = entries[first:first + self.chunk_size]
+            speakers = list(dict.fromkeys(entry.get("speaker", "Unknown") for entry in chunk))
+            documents.append(SearchDocument(
+                kind="transcript",
+                meeting_id=meeting_id,
+                text=" ".join(f"{entry.get('speaker', 'Unknown')}: {entry.get('text', '')}" for entry in chunk),
+                speaker=", ".join(speakers),
+                timestamp=chunk[0].get("timestamp", ""),
+                ref=f"{first}-{first + len(chunk) - 1}"
+            ))
+        return documents
+
+    def search(self, question: str, top_k: int = 8) -> List[Dict[str, Any]]:
+        """Return the best matching passages as dicts with a ``score``."""
+        with self._lock:
+            hits = self.index.search(question, top_k)
+        return [dict(document.to_dict(), score=round(score, 3)) for score, document in hits]
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+def get_archive_search() -> ArchiveSearchIndex:
+    """Return the search index over the shared workspace, used by every session in this process."""
+    global _search_index
+    with _search_index_lock:
+        if _search_index is None:
+            _search_index = ArchiveSearchIndex()
+        return _search_index
@@ -0,0 +1,269 @@
+"""
+Batch analysis of many meetings through the OpenAI Batch API, for backfills that can wait for results.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+import openai
+
+from config import LEGAL_DOMAINS
+from services.ai_processor import AIProcessor, record_json_outcome
+from utils.json_repair import parse_json_response
+
+BATCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "batches")
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INTERVAL = 60.0
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+def batch_custom_id(meeting_id: str, call: str) -> str:
+    """Return the id a batch request is written under, stable across runs for the same meeting and call."""
+    return f"{meeting_id}/{call}"
+
+def parse_custom_id(custom_id: str) -> Tuple[str, str]:
+    """Split a batch request id into its meeting id and call."""
+    meeting_id, _, call = custom_id.rpartition("/")
+    return meeting_id, call
+
+@dataclass
+class BatchJob:
+    """A batch of analysis requests, saved next to its JSONL file so a later run can resume it."""
+    name: str
+    input_path: str
+    meetings: Dict[str, Dict[str, Any]]  # meeting id -> triage scores, skipped domains and compression stats
+    batch_id: Optional[str] = None
+    input_file_id: Optional[str] = None
+    status: str = "prepared"
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.splitext(self.input_path)[0] + ".json"
+
+    def save(self):
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+
+    @classmethod
+    def load(cls, manifest_path: str) -> "BatchJob":
+        with open(manifest_path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+class BatchAnalyzer:
+    """
+    Analyzes many meetings in one Batch API job instead of one call at a time.
+
+    Every domain and summary request for every meeting is written as a line
+    of one JSONL file, keyed by meeting and call, and submitted as a single
+    batch. The batch is billed at the discounted batch price and does not go
+    through the shared scheduler, so it leaves the interactive rate limits
+    alone. Results come back within the completion window rather than in
+    seconds, so this suits backfills, not meetings a user is waiting on.
+
+    Requests match the ones ``AIProcessor`` sends, except that the summary is
+    not streamed and there is no cascade or JSON re-ask, as neither can wait
+    for another round trip. Replies that cannot be repaired count as lost.
+    """
+
+    def __init__(self, ai_processor: Optional[AIProcessor] = None, client: Any = None,
+                 batch_dir: str = BATCH_DIR, poll_interval: float = BATCH_POLL_INTERVAL):
+        self.ai_processor = ai_processor or AIProcessor(session_id="batch")
+        self.client = client or openai
+        self.batch_dir = batch_dir
+        self.poll_interval = poll_interval
+
+    def prepare(self, transcripts: Dict[str, Dict[str, Any]], name: Optional[str] = None) -> BatchJob:
+        """Write the requests for each meeting's transcript to a JSONL batch file."""
+        name = name or datetime.now().strftime("batch_%Y%m%d_%H%M%S")
+        os.makedirs(self.batch_dir, exist_ok=True)
+        job = BatchJob(name=name, input_path=os.path.join(self.batch_dir, f"{name}.jsonl"), meetings={})
+
+        processor = self.ai_processor
+        with open(job.input_path, "w", encoding="utf-8") as f:
+            for meeting_id, transcript_data in transcripts.items():
+                entries = transcript_data.get("transcript", []) if isinstance(transcript_data, dict) else transcript_data
+                transcript, compression = processor._prepare_transcript(entries)
+                triage_scores = processor.triage_domains(entries)
+
+                requests = {"summary": processor._build_request(processor._get_summary_prompt(), transcript=transcript)}
+                skipped = []
+                for domain_key, domain_name in LEGAL_DOMAINS.items():
+                    if triage_scores.get(domain_key, 0) < processor.triage_thresholds.get(domain_key, 0):
+                        skipped.append(domain_key)
+                        continue
+                    prompt = processor._get_domain_prompt(domain_key, domain_name)
+                    requests[f"domain:{domain_key}"] = processor._build_request(prompt, json_mode=True,
+                                                                                transcript=transcript)
+
+                for call, request in requests.items():
+                    f.write(json.dumps({
+                        "custom_id": batch_custom_id(meeting_id, call),
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": request
+                    }) + "\n")
+                job.meetings[meeting_id] = {
+                    "triage_scores": triage_scores,
+                    "skipped": skipped,
+                    "compression": compression.to_dict() if compression else None
+                }
+
+        job.save()
+        print(f"Prepared batch {name}: {len(job.meetings)} meetings in {job.input_path}")
+        return job
+
+    def submit(self, job: BatchJob) -> str:
+        """Upload the batch file and start the batch; returns the batch id."""
+        with open(job.input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+            metadata={"job": job.name}
+        )
+        job.input_file_id = input_file.id
+        job.batch_id = batch.id
+        job.status = batch.status
+        job.save()
+        print(f"Submitted batch {job.name} as {batch.id}")
+        return batch.id
+
+    def wait(self, job: BatchJob, timeout: Optional[float] = None) -> Any:
+        """Poll the batch until it finishes or ``timeout`` seconds pass; returns the last batch status."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            try:
+                batch = self.client.batches.retrieve(job.batch_id)
+            except openai.APIError as e:
+                print(f"Failed to check batch {job.batch_id}: {str(e)}")
+            else:
+                counts = batch.request_counts
+                if counts:
+                    print(f"Batch {job.batch_id} {batch.status}: {counts.completed}/{counts.total} done, "
+                          f"{counts.failed} failed")
+                if job.status != batch.status:
+                    job.status = batch.status
+                    job.save()
+                if batch.status in BATCH_FINAL_STATUSES:
+                    return batch
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {job.batch_id} did not finish within {timeout:g} seconds")
+            time.sleep(self.poll_interval)
+
+    def collect(self, job: BatchJob, batch: Any = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Download a finished batch's output and build each meeting's analysis results.
+
+        Results have the same shape as ``AIProcessor.process_transcript``
+        returns, ready for ``LegalTaskManager.process_ai_results``. Requests
+        the batch did not answer are reported as errors in their domain or
+        summary.
+        """
+        batch = batch or self.client.batches.retrieve(job.batch_id)
+        collected_at = datetime.now()
+        replies = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    reply = json.loads(line)
+                    replies[reply["custom_id"]] = reply
+
+        requests = {}
+        with open(job.input_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    request = json.loads(line)
+                    requests[request["custom_id"]] = request["body"]
+
+        results = {}
+        for meeting_id, plan in job.meetings.items():
+            results[meeting_id] = self._meeting_results(job, meeting_id, plan, requests, replies, collected_at)
+        return results
+
+    def run(self, transcripts: Dict[str, Dict[str, Any]], name: Optional[str] = None,
+            timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Prepare, submit and wait for a batch, then return each meeting's results."""
+        job = self.prepare(transcripts, name)
+        self.submit(job)
+        return self.collect(job, self.wait(job, timeout))
+
+    def _reply_text(self, request: Dict[str, Any], reply: Optional[Dict[str, Any]], call: str,
+                    meeting_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return a reply's completion text or its error message, recording the call's usage."""
+        response = (reply or {}).get("response") or {}
+        body = response.get("body") or {}
+        if reply is None:
+            error = "No reply in batch output"
+        elif response.get("status_code") == 200:
+            self.ai_processor._record_call(request, call, meeting_id, {}, body.get("usage"), batch=True)
+            choices = body.get("choices") or [{}]
+            return ((choices[0].get("message") or {}).get("content") or "").strip(), None
+        else:
+            error = (reply.get("error") or body.get("error") or {}).get("message") or \
+                f"Request failed with status {response.get('status_code')}"
+
+        self.ai_processor._record_call(request, call, meeting_id, {}, status="error", batch=True)
+        return None, error
+
+    def _meeting_results(self, job: BatchJob, meeting_id: str, plan: Dict[str, Any],
+                         requests: Dict[str, Dict[str, Any]], replies: Dict[str, Dict[str, Any]],
+                         collected_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Assemble one meeting's analysis results from its batch replies, with usage recorded since ``collected_at``."""
+        processor = self.ai_processor
+        domains = {}
+        json_outcomes = {}
+        llm_calls = 0
+        for domain_key, domain_name in LEGAL_DOMAINS.items():
+            if domain_key in plan["skipped"]:
+                domains[domain_key] = processor._no_relevant_content(domain_name)
+                continue
+
+            custom_id = batch_custom_id(meeting_id, f"domain:{domain_key}")
+            if custom_id not in requests:
+                continue
+            llm_calls += 1
+            text, error = self._reply_text(requests[custom_id], replies.get(custom_id), f"domain:{domain_key}",
+                                           meeting_id)
+            if error:
+                result, outcome = f"Error processing with AI: {error}", "failed"
+            else:
+                parsed, repaired = parse_json_response(text)
+                if parsed is None:
+                    result, outcome = text, "lost"
+                else:
+                    result, outcome = parsed, "salvaged" if repaired else "parsed"
+                    if isinstance(result, dict):
+                        result["model_used"] = requests[custom_id]["model"]
+            record_json_outcome(outcome)
+            json_outcomes[outcome] = json_outcomes.get(outcome, 0) + 1
+            domains[domain_key] = result
+
+        custom_id = batch_custom_id(meeting_id, "summary")
+        llm_calls += 1
+        summary, error = self._reply_text(requests[custom_id], replies.get(custom_id), "summary", meeting_id)
+        if error:
+            summary = f"Error processing with AI: {error}"
+
+        return {
+            "summary": summary,
+            "domains": domains,
+            "processed_at": datetime.now().isoformat(),
+            "model_used": requests[custom_id]["model"],
+            "stats": {
+                "llm_calls": llm_calls,
+                "skipped_calls": len(plan["skipped"]),
+                "escalated_calls": 0,
+                "triage_scores": plan["triage_scores"],
+                "json_outcomes": json_outcomes,
+                "compression": plan["compression"],
+                "usage": processor.metrics.meeting_summary(meeting_id, since=collected_at),
+                "batch_id": job.batch_id
+            }
+        }
@@ -0,0 +1,188 @@
+"""
+Registry of active MeetStream bots with a shared background status poller.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Callable
+
+from services.meetstream import MeetStreamClient
+
+# Adaptive polling: active bots are checked every MIN_POLL_INTERVAL seconds, and
+# the interval grows by POLL_BACKOFF each time a check returns an unchanged status.
+MIN_POLL_INTERVAL = 5.0
+MAX_POLL_INTERVAL = 120.0
+POLL_BACKOFF = 2.0
+POLL_BATCH_SIZE = 8
+
+# Bots reporting one of these statuses have left their meeting and are polled at the max interval
+ENDED_STATUSES = {"ended", "left", "removed", "stopped", "completed", "done", "failed", "error"}
+
+@dataclass
+class BotRecord:
+    """A bot tracked by the registry and its last known status."""
+    bot_id: str
+    workspace_id: str
+    meeting_link: str = ""
+    bot_name: str = ""
+    joined_at: float = field(default_factory=time.time)
+    status: str = "Unknown"
+    message: Optional[str] = None
+    error: Optional[str] = None
+    last_polled: Optional[float] = None
+    poll_interval: float = MIN_POLL_INTERVAL
+    next_poll: float = 0.0
+
+    @property
+    def ended(self) -> bool:
+        return str(self.status).lower() in ENDED_STATUSES
+
+class BotRegistry:
+    """
+    Tracks many active bots per workspace and keeps their status fresh in the background.
+
+    A single poller thread checks the bots that are due in batches, in
+    parallel, and publishes the results as snapshots that pages read without
+    touching the network. Bots whose status stays the same, or that have
+    ended, are polled less and less often; a status change or an explicit
+    refresh resets them to the fastest interval.
+    """
+
+    def __init__(self, client: Optional[MeetStreamClient] = None,
+                 min_interval: float = MIN_POLL_INTERVAL, max_interval: float = MAX_POLL_INTERVAL,
+                 backoff: float = POLL_BACKOFF, batch_size: int = POLL_BATCH_SIZE):
+        self.client = client or MeetStreamClient()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self._bots: Dict[str, BotRecord] = {}
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=batch_size, thread_name_prefix="bot-poller")
+        self._poller = None
+
+    def register(self, workspace_id: str, bot_id: str, meeting_link: str = "", bot_name: str = "") -> BotRecord:
+        """Start tracking a bot and schedule an immediate status check."""
+        with self._cond:
+            record = self._bots.get(bot_id)
+            if record is None:
+                record = BotRecord(bot_id=bot_id, workspace_id=workspace_id,
+                                   meeting_link=meeting_link, bot_name=bot_name)
+                self._bots[bot_id] = record
+            record.next_poll = 0.0
+            self._ensure_poller()
+            self._cond.notify_all()
+            return record
+
+    def unregister(self, bot_id: str):
+        with self._cond:
+            self._bots.pop(bot_id, None)
+
+    def refresh(self, bot_id: str):
+        """Check a bot's status on the next poller pass, resetting its interval."""
+        with self._cond:
+            record = self._bots.get(bot_id)
+            if record:
+                record.poll_interval = self.min_interval
+                record.next_poll = 0.0
+                self._cond.notify_all()
+
+    def get(self, bot_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached snapshot of one bot."""
+        with self._cond:
+            record = self._bots.get(bot_id)
+            return self._snapshot(record) if record else None
+
+    def snapshot(self, workspace_id: str) -> List[Dict[str, Any]]:
+        """Return cached snapshots of a workspace's bots, oldest first."""
+        with self._cond:
+            records = [record for record in self._bots.values() if record.workspace_id == workspace_id]
+            return [self._snapshot(record) for record in sorted(records, key=lambda r: r.joined_at)]
+
+    @staticmethod
+    def _snapshot(record: BotRecord) -> Dict[str, Any]:
+        snapshot = asdict(record)
+        snapshot["ended"] = record.ended
+        return snapshot
+
+    def remove_bots(self, bot_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Remove several bots from their meetings in parallel and stop tracking them."""
+        results = self._run_fleet(bot_ids, self.client.remove_bot)
+        for bot_id, result in results.items():
+            if "error" not in result:
+                self.unregister(bot_id)
+        return results
+
+    def fetch_transcripts(self, bot_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch the transcripts of several bots in parallel."""
+        return self._run_fleet(bot_ids, self.client.get_transcript)
+
+    def _run_fleet(self, bot_ids: List[str], operation: Callable[[str], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Run a MeetStream operation for each bot; failures are returned as ``{"error": ...}``."""
+        def run(bot_id):
+            try:
+                return operation(bot_id)
+            except Exception as e:
+                return {"error": str(e)}
+
+        return dict(zip(bot_ids, self._executor.map(run, bot_ids)))
+
+    def _ensure_poller(self):
+        if self._poller is None or not self._poller.is_alive():
+            self._poller = threading.Thread(target=self._poll_loop, name="bot-status-poller", daemon=True)
+            self._poller.start()
+
+    def _poll_loop(self):
+        while True:
+            with self._cond:
+                # Sleep until the next bot is due, or until a registration or refresh wakes us
+                while True:
+                    now = time.monotonic()
+                    due = sorted((r for r in self._bots.values() if r.next_poll <= now), key=lambda r: r.next_poll)
+                    if due:
+                        break
+                    next_poll = min((r.next_poll for r in self._bots.values()), default=None)
+                    self._cond.wait(timeout=None if next_poll is None else next_poll - now)
+                batch = [record.bot_id for record in due[:self.batch_size]]
+
+            statuses = self._run_fleet(batch, self.client.get_bot_status)
+
+            with self._cond:
+                for bot_id, status in statuses.items():
+                    record = self._bots.get(bot_id)
+                    if record:
+                        self._apply_status(record, status)
+
+    def _apply_status(self, record: BotRecord, status: Dict[str, Any]):
+        """Store a status check result and schedule the bot's next check."""
+        now = time.monotonic()
+        if "error" in status and "status" not in status:
+            record.error = status["error"]
+            record.poll_interval = min(record.poll_interval * self.backoff, self.max_interval)
+        else:
+            new_status = status.get("status", "Unknown")
+            changed = new_status != record.status
+            record.status = new_status
+            record.message = status.get("message")
+            record.error = None
+            if record.ended:
+                record.poll_interval = self.max_interval
+            elif changed:
+                record.poll_interval = self.min_interval
+            else:
+                record.poll_interval = min(record.poll_interval * self.backoff, self.max_interval)
+
+        record.last_polled = time.time()
+        record.next_poll = now + record.poll_interval
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_bot_registry() -> BotRegistry:
+    """Return the bot registry shared by every session in this process."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = BotRegistry()
+        return _registry
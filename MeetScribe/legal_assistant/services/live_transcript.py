@@ -0,0 +1,47 @@
+"""
+Incremental view of a live meeting's transcript, extended by polling MeetStream.
+"""
+import time
+from typing import Dict, Any, List, Optional
+
+from services.meetstream import MeetStreamClient, convert_transcript_entries, transcript_start_time
+
+class LiveTranscript:
+    """
+    The utterances of a live meeting fetched so far.
+
+    MeetStream returns the whole transcript on every request, so each poll
+    converts only the entries past the ones already held and returns them.
+    Entry times stay relative to the meeting's first word, as with
+    ``MeetStreamClient.get_transcript``.
+    """
+
+    def __init__(self, bot_id: str):
+        self.bot_id = bot_id
+        self.entries: List[Dict[str, Any]] = []
+        self.polled_at: Optional[float] = None
+        self._start_time: Optional[float] = None
+
+    @property
+    def offset(self) -> int:
+        """Number of raw transcript entries already converted."""
+        return len(self.entries)
+
+    def poll(self, client: MeetStreamClient) -> List[Dict[str, Any]]:
+        """Fetch the transcript and return the entries that are new since the last poll."""
+        raw_transcript = client.get_raw_transcript(self.bot_id) or []
+        self.polled_at = time.time()
+
+        # A shorter transcript means MeetStream started over, so start over too
+        if len(raw_transcript) < self.offset:
+            self.entries = []
+            self._start_time = None
+        if len(raw_transcript) == self.offset:
+            return []
+
+        if self._start_time is None:
+            self._start_time = transcript_start_time(raw_transcript)
+        previous_end = self.entries[-1]["end"] if self.entries else 0.0
+        new_entries = convert_transcript_entries(raw_transcript[self.offset:], self._start_time, previous_end)
+        self.entries.extend(new_entries)
+        return new_entries
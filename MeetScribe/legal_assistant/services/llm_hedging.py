@@ -0,0 +1,119 @@
+"""
+Hedged OpenAI calls: a duplicate request is sent when a call runs past its usual latency.
+"""
+import math
+import threading
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, Any, Optional
+
+from services.llm_scheduler import CallCancelled
+
+# A call is hedged once it has run longer than this percentile of recent latencies
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20        # no hedging until this many latencies have been seen for the model
+HEDGE_LATENCY_WINDOW = 200    # recent latencies kept per model
+HEDGE_MIN_DELAY = 1.0         # seconds; never hedge sooner than this
+HEDGE_MAX_PER_RUN = 2         # duplicate requests allowed per analysis run of a meeting
+
+# Only these call types and priorities are hedged; backfill work can wait out the tail
+HEDGED_CALLS = ("domain",)
+HEDGED_PRIORITIES = ("live", "interactive")
+
+# Meetings whose hedge spend is remembered
+MAX_TRACKED_MEETINGS = 1000
+
+class HedgeCancelled(CallCancelled):
+    """Raised instead of sending a hedged request whose duplicate has already answered."""
+
+class HedgePolicy:
+    """
+    Decides when a call is worth a duplicate request.
+
+    The delay before hedging is a percentile of the model's recent latencies
+    for the hedged call types, so a duplicate is only sent for calls already
+    in the tail. Each analysis run of a meeting may spend a fixed number of
+    hedges, so a run costs at most that many extra calls; ``start_run``
+    gives the meeting a fresh budget. One policy is shared by every session
+    in the process.
+    """
+
+    def __init__(self, percentile: float = HEDGE_PERCENTILE, max_per_run: int = HEDGE_MAX_PER_RUN,
+                 min_samples: int = HEDGE_MIN_SAMPLES, window: int = HEDGE_LATENCY_WINDOW,
+                 min_delay: float = HEDGE_MIN_DELAY):
+        self.percentile = percentile
+        self.max_per_run = max_per_run
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._spent: "OrderedDict[str, int]" = OrderedDict()
+        self.stats = {"hedged": 0, "hedge_won": 0, "over_budget": 0}
+
+    @staticmethod
+    def applies_to(call: str, priority: str) -> bool:
+        """Whether calls of this type and priority are ever hedged."""
+        return call.split(":")[0] in HEDGED_CALLS and priority in HEDGED_PRIORITIES
+
+    def observe(self, model: str, latency: float):
+        """Add the latency of a completed call to the model's history."""
+        with self._lock:
+            self._latencies[model].append(latency)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """Seconds to wait before hedging a call to ``model``, or None while there is too little history."""
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(math.ceil(self.percentile / 100 * len(samples)) - 1, 0)
+        return max(samples[min(rank, len(samples) - 1)], self.min_delay)
+
+    def start_run(self, meeting_id: str):
+        """Give the meeting a fresh hedge budget for a new analysis run."""
+        with self._lock:
+            self._spent.pop(meeting_id, None)
+
+    def try_spend(self, meeting_id: Optional[str]) -> bool:
+        """Take one hedge from the budget of the meeting's current run; returns False when it is used up."""
+        if not meeting_id:
+            return False
+        with self._lock:
+            spent = self._spent.pop(meeting_id, 0)
+            self._spent[meeting_id] = spent
+            if spent >= self.max_per_run:
+                self.stats["over_budget"] += 1
+                return False
+            self._spent[meeting_id] = spent + 1
+            self.stats["hedged"] += 1
+            while len(self._spent) > MAX_TRACKED_MEETINGS:
+                self._spent.popitem(last=False)
+            return True
+
+    def record_win(self):
+        """Count a hedge that answered before the call it duplicated."""
+        with self._lock:
+            self.stats["hedge_won"] += 1
+
+    def hedges_used(self, meeting_id: str) -> int:
+        """Return the hedges spent in the meeting's current run."""
+        with self._lock:
+            return self._spent.get(meeting_id, 0)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return hedge counts and the current hedge delay per model."""
+        with self._lock:
+            stats = dict(self.stats)
+            models = list(self._latencies.keys())
+        stats["delays"] = {model: self.hedge_delay(model) for model in models}
+        return stats
+
+_policy = None
+_policy_lock = threading.Lock()
+
+def get_hedge_policy() -> HedgePolicy:
+    """Return the hedge policy shared by every session in this process."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = HedgePolicy()
+        return _policy
@@ -0,0 +1,237 @@
+"""
+Token, cost and latency metrics for OpenAI calls made by the analysis pipeline.
+"""
+import json
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+METRICS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "metrics")
+METRICS_JSONL_PATH = os.path.join(METRICS_DIR, "llm_calls.jsonl")
+
+# USD per 1K tokens: (prompt, cached prompt, completion)
+MODEL_PRICING = {
+    "gpt-4": (0.03, 0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.01, 0.03),
+    "gpt-4o": (0.0025, 0.00125, 0.01),
+    "gpt-4o-mini": (0.00015, 0.000075, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0005, 0.0015)
+}
+
+# Calls made through the Batch API are billed at this fraction of the synchronous price
+BATCH_PRICE_FACTOR = 0.5
+
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0,
+                  batch: bool = False) -> float:
+    """Estimate the USD cost of a call; unknown models are priced as zero."""
+    prompt_price, cached_price, completion_price = MODEL_PRICING.get(model, (0.0, 0.0, 0.0))
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    cost = (uncached * prompt_price + cached_tokens * cached_price + completion_tokens * completion_price) / 1000
+    return cost * BATCH_PRICE_FACTOR if batch else cost
+
+def usage_counts(usage: Any) -> Tuple[int, int, int]:
+    """Read prompt, completion and cached prompt tokens from an API usage object or its JSON dict."""
+    if usage is None:
+        return 0, 0, 0
+    if isinstance(usage, dict):
+        details = usage.get("prompt_tokens_details") or {}
+        return (
+            usage.get("prompt_tokens", 0) or 0,
+            usage.get("completion_tokens", 0) or 0,
+            details.get("cached_tokens", 0) or 0
+        )
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+        getattr(details, "cached_tokens", 0) or 0
+    )
+
+@dataclass
+class CallRecord:
+    """Metrics for one OpenAI call."""
+    meeting_id: Optional[str]
+    call: str  # "summary", "cascade" or "domain:<key>"
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    latency: float = 0.0  # seconds spent in the API call itself
+    queue_wait: float = 0.0  # seconds spent waiting for the scheduler
+    retries: int = 0
+    cache_status: str = "miss"  # "hit" when the provider served part of the prompt from cache
+    prompt_prefix: str = ""  # fingerprint of the messages meant to be shared with other calls
+    cost: float = 0.0
+    status: str = "ok"  # "ok" or "error"
+    batch: bool = False  # made through the Batch API, so latency is not tracked and the price is discounted
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+class MetricsRecorder:
+    """
+    Collects call records in memory, aggregates them per meeting and appends them to a JSONL sink.
+
+    Only the last ``max_records`` calls are kept in memory, and the per-meeting
+    index drops its records along with them; the running totals and the sink
+    keep everything. One recorder is shared by every session in the process.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = METRICS_JSONL_PATH, max_records: int = 10000):
+        self.jsonl_path = jsonl_path
+        self.max_records = max_records
+        self._lock = threading.Lock()
+        self._records: List[CallRecord] = []
+        self._by_meeting: Dict[str, List[CallRecord]] = defaultdict(list)
+        self._totals = defaultdict(lambda: defaultdict(float))
+        self._latency_histogram = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def record(self, record: CallRecord):
+        """Store a call record and append it to the JSONL sink."""
+        record.cost = estimate_cost(record.model, record.prompt_tokens, record.completion_tokens,
+                                    record.cached_tokens, record.batch)
+        record.cache_status = "hit" if record.cached_tokens > 0 else "miss"
+
+        with self._lock:
+            self._records.append(record)
+            if record.meeting_id:
+                self._by_meeting[record.meeting_id].append(record)
+            if len(self._records) > self.max_records:
+                dropped = self._records[:len(self._records) - self.max_records]
+                del self._records[:len(dropped)]
+                # Records are dropped oldest first, so each is the oldest of its meeting's
+                for old in dropped:
+                    meeting_records = self._by_meeting.get(old.meeting_id) if old.meeting_id else None
+                    if meeting_records:
+                        meeting_records.pop(0)
+                        if not meeting_records:
+                            del self._by_meeting[old.meeting_id]
+
+            # Running totals per model and call type for the metrics export
+            totals = self._totals[(record.model, record.call.split(":")[0], record.status)]
+            totals["calls"] += 1
+            totals["prompt_tokens"] += record.prompt_tokens
+            totals["completion_tokens"] += record.completion_tokens
+            totals["cached_tokens"] += record.cached_tokens
+            totals["retries"] += record.retries
+            totals["cost"] += record.cost
+            totals["latency"] += record.latency
+
+            histogram = self._latency_histogram[record.model]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if record.latency <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[-1] += 1
+
+            if self.jsonl_path:
+                try:
+                    os.makedirs(os.path.dirname(self.jsonl_path), exist_ok=True)
+                    with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(asdict(record)) + "\n")
+                except OSError as e:
+                    print(f"Failed to write LLM metrics: {str(e)}")
+
+    def meeting_summary(self, meeting_id: str, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Aggregate the calls made while analyzing one meeting.
+
+        ``since`` limits the summary to calls recorded from then on, so one
+        analysis run is not counted together with earlier runs of the meeting.
+        """
+        with self._lock:
+            records = list(self._by_meeting.get(meeting_id, []))
+        if since is not None:
+            records = [record for record in records if datetime.fromisoformat(record.timestamp) >= since]
+        return self._summarize(records)
+
+    def recent_records(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return the most recent call records, newest first."""
+        with self._lock:
+            return [asdict(record) for record in reversed(self._records[-limit:])]
+
+    def meeting_ids(self) -> List[str]:
+        """Return the meetings that have recorded calls."""
+        with self._lock:
+            return list(self._by_meeting.keys())
+
+    @staticmethod
+    def _summarize(records: List[CallRecord]) -> Dict[str, Any]:
+        summary = {
+            "calls": len(records),
+            "prompt_tokens": sum(r.prompt_tokens for r in records),
+            "completion_tokens": sum(r.completion_tokens for r in records),
+            "cached_tokens": sum(r.cached_tokens for r in records),
+            "cache_hit_rate": 0.0,
+            "retries": sum(r.retries for r in records),
+            "errors": sum(1 for r in records if r.status != "ok"),
+            "cost": round(sum(r.cost for r in records), 6),
+            "latency_total": round(sum(r.latency for r in records), 3),
+            "latency_max": round(max((r.latency for r in records), default=0.0), 3),
+            "by_call": {}
+        }
+        if summary["prompt_tokens"]:
+            summary["cache_hit_rate"] = round(summary["cached_tokens"] / summary["prompt_tokens"], 4)
+        for record in records:
+            call = summary["by_call"].setdefault(record.call, {
+                "model": record.model, "calls": 0, "tokens": 0, "cost": 0.0, "latency": 0.0
+            })
+            call["calls"] += 1
+            call["tokens"] += record.prompt_tokens + record.completion_tokens
+            call["cost"] = round(call["cost"] + record.cost, 6)
+            call["latency"] = round(call["latency"] + record.latency, 3)
+        return summary
+
+    def prometheus_text(self) -> str:
+        """Render the running totals in the Prometheus text exposition format."""
+        counters = [
+            ("llm_calls_total", "calls", "OpenAI calls made"),
+            ("llm_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent"),
+            ("llm_completion_tokens_total", "completion_tokens", "Completion tokens received"),
+            ("llm_cached_tokens_total", "cached_tokens", "Prompt tokens served from the provider cache"),
+            ("llm_retries_total", "retries", "Retries after rate limits or transient errors"),
+            ("llm_cost_usd_total", "cost", "Estimated cost in USD")
+        ]
+
+        with self._lock:
+            totals = {key: dict(values) for key, values in self._totals.items()}
+            histograms = {model: list(counts) for model, counts in self._latency_histogram.items()}
+            latency_sums = defaultdict(float)
+            for (model, _, _), values in self._totals.items():
+                latency_sums[model] += values["latency"]
+
+        lines = []
+        for name, key, help_text in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (model, call, status), values in sorted(totals.items()):
+                lines.append(f'{name}{{model="{model}",call="{call}",status="{status}"}} {values.get(key, 0):g}')
+
+        lines.append("# HELP llm_latency_seconds OpenAI call latency")
+        lines.append("# TYPE llm_latency_seconds histogram")
+        for model, counts in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, counts):
+                cumulative += count
+                lines.append(f'llm_latency_seconds_bucket{{model="{model}",le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'llm_latency_seconds_bucket{{model="{model}",le="+Inf"}} {cumulative}')
+            lines.append(f'llm_latency_seconds_sum{{model="{model}"}} {latency_sums[model]:g}')
+            lines.append(f'llm_latency_seconds_count{{model="{model}"}} {cumulative}')
+
+        return "\n".join(lines) + "\n"
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> MetricsRecorder:
+    """Return the metrics recorder shared by every session in this process."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRecorder()
+        return _metrics
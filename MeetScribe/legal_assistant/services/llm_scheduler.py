@@ -0,0 +1,227 @@
+"""
+Process-wide rate limiting and priority scheduling for OpenAI calls.
+"""
+import heapq
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import openai
+
+import config
+
+# Priority classes, most urgent first
+PRIORITY_CLASSES = {
+    "live": 0,          # analysis of a meeting that is in progress or just ended
+    "interactive": 1,   # a user re-running analysis and waiting for it
+    "backfill": 2       # batch reprocessing that can wait
+}
+
+# Used when config sets no OPENAI_RPM_LIMIT or OPENAI_TPM_LIMIT for the account's tier
+DEFAULT_RPM_LIMIT = 500
+DEFAULT_TPM_LIMIT = 30000
+
+# Share of each bucket that backfill work must leave free for interactive calls
+BACKFILL_RESERVE = 0.2
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate limit durations such as "20ms", "1.5s" or "6m0s" into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+def retry_delay_from_headers(headers) -> Optional[float]:
+    """Work out how long to back off from the headers of a 429 response."""
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        return parse_reset_duration(headers["retry-after-ms"] + "ms")
+
+    delays = [
+        parse_reset_duration(headers.get(name))
+        for name in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    delays = [delay for delay in delays if delay is not None]
+    return max(delays) if delays else None
+
+def estimate_tokens(messages, max_tokens: int = 0) -> int:
+    """Roughly estimate the tokens a chat request uses (about four characters per token)."""
+    characters = sum(len(message.get("content") or "") for message in messages)
+    return characters // 4 + max_tokens
+
+class CallCancelled(Exception):
+    """Raised by a scheduled call that gives up before sending its request; its admission is refunded."""
+
+class TokenBucket:
+    """A token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float, reserve: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken while leaving ``reserve`` of capacity."""
+        self._refill(now)
+        needed = min(amount, self.capacity) + reserve * self.capacity - self.tokens
+        return max(needed, 0.0) / self.rate
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float, now: float):
+        """Give back ``amount`` taken for a call that was never sent."""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+class LLMScheduler:
+    """
+    Admits OpenAI calls within requests-per-minute and tokens-per-minute budgets.
+
+    Waiting calls are ordered by priority class, then by start-time fair
+    queueing across sessions within a class: each session's next call is
+    stamped after its previous one, so a session with many queued calls
+    cannot starve the others. Backfill calls must leave a reserve of each
+    budget free. A 429 response pauses all admissions for the delay given
+    in its headers. A call that raises ``CallCancelled`` before sending its
+    request gets its admission back.
+    """
+
+    def __init__(self, rpm_limit: int = DEFAULT_RPM_LIMIT, tpm_limit: int = DEFAULT_TPM_LIMIT,
+                 max_retries: int = 4):
+        self.requests = TokenBucket(rpm_limit)
+        self.tokens = TokenBucket(tpm_limit)
+        self.max_retries = max_retries
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = 0
+        self._virtual_time: Dict[int, float] = {}
+        # Finish stamp of each session's latest queued call; dropped once that call is admitted
+        self._session_finish: Dict[Any, float] = {}
+        self._paused_until = 0.0
+        self.stats = {"admitted": 0, "rate_limited": 0, "retried": 0, "cancelled": 0}
+
+    def run(self, fn: Callable[[], Any], priority: str = "interactive", session_id: str = "default",
+            estimated_tokens: int = 1000, call_stats: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call ``fn`` once capacity allows, retrying on rate limits and transient errors.
+
+        When ``call_stats`` is given, the seconds spent waiting for admission
+        and the number of retries are recorded in it.
+        """
+        if call_stats is None:
+            call_stats = {}
+        call_stats.setdefault("queue_wait", 0.0)
+        call_stats.setdefault("retries", 0)
+
+        for attempt in range(self.max_retries + 1):
+            queued = time.monotonic()
+            self._acquire(priority, session_id, estimated_tokens)
+            call_stats["queue_wait"] += time.monotonic() - queued
+            try:
+                return fn()
+            except CallCancelled:
+                self._refund(estimated_tokens)
+                raise
+            except openai.RateLimitError as e:
+                if attempt == self.max_retries:
+                    raise
+                headers = getattr(getattr(e, "response", None), "headers", None)
+                delay = retry_delay_from_headers(headers) or self._backoff(attempt)
+                with self._cond:
+                    self.stats["rate_limited"] += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                    self._cond.notify_all()
+            except (openai.APIConnectionError, openai.InternalServerError):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+            call_stats["retries"] += 1
+            with self._cond:
+                self.stats["retried"] += 1
+
+    def _refund(self, estimated_tokens: int):
+        """Return the request and tokens taken by an admission that was not used."""
+        with self._cond:
+            now = time.monotonic()
+            self.requests.refund(1, now)
+            self.tokens.refund(estimated_tokens, now)
+            self.stats["cancelled"] += 1
+            self._cond.notify_all()
+
+    def _backoff(self, attempt: int) -> float:
+        return min(2 ** attempt, 30) * (0.5 + random.random() / 2)
+
+    def _acquire(self, priority: str, session_id: str, estimated_tokens: int):
+        """Block until this call is at the head of the queue and within budget."""
+        rank = PRIORITY_CLASSES.get(priority, PRIORITY_CLASSES["interactive"])
+        reserve = BACKFILL_RESERVE if priority == "backfill" else 0.0
+
+        with self._cond:
+            # Start-time fair queueing: stamp after both the class clock and this session's last call
+            session_key = (rank, session_id)
+            start = max(self._virtual_time.get(rank, 0.0), self._session_finish.get(session_key, 0.0))
+            finish = start + max(estimated_tokens, 1)
+            self._session_finish[session_key] = finish
+            self._seq += 1
+            ticket = (rank, finish, self._seq)
+            heapq.heappush(self._queue, ticket)
+
+            while True:
+                now = time.monotonic()
+                if self._queue[0] == ticket:
+                    wait = max(
+                        self._paused_until - now,
+                        self.requests.wait_time(1, now, reserve),
+                        self.tokens.wait_time(estimated_tokens, now, reserve)
+                    )
+                    if wait <= 0:
+                        heapq.heappop(self._queue)
+                        self.requests.consume(1, now)
+                        self.tokens.consume(estimated_tokens, now)
+                        self._virtual_time[rank] = finish
+                        if self._session_finish.get(session_key) == finish:
+                            # Nothing else queued for the session; the class clock now stamps its next call
+                            del self._session_finish[session_key]
+                        self.stats["admitted"] += 1
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(timeout=wait)
+                else:
+                    self._cond.wait()
+
+    def queue_depth(self) -> int:
+        """Number of calls waiting for admission."""
+        with self._cond:
+            return len(self._queue)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> LLMScheduler:
+    """Return the scheduler shared by every session in this process."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(rpm_limit=getattr(config, "OPENAI_RPM_LIMIT", DEFAULT_RPM_LIMIT),
+                                      tpm_limit=getattr(config, "OPENAI_TPM_LIMIT", DEFAULT_TPM_LIMIT))
+        return _scheduler
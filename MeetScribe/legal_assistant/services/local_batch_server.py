@@ -0,0 +1,250 @@
+"""
+A local stand-in for the OpenAI Files and Batches endpoints, so batch analysis can run without the real API.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, Optional
+
+from services.llm_scheduler import estimate_tokens
+
+SUPPORTED_ENDPOINTS = ("/v1/chat/completions",)
+
+def canned_reply(body: Dict[str, Any]) -> str:
+    """
+    Reply to a chat completion request with deterministic placeholder content.
+
+    JSON mode requests get an object in the domain result structure with one
+    action item named after a hash of the messages, so repeated runs produce
+    the same results and different prompts produce different ones.
+    """
+    digest = hashlib.sha1(json.dumps(body.get("messages", []), sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    if body.get("response_format", {}).get("type") == "json_object":
+        return json.dumps({
+            "key_issues": [f"Stand-in issue {digest}"],
+            "action_items": [f"Review stand-in finding {digest}"],
+            "deadlines": [],
+            "legal_requirements": [],
+            "summary": f"Stand-in analysis {digest}."
+        })
+    return f"Stand-in summary {digest}."
+
+class LocalBatchServer:
+    """
+    Serves the subset of the OpenAI API that ``BatchAnalyzer`` uses, on a local port.
+
+    Uploaded files and batches are kept in memory. A batch is answered by
+    ``responder``, called with each request body, once ``processing_delay``
+    seconds have passed, so callers see it go through the same statuses as a
+    real batch. Point an ``openai.OpenAI`` client at ``url`` to use it.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], str] = canned_reply,
+                 processing_delay: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.responder = responder
+        self.processing_delay = processing_delay
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.file_contents: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "LocalBatchServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalBatchServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add_file(self, content: bytes, filename: str, purpose: str) -> Dict[str, Any]:
+        file_object = {
+            "id": f"file-{uuid.uuid4().hex[:24]}",
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed"
+        }
+        with self._lock:
+            self.files[file_object["id"]] = file_object
+            self.file_contents[file_object["id"]] = content
+        return file_object
+
+    def create_batch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        now = int(time.time())
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": params["endpoint"],
+            "input_file_id": params["input_file_id"],
+            "completion_window": params.get("completion_window", "24h"),
+            "status": "validating",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": now,
+            "expires_at": now + 24 * 3600,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "metadata": params.get("metadata")
+        }
+        with self._lock:
+            self.batches[batch["id"]] = batch
+        threading.Timer(self.processing_delay, self._process_batch, args=(batch["id"],)).start()
+        return batch
+
+    def _process_batch(self, batch_id: str):
+        """Answer every request in a batch's input file and publish the output files."""
+        with self._lock:
+            batch = self.batches[batch_id]
+            if batch["status"] != "validating":
+                return
+            lines = self.file_contents[batch["input_file_id"]].decode("utf-8").splitlines()
+            batch["status"] = "in_progress"
+            batch["in_progress_at"] = int(time.time())
+
+        outputs, errors = [], []
+        for line in lines:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            reply = {"id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": request.get("custom_id"),
+                     "response": None, "error": None}
+            if request.get("url") != batch["endpoint"]:
+                reply["error"] = {"code": "invalid_url", "message": f"URL must be {batch['endpoint']}"}
+                errors.append(reply)
+                continue
+            try:
+                content = self.responder(request["body"])
+            except Exception as e:
+                reply["response"] = {"status_code": 500, "request_id": uuid.uuid4().hex,
+                                     "body": {"error": {"message": str(e), "type": "server_error"}}}
+                errors.append(reply)
+                continue
+            prompt_tokens = estimate_tokens(request["body"].get("messages", []))
+            completion_tokens = estimate_tokens([{"content": content}])
+            reply["response"] = {"status_code": 200, "request_id": uuid.uuid4().hex, "body": {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["body"].get("model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens}
+            }}
+            outputs.append(reply)
+
+        output_file = self.add_file("".join(json.dumps(r) + "\n" for r in outputs).encode("utf-8"),
+                                    f"{batch_id}_output.jsonl", "batch_output") if outputs else None
+        error_file = self.add_file("".join(json.dumps(r) + "\n" for r in errors).encode("utf-8"),
+                                   f"{batch_id}_error.jsonl", "batch_output") if errors else None
+        with self._lock:
+            if batch["status"] != "in_progress":
+                return
+            batch.update({
+                "status": "completed",
+                "completed_at": int(time.time()),
+                "output_file_id": output_file["id"] if output_file else None,
+                "error_file_id": error_file["id"] if error_file else None,
+                "request_counts": {"total": len(outputs) + len(errors), "completed": len(outputs),
+                                   "failed": len(errors)}
+            })
+
+    def cancel_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            if batch and batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+                batch["status"] = "cancelled"
+                batch["cancelled_at"] = int(time.time())
+            return batch
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, payload: Any, content_type: str = "application/json"):
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _not_found(self):
+                self._send(404, {"error": {"message": f"No route for {self.command} {self.path}",
+                                           "type": "invalid_request_error"}})
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                match = re.fullmatch(r"/v1/files/([^/]+)(/content)?", path)
+                if match and match.group(1) in server.files:
+                    if match.group(2):
+                        self._send(200, server.file_contents[match.group(1)], "application/octet-stream")
+                    else:
+                        self._send(200, server.files[match.group(1)])
+                    return
+                match = re.fullmatch(r"/v1/batches/([^/]+)", path)
+                if match and match.group(1) in server.batches:
+                    with server._lock:
+                        self._send(200, dict(server.batches[match.group(1)]))
+                    return
+                self._not_found()
+
+            def do_POST(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/v1/files":
+                    # The file arrives as multipart form data, which the email parser can read
+                    message = BytesParser(policy=default_policy).parsebytes(
+                        f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("utf-8") + self._body()
+                    )
+                    fields = {part.get_param("name", header="content-disposition"): part
+                              for part in message.iter_parts()}
+                    if "file" not in fields:
+                        self._send(400, {"error": {"message": "Missing file", "type": "invalid_request_error"}})
+                        return
+                    purpose = fields["purpose"].get_content().strip() if "purpose" in fields else "batch"
+                    self._send(200, server.add_file(fields["file"].get_payload(decode=True),
+                                                    fields["file"].get_filename() or "upload.jsonl", purpose))
+                elif path == "/v1/batches":
+                    params = json.loads(self._body() or b"{}")
+                    if params.get("input_file_id") not in server.files:
+                        self._send(400, {"error": {"message": "Unknown input_file_id", "type": "invalid_request_error"}})
+                    elif params.get("endpoint") not in SUPPORTED_ENDPOINTS:
+                        self._send(400, {"error": {"message": "Unsupported endpoint", "type": "invalid_request_error"}})
+                    else:
+                        self._send(200, server.create_batch(params))
+                else:
+                    match = re.fullmatch(r"/v1/batches/([^/]+)/cancel", path)
+                    batch = server.cancel_batch(match.group(1)) if match else None
+                    if batch:
+                        self._send(200, dict(batch))
+                    else:
+                        self._not_found()
+
+        return Handler
@@ -7,6 +7,45 @@ import time
 from typing import Dict, Any, Optional, List, Tuple
 
 from config import MEETSTREAM_API_URL, MEETSTREAM_API_KEY, TRANSCRIPT_WEBHOOK_URL
+from utils.time_index import format_seconds
+from utils.speaker_analytics import compute_speaker_analytics
+from utils.tracing import traced
+
+def transcript_start_time(raw_transcript: List[Dict[str, Any]]) -> float:
+    """Return the start of the first word of a raw transcript, which entry times are measured from."""
+    try:
+        return raw_transcript[0].get("words", [])[0].get("start", 0) if raw_transcript[0].get("words") else 0
+    except (IndexError, KeyError):
+        return 0
+
+def convert_transcript_entries(raw_entries: List[Dict[str, Any]], start_time: float,
+                               previous_end: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Convert raw MeetStream entries to the application's transcript entries.
+    
+    ``previous_end`` is the end of the entry before ``raw_entries``, used as
+    the time of entries that carry no word timings, so a transcript can be
+    converted in pieces.
+    """
+    processed_entries = []
+    for entry in raw_entries:
+        # Extract start and end in seconds from the words field if available
+        start_seconds = previous_end
+        end_seconds = previous_end
+        if entry.get("words") and len(entry["words"]) > 0:
+            start_seconds = max(entry["words"][0].get("start", 0) - start_time, 0.0)
+            end_seconds = max(entry["words"][-1].get("end", entry["words"][-1].get("start", 0)) - start_time,
+                              start_seconds)
+        previous_end = end_seconds
+        
+        processed_entries.append({
+            "speaker": entry.get("speaker", "Unknown"),
+            "timestamp": format_seconds(start_seconds),
+            "start": start_seconds,
+            "end": end_seconds,
+            "text": entry.get("transcript", "")
+        })
+    return processed_entries
 
 class MeetStreamClient:
     """Client for interacting with the MeetStream API."""
@@ -19,6 +58,7 @@ class MeetStreamClient:
             "Authorization": f"Token {self.api_key}"  # Make sure there's a space after "Token"
         }
     
+    @traced()
     def create_bot(self, meeting_link: str, bot_name: str = "LegalMind Assistant", 
                   audio_required: bool = True, video_required: bool = False,
                   live_transcription: bool = True) -> Dict[str, Any]:
@@ -57,6 +97,7 @@ class MeetStreamClient:
                 error_msg = f"{error_msg}. Status code: {e.response.status_code}. Response: {e.response.text}"
             raise Exception(error_msg)
     
+    @traced()
     def get_bot_status(self, bot_id: str) -> Dict[str, Any]:
         """Get the current status of a bot."""
         endpoint = f"{self.api_url}/api/v1/bots/{bot_id}/status"
@@ -75,39 +116,44 @@ class MeetStreamClient:
                 error_msg = f"{error_msg}. Status code: {e.response.status_code}. Response: {e.response.text}"
             raise Exception(error_msg)
     
+    @traced()
     def get_transcript(self, bot_id: str) -> Dict[str, Any]:
         """Get the transcript from a meeting."""
+        raw_transcript = self.get_raw_transcript(bot_id)
+        if raw_transcript is None:
+            return {
+                "transcript": [], 
+                "message": "Recording not found or not ready yet. There may not be any speech to transcribe, or the transcript is still processing."
+            }
+        
+        # Convert to the format expected by our application
+        return self._process_transcript_format(raw_transcript)
+    
+    @traced()
+    def get_raw_transcript(self, bot_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a meeting's transcript entries as MeetStream returns them, or None if there is no recording yet."""
         endpoint = f"{self.api_url}/api/v1/bots/{bot_id}/get_transcript"
         
         try:
             print(f"Getting transcript with endpoint: {endpoint}")
             response = requests.get(endpoint, headers=self.headers)
             print(f"Response status code: {response.status_code}")
-            print(f"Response content: {response.text}")
             
             # If we get a 404 with "Recording not found", handle gracefully
             if response.status_code == 404 and "Recording not found" in response.text:
-                return {
-                    "transcript": [], 
-                    "message": "Recording not found or not ready yet. There may not be any speech to transcribe, or the transcript is still processing."
-                }
+                return None
             
             response.raise_for_status()
             
-            # Process the transcript data based on the actual format received
             # The format we're receiving is a list of transcript entries
-            raw_transcript = response.json()
-            
-            # Convert to the format expected by our application
-            processed_transcript = self._process_transcript_format(raw_transcript)
-            
-            return processed_transcript
+            return response.json()
         except requests.exceptions.RequestException as e:
             error_msg = f"Failed to get transcript: {str(e)}"
             if hasattr(e, 'response') and e.response is not None:
                 error_msg = f"{error_msg}. Status code: {e.response.status_code}. Response: {e.response.text}"
             raise Exception(error_msg)
     
+    @traced()
     def _process_transcript_format(self, raw_transcript: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Process the raw transcript data into the format expected by our application.
@@ -128,43 +174,32 @@ class MeetStreamClient:
             "transcript": [
                 {
                     "speaker": "Bhavin Jaiswal",
-                    "timestamp": "00:00:31",
+                    "timestamp": "00:31",
+                    "start": 31.2,
+                    "end": 33.9,
                     "text": "Hello. Am I audible? Hello."
                 },
                 ...
             ]
         }
+        
+        ``start`` and ``end`` are seconds from the first word of the meeting and
+        back ``utils.time_index.TranscriptTimeIndex``; ``timestamp`` is for display.
+        Per-speaker analytics are computed here, while word-level timings are
+        still available, and returned under ``speaker_analytics``.
         """
         if not raw_transcript:
             return {"transcript": []}
             
-        processed_entries = []
-        
-        # Get the start time from the first entry to calculate relative timestamps
-        try:
-            start_time = raw_transcript[0].get("words", [])[0].get("start", 0) if raw_transcript[0].get("words") else 0
-        except (IndexError, KeyError):
-            start_time = 0
-            
-        for entry in raw_transcript:
-            # Extract timestamp in seconds from the words field if available
-            timestamp_seconds = 0
-            if entry.get("words") and len(entry["words"]) > 0:
-                timestamp_seconds = entry["words"][0].get("start", 0) - start_time
-                
-            # Format timestamp as MM:SS
-            minutes = int(timestamp_seconds // 60)
-            seconds = int(timestamp_seconds % 60)
-            formatted_timestamp = f"{minutes:02d}:{seconds:02d}"
+        # Timestamps are relative to the first word of the meeting
+        processed_entries = convert_transcript_entries(raw_transcript, transcript_start_time(raw_transcript))
             
-            processed_entries.append({
-                "speaker": entry.get("speaker", "Unknown"),
-                "timestamp": formatted_timestamp,
-                "text": entry.get("transcript", "")
-            })
-            
-        return {"transcript": processed_entries}
+        return {
+            "transcript": processed_entries,
+            "speaker_analytics": compute_speaker_analytics(raw_transcript)
+        }
     
+    @traced()
     def remove_bot(self, bot_id: str) -> Dict[str, Any]:
         """Remove a bot from a meeting."""
         endpoint = f"{self.api_url}/api/v1/bots/{bot_id}/remove_bot"
@@ -0,0 +1,125 @@
+"""
+Prompt templates laid out so every call on a transcript shares the same message prefix.
+"""
+import textwrap
+import zlib
+from string import Template
+from typing import Dict, List, Optional
+
+SYSTEM_PROMPT = "You are a specialized legal AI assistant for corporate legal departments."
+
+# Sent right after the system message, followed by the transcript itself
+TRANSCRIPT_PREFIX = "Here is the meeting transcript. Instructions for analyzing it follow in the next message.\n\n"
+
+class PromptTemplate:
+    """An instruction with ``$placeholders``, dedented and compiled once when the module loads."""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self._template = Template(textwrap.dedent(text).strip())
+
+    def render(self, **values) -> str:
+        return self._template.substitute(values)
+
+_TEMPLATES = {
+    "domain": PromptTemplate("domain", """
+        Focus on $domain_name.
+
+        $domain_description
+
+        Based on the meeting transcript above, please:
+        1. Identify key issues, risks, or opportunities relevant to $domain_name
+        2. Extract action items that legal staff should follow up on
+        3. Note any deadlines or important dates mentioned
+        4. Highlight any specific legal or regulatory requirements discussed
+
+        Format your response as JSON with the following structure:
+        {
+            "key_issues": [list of issues identified],
+            "action_items": [list of specific actions with priority levels],
+            "deadlines": [list of dates and associated tasks],
+            "legal_requirements": [list of legal or regulatory requirements mentioned],
+            "summary": "A brief summary of findings for this domain"
+        }
+
+        If there is no relevant information for this domain, include an empty list for each category and note that in the summary.
+    """),
+    "cascade": PromptTemplate("cascade", """
+        Act as a legal triage assistant. For each legal domain below, decide how relevant
+        the meeting transcript above is to it and extract candidate findings.
+
+        $domain_lines
+
+        Format your response as JSON with the following structure:
+        {
+            "domains": {
+                "<domain key>": {
+                    "relevance": number from 0 (nothing relevant) to 1 (central to the meeting),
+                    "confidence": number from 0 to 1 for how sure you are of your assessment,
+                    "key_issues": [list of issues identified],
+                    "action_items": [list of specific actions with priority levels],
+                    "deadlines": [list of dates and associated tasks],
+                    "legal_requirements": [list of legal or regulatory requirements mentioned],
+                    "summary": "A brief summary of findings for this domain"
+                }
+            }
+        }
+
+        Include every domain listed above.
+    """),
+    "summary": PromptTemplate("summary", """
+        Act as a senior legal advisor to the executive team.
+
+        Based on the meeting transcript above, please provide a comprehensive legal summary addressing:
+        1. The most critical legal issues discussed in the meeting
+        2. High-priority action items that require immediate attention
+        3. Strategic legal considerations for the business
+        4. Risk assessment of issues mentioned
+
+        Format your response as a professional executive summary that could be presented to senior leadership.
+        Keep your response concise but thorough.
+    """),
+    "qa": PromptTemplate("qa", """
+        Answer the question below using only these numbered excerpts from past meetings.
+        Cite the excerpts you rely on by number in square brackets, like [2].
+        If the excerpts do not answer the question, say so instead of guessing.
+
+        Excerpts:
+        $excerpts
+
+        Question: $question
+    """)
+}
+
+# Rendered instructions that depend only on fixed inputs, such as one per domain
+_rendered: Dict[tuple, str] = {}
+
+def get_template(name: str) -> PromptTemplate:
+    return _TEMPLATES[name]
+
+def render_cached(name: str, **values) -> str:
+    """Render a template, reusing the text from earlier calls with the same values."""
+    key = (name,) + tuple(sorted(values.items()))
+    text = _rendered.get(key)
+    if text is None:
+        text = _rendered[key] = _TEMPLATES[name].render(**values)
+    return text
+
+def build_messages(instruction: str, transcript: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Lay out the messages for a call: system message, then transcript, then instruction.
+
+    Calls on the same transcript differ only in their last message, so the
+    provider can serve the system message and transcript from its prompt
+    cache after the first call.
+    """
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if transcript:
+        messages.append({"role": "user", "content": TRANSCRIPT_PREFIX + transcript})
+    messages.append({"role": "user", "content": instruction})
+    return messages
+
+def prefix_fingerprint(messages: List[Dict[str, str]], shared: int = 2) -> str:
+    """Hash the first ``shared`` messages, the part meant to be shared between calls."""
+    prefix = "\x1e".join(f"{m.get('role')}:{m.get('content') or ''}" for m in messages[:shared])
+    return f"{zlib.crc32(prefix.encode('utf-8')):08x}"
@@ -0,0 +1,132 @@
+"""
+Local reminders for actions approaching or past their due dates.
+"""
+import time
+from dataclasses import dataclass, asdict
+from datetime import date
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from models.legal_tasks import LegalTaskManager, LegalAction
+
+# Days before the due date at which an open action is first reminded, by priority
+REMINDER_LEAD_DAYS = {"high": 7, "medium": 3, "low": 1}
+DEFAULT_LEAD_DAYS = 3
+
+# Minimum seconds between checks, so frequent reruns do not query the index each time
+REMINDER_CHECK_INTERVAL = 30.0
+
+# More reminders than this raised at once are shown as one summary instead
+MAX_REMINDER_TOASTS = 3
+
+@dataclass
+class Reminder:
+    """A reminder that an action is due soon or overdue."""
+    action_id: str
+    title: str
+    domain: str
+    priority: str
+    due_date: str
+    days_left: int
+    kind: str  # "upcoming" or "overdue"
+
+    @property
+    def message(self) -> str:
+        if self.kind == "overdue":
+            days = -self.days_left
+            return f"Overdue by {days} day{'s' if days != 1 else ''}: {self.title}"
+        if self.days_left == 0:
+            return f"Due today: {self.title}"
+        return f"Due in {self.days_left} day{'s' if self.days_left != 1 else ''}: {self.title}"
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.action_id, self.due_date, self.kind)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def reminder_summary(reminders: List[Reminder]) -> str:
+    """Describe several reminders in one line, such as "4 overdue and 2 due soon"."""
+    overdue = sum(1 for reminder in reminders if reminder.kind == "overdue")
+    parts = []
+    if overdue:
+        parts.append(f"{overdue} overdue")
+    if len(reminders) > overdue:
+        parts.append(f"{len(reminders) - overdue} due soon")
+    return " and ".join(parts)
+
+class ReminderScheduler:
+    """
+    Decides which deadline reminders to raise for a task manager.
+
+    Each check reads the task manager's due-date index rather than scanning
+    every action: the overdue range plus the actions due within the longest
+    lead time. An action is reminded once when it enters its priority's lead
+    window and once more when it becomes overdue; changing its due date makes
+    it eligible again. ``acknowledged`` restores the reminders already raised,
+    as saved from a previous session.
+    """
+
+    def __init__(self, lead_days: Optional[Dict[str, int]] = None,
+                 check_interval: float = REMINDER_CHECK_INTERVAL,
+                 acknowledged: Optional[List[List[str]]] = None):
+        self.lead_days = dict(lead_days or REMINDER_LEAD_DAYS)
+        self.check_interval = check_interval
+        self._sent: Set[Tuple[str, str, str]] = {tuple(key) for key in acknowledged or ()}
+        self._next_check = 0.0
+        self._checked_revision = None
+
+    @property
+    def acknowledged(self) -> List[List[str]]:
+        """The reminders already raised, in a JSON-friendly form for the session snapshot."""
+        return sorted(list(key) for key in self._sent)
+
+    def active(self, task_manager: LegalTaskManager, today: Optional[date] = None) -> List[Reminder]:
+        """Return every reminder currently in effect, overdue first, without marking any as sent."""
+        today = today or date.today()
+        max_lead = max(list(self.lead_days.values()) + [DEFAULT_LEAD_DAYS])
+
+        reminders = []
+        for action in task_manager.overdue(today) + task_manager.due_within(max_lead, today):
+            reminder = self._reminder(action, today)
+            if reminder:
+                reminders.append(reminder)
+        return reminders
+
+    def check(self, task_manager: LegalTaskManager, today: Optional[date] = None,
+              force: bool = False) -> List[Reminder]:
+        """
+        Return the reminders that have not been raised yet.
+
+        Checks at most once per check interval unless the task manager has
+        changed since the last check. Only reminders still in effect are
+        remembered, so the acknowledged set stays as small as the reminders.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check and task_manager.revision == self._checked_revision:
+            return []
+        self._next_check = now + self.check_interval
+        self._checked_revision = task_manager.revision
+
+        active = self.active(task_manager, today)
+        fresh = [reminder for reminder in active if reminder.key not in self._sent]
+        self._sent = {reminder.key for reminder in active}
+        return fresh
+
+    def _reminder(self, action: LegalAction, today: date) -> Optional[Reminder]:
+        days_left = (date.fromisoformat(action.due_date) - today).days
+        if days_left < 0:
+            kind = "overdue"
+        elif days_left <= self.lead_days.get(action.priority, DEFAULT_LEAD_DAYS):
+            kind = "upcoming"
+        else:
+            return None
+        return Reminder(
+            action_id=action.id,
+            title=action.title,
+            domain=action.domain,
+            priority=action.priority,
+            due_date=action.due_date,
+            days_left=days_left,
+            kind=kind
+        )
@@ -0,0 +1,206 @@
+"""
+Server-side snapshots of session state, stored as compressed, versioned files on local disk.
+"""
+import gzip
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Any, Optional
+
+SESSION_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sessions")
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Write a full snapshot instead of another delta once this many deltas have piled up
+MAX_DELTAS = 20
+
+# IDs used as file or directory names, limited so they cannot point outside a store's directory
+_STORAGE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+def is_storage_id(value: Optional[str]) -> bool:
+    """Whether an ID is safe to use as a file or directory name inside a store."""
+    return bool(_STORAGE_ID_RE.match(value or ""))
+
+class SessionSnapshotStore:
+    """
+    Saves and restores session state made of collections of records keyed by ID.
+
+    Each session has a directory holding a full ``base`` snapshot, the
+    ``delta`` snapshots written after it and a manifest listing them. A delta
+    only holds the records that were added, changed or removed since the
+    previous save, detected by hashing each record, so a small change does not
+    rewrite the whole state. Restoring loads the base and applies the deltas in
+    order. Every save gets the next version number; after ``max_deltas``
+    deltas the next save writes a new base and removes the older files.
+    """
+
+    def __init__(self, root_dir: str = SESSION_SNAPSHOT_DIR, compresslevel: int = 6,
+                 max_deltas: int = MAX_DELTAS):
+        self.root_dir = root_dir
+        self.compresslevel = compresslevel
+        self.max_deltas = max_deltas
+        self._hashes: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def _session_dir(self, session_id: str) -> str:
+        if not is_storage_id(session_id):
+            raise ValueError(f"Invalid session ID: {session_id!r}")
+        return os.path.join(self.root_dir, session_id)
+
+    def _read_manifest(self, session_id: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self._session_dir(session_id), "manifest.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("format") != SNAPSHOT_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def _write_manifest(self, session_id: str, manifest: Dict[str, Any]):
+        path = os.path.join(self._session_dir(session_id), "manifest.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _write_blob(self, session_id: str, name: str, payload: Dict[str, Any]):
+        path = os.path.join(self._session_dir(session_id), name)
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(gzip.compress(data, compresslevel=self.compresslevel))
+
+    def _read_blob(self, session_id: str, name: str) -> Dict[str, Any]:
+        path = os.path.join(self._session_dir(session_id), name)
+        with open(path, "rb") as f:
+            return json.loads(gzip.decompress(f.read()).decode("utf-8"))
+
+    @staticmethod
+    def _hash_records(state: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+        return {
+            collection: {
+                record_id: zlib.crc32(json.dumps(record, sort_keys=True, default=str).encode("utf-8"))
+                for record_id, record in records.items()
+            }
+            for collection, records in state.items()
+        }
+
+    def save(self, session_id: str, state: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Save ``state``, a mapping of collection name to ``{record_id: record}``.
+
+        Returns the version number of the stored snapshot, which is unchanged
+        when nothing differs from the previous save.
+        """
+        with self._lock:
+            session_dir = self._session_dir(session_id)
+            os.makedirs(session_dir, exist_ok=True)
+
+            hashes = self._hash_records(state)
+            previous = self._hashes.get(session_id)
+            manifest = self._read_manifest(session_id)
+
+            if previous is None or manifest is None or len(manifest["deltas"]) >= self.max_deltas:
+                return self._save_base(session_id, state, hashes, manifest)
+
+            upserts, deletes = {}, {}
+            for collection, records in state.items():
+                old = previous.get(collection, {})
+                changed = {
+                    record_id: record for record_id, record in records.items()
+                    if old.get(record_id) != hashes[collection][record_id]
+                }
+                removed = [record_id for record_id in old if record_id not in records]
+                if changed:
+                    upserts[collection] = changed
+                if removed:
+                    deletes[collection] = removed
+            for collection, old in previous.items():
+                if collection not in state and old:
+                    deletes[collection] = list(old)
+
+            if not upserts and not deletes:
+                return manifest["version"]
+
+            version = manifest["version"] + 1
+            name = f"{version:06d}.delta.json.gz"
+            self._write_blob(session_id, name, {
+                "format": SNAPSHOT_FORMAT_VERSION,
+                "version": version,
+                "upserts": upserts,
+                "deletes": deletes
+            })
+            manifest["version"] = version
+            manifest["deltas"].append(name)
+            self._write_manifest(session_id, manifest)
+            self._hashes[session_id] = hashes
+            return version
+
+    def _save_base(self, session_id: str, state: Dict[str, Dict[str, Any]],
+                   hashes: Dict[str, Dict[str, int]], manifest: Optional[Dict[str, Any]]) -> int:
+        """Write a full snapshot and drop the files it supersedes."""
+        version = (manifest["version"] if manifest else 0) + 1
+        name = f"{version:06d}.base.json.gz"
+        self._write_blob(session_id, name, {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "version": version,
+            "state": state
+        })
+        self._write_manifest(session_id, {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "version": version,
+            "base": name,
+            "deltas": []
+        })
+        self._hashes[session_id] = hashes
+
+        # Remove the previous base and deltas now that the manifest no longer points at them
+        session_dir = self._session_dir(session_id)
+        for file_name in os.listdir(session_dir):
+            if file_name.endswith(".json.gz") and file_name != name:
+                try:
+                    os.remove(os.path.join(session_dir, file_name))
+                except OSError:
+                    pass
+        return version
+
+    def restore(self, session_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Load the latest state saved for a session, or None if there is none."""
+        with self._lock:
+            manifest = self._read_manifest(session_id)
+            if manifest is None:
+                return None
+
+            try:
+                state = self._read_blob(session_id, manifest["base"])["state"]
+                for name in manifest["deltas"]:
+                    delta = self._read_blob(session_id, name)
+                    for collection, records in delta.get("upserts", {}).items():
+                        state.setdefault(collection, {}).update(records)
+                    for collection, record_ids in delta.get("deletes", {}).items():
+                        for record_id in record_ids:
+                            state.get(collection, {}).pop(record_id, None)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Failed to restore session {session_id}: {str(e)}")
+                return None
+
+            self._hashes[session_id] = self._hash_records(state)
+            return state
+
+    def version(self, session_id: str) -> int:
+        """Return the latest saved version for a session, or 0 if none."""
+        manifest = self._read_manifest(session_id)
+        return manifest["version"] if manifest else 0
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store() -> SessionSnapshotStore:
+    """Return the snapshot store shared by every session in this process."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionSnapshotStore()
+        return _store
@@ -0,0 +1,210 @@
+"""
+Local archive of meeting transcripts stored as compressed, randomly addressable blocks.
+"""
+import bisect
+import gzip
+import json
+import mmap
+import os
+import uuid
+from typing import Dict, Any, List, Optional
+
+from services.session_store import is_storage_id
+from utils.time_index import TranscriptTimeIndex
+
+TRANSCRIPT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "transcripts")
+ARCHIVE_FORMAT_VERSION = 3
+
+class TranscriptArchive:
+    """
+    Stores each meeting's transcript as a file of independent gzip frames.
+
+    Every frame holds ``block_size`` utterances encoded as JSON lines. A
+    sidecar index records each frame's byte offset and first utterance
+    number, plus the start and end seconds of every utterance, so a read only
+    maps the file and decompresses the frames that overlap the requested range.
+
+    Each write goes to a new data file named in the index, and the index is
+    replaced last, so an index never describes another write's data. Meeting
+    IDs must be safe file names (see ``is_storage_id``).
+    """
+
+    def __init__(self, root_dir: str = TRANSCRIPT_ARCHIVE_DIR, block_size: int = 64,
+                 compresslevel: int = 6):
+        self.root_dir = root_dir
+        self.block_size = block_size
+        self.compresslevel = compresslevel
+        self._index_cache = {}
+
+    def _path(self, meeting_id: str, suffix: str) -> str:
+        if not is_storage_id(meeting_id):
+            raise ValueError(f"Invalid meeting ID: {meeting_id!r}")
+        return os.path.join(self.root_dir, meeting_id + suffix)
+
+    def _data_path(self, meeting_id: str, index: Optional[Dict[str, Any]] = None) -> str:
+        """Return the data file an index describes; indexes from before version 3 share one name per meeting."""
+        if index and index.get("data_file"):
+            return os.path.join(self.root_dir, index["data_file"])
+        return self._path(meeting_id, ".tra")
+
+    def _index_path(self, meeting_id: str) -> str:
+        return self._path(meeting_id, ".idx.json")
+
+    def write(self, meeting_id: str, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Archive a transcript, replacing any existing archive for the meeting."""
+        if isinstance(transcript_data, dict):
+            entries = transcript_data.get("transcript", [])
+        else:
+            entries = transcript_data or []
+
+        index_path = self._index_path(meeting_id)
+        os.makedirs(self.root_dir, exist_ok=True)
+        time_index = TranscriptTimeIndex.from_entries(entries)
+        previous = self.get_index(meeting_id)
+
+        blocks = []
+        raw_bytes = 0
+        offset = 0
+        data_file = f"{meeting_id}.{uuid.uuid4().hex[:12]}.tra"
+        data_tmp = os.path.join(self.root_dir, data_file + ".tmp")
+        with open(data_tmp, "wb") as f:
+            for first in range(0, len(entries), self.block_size):
+                block_entries = entries[first:first + self.block_size]
+                payload = "\n".join(json.dumps(entry, ensure_ascii=False) for entry in block_entries).encode("utf-8")
+                frame = gzip.compress(payload, compresslevel=self.compresslevel)
+                f.write(frame)
+
+                blocks.append({
+                    "offset": offset,
+                    "length": len(frame),
+                    "first": first,
+                    "count": len(block_entries)
+                })
+                offset += len(frame)
+                raw_bytes += len(payload)
+
+        index = {
+            "version": ARCHIVE_FORMAT_VERSION,
+            "meeting_id": meeting_id,
+            "data_file": data_file,
+            "count": len(entries),
+            "raw_bytes": raw_bytes,
+            "compressed_bytes": offset,
+            "blocks": blocks,
+            "starts": time_index.starts.tolist(),
+            "ends": time_index.ends.tolist()
+        }
+        index_tmp = index_path + ".tmp"
+        with open(index_tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+        # The new data file is unreferenced until the index naming it replaces the old one
+        os.replace(data_tmp, os.path.join(self.root_dir, data_file))
+        os.replace(index_tmp, index_path)
+        self._index_cache[meeting_id] = dict(index, _version=self.version(meeting_id))
+        if previous is not None:
+            try:
+                os.remove(self._data_path(meeting_id, previous))
+            except OSError:
+                pass
+
+        return {
+            "count": index["count"],
+            "raw_bytes": raw_bytes,
+            "compressed_bytes": offset
+        }
+
+    def has(self, meeting_id: str) -> bool:
+        """Check whether a meeting's transcript has been archived."""
+        if not is_storage_id(meeting_id):
+            return False
+        return meeting_id in self._index_cache or os.path.exists(self._index_path(meeting_id))
+
+    def version(self, meeting_id: str) -> Optional[str]:
+        """Return a token that changes whenever the meeting's archive is rewritten, or None if there is none."""
+        try:
+            stat = os.stat(self._index_path(meeting_id))
+        except (OSError, ValueError):
+            return None
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def get_index(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """Load the sidecar index for a meeting."""
+        if not is_storage_id(meeting_id):
+            return None
+        cached = self._index_cache.get(meeting_id)
+        if cached is not None and cached.get("_version") != self.version(meeting_id):
+            # Another archive instance rewrote the transcript since it was cached
+            del self._index_cache[meeting_id]
+        if meeting_id not in self._index_cache:
+            try:
+                version = self.version(meeting_id)
+                with open(self._index_path(meeting_id), "r", encoding="utf-8") as f:
+                    self._index_cache[meeting_id] = dict(json.load(f), _version=version)
+            except (OSError, ValueError):
+                return None
+        return self._index_cache[meeting_id]
+
+    def time_index(self, meeting_id: str) -> Optional[TranscriptTimeIndex]:
+        """Return the numeric time index of an archived transcript without decoding it."""
+        index = self.get_index(meeting_id)
+        if not index:
+            return None
+        return TranscriptTimeIndex(index.get("starts", []), index.get("ends", []))
+
+    def count(self, meeting_id: str) -> int:
+        """Return the number of archived utterances for a meeting."""
+        index = self.get_index(meeting_id)
+        return index["count"] if index else 0
+
+    def read(self, meeting_id: str, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read utterances ``start`` (inclusive) to ``stop`` (exclusive) by number."""
+        try:
+            return self._read(meeting_id, self.get_index(meeting_id), start, stop)
+        except FileNotFoundError:
+            # The transcript was rewritten after its index was loaded; the new index names the new data
+            self._index_cache.pop(meeting_id, None)
+            return self._read(meeting_id, self.get_index(meeting_id), start, stop)
+
+    def _read(self, meeting_id: str, index: Optional[Dict[str, Any]], start: int,
+              stop: Optional[int]) -> List[Dict[str, Any]]:
+        if not index or not index["blocks"]:
+            return []
+
+        start = max(start, 0)
+        stop = index["count"] if stop is None else min(stop, index["count"])
+        if start >= stop:
+            return []
+
+        blocks = index["blocks"]
+        firsts = [block["first"] for block in blocks]
+        first_block = bisect.bisect_right(firsts, start) - 1
+        last_block = bisect.bisect_right(firsts, stop - 1) - 1
+
+        entries = []
+        with open(self._data_path(meeting_id, index), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for block in blocks[first_block:last_block + 1]:
+                    frame = mm[block["offset"]:block["offset"] + block["length"]]
+                    lines = gzip.decompress(frame).decode("utf-8").split("\n")
+                    lo = max(start - block["first"], 0)
+                    hi = min(stop - block["first"], block["count"])
+                    entries.extend(json.loads(line) for line in lines[lo:hi])
+
+        return entries
+
+    def read_time_range(self, meeting_id: str, start_seconds: float,
+                        end_seconds: float) -> List[Dict[str, Any]]:
+        """Read the utterances that start within ``[start_seconds, end_seconds)``."""
+        time_index = self.time_index(meeting_id)
+        if time_index is None:
+            return []
+
+        lo, hi = time_index.window(start_seconds, end_seconds)
+        return self.read(meeting_id, lo, hi)
+
+    def load(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """Load a full archived transcript in the MeetStream client's format."""
+        if not self.has(meeting_id):
+            return None
+        return {"transcript": self.read(meeting_id)}
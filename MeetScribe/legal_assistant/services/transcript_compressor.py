@@ -0,0 +1,191 @@
+"""
+Compression of transcripts before they are placed in LLM prompts.
+"""
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+
+from services.llm_scheduler import estimate_tokens
+from utils.time_index import parse_timestamp
+
+# Timestamps are rounded down to this many seconds and only printed when they change
+TIMESTAMP_RESOLUTION = 60
+
+# Filler words dropped wherever they appear as a lowercase or capitalized word of their own,
+# so abbreviations such as "ER" or "UH" survive, and hedges dropped when set off by a comma.
+# "like" is only a filler when set off on both sides, so "I would like, if possible, ..." keeps it.
+FILLER_RE = re.compile(r",?\s*(?<![\w'-])(?:[Uu]u*m+|[Uu]u*h+|[Ee]e*r+m+|[Ee]e*r+|[Aa]a*h+|[Hh]h*m+|[Mm]m*h*m+)"
+                       r"(?![\w'-])[,.]?")
+HEDGE_RE = re.compile(r",?\s*\b(?:you know|i mean|basically|sort of|kind of),|(?:,|^|(?<=[.!?]))\s*like,",
+                      re.IGNORECASE)
+
+# A word repeated back to back ("the the"), except words that legitimately double up.
+# Numbers are never collapsed: "100 100" or "Section 4 4" may be what was said.
+STUTTER_RE = re.compile(r"\b([^\W\d]+)(?:\s+\1\b)+", re.IGNORECASE)
+STUTTER_EXCEPTIONS = {"that", "had", "is", "no", "very"}
+
+# Sentences that carry no content: audio checks and greetings
+NOISE_SENTENCES = {
+    "hello", "hi", "hey", "hi everyone", "hello everyone", "am i audible", "can you hear me",
+    "can everyone hear me", "can you hear me now", "is my audio okay", "you are on mute",
+    "you're on mute"
+}
+
+# Backchannel that is noise on its own but assent when it answers a question, where it is kept
+SHORT_REPLIES = {
+    "okay", "ok", "alright", "all right", "yeah", "mm hmm", "uh huh",
+    "got it", "sure", "right", "cool", "great", "sorry"
+}
+
+_SENTENCE_RE = re.compile(r"[^.!?]+[.!?]*")
+
+@dataclass
+class CompressionStats:
+    """What a compression pass removed and how many tokens it saved."""
+    original_tokens: int = 0
+    compressed_tokens: int = 0
+    utterances: int = 0
+    turns: int = 0
+    fillers_removed: int = 0
+    noise_removed: int = 0
+    duplicates_removed: int = 0
+    used_original: bool = False  # the compressed text was no shorter, so the original was kept
+    speakers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def reduction(self) -> float:
+        """Share of the original tokens removed, from 0 to 1."""
+        if not self.original_tokens:
+            return 0.0
+        return max(1 - self.compressed_tokens / self.original_tokens, 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["reduction"] = round(self.reduction, 4)
+        return stats
+
+@dataclass
+class CompressedTranscript:
+    """A compressed transcript and the statistics of the pass that produced it."""
+    text: str
+    stats: CompressionStats
+
+def format_coarse_time(seconds: float, resolution: int = TIMESTAMP_RESOLUTION) -> str:
+    """Format seconds rounded down to the resolution as a short label such as ``12m`` or ``1h05m``."""
+    total = int(max(seconds, 0)) // max(resolution, 1) * max(resolution, 1)
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    label = f"{hours}h{minutes:02d}m" if hours else f"{minutes}m"
+    return label + (f"{secs:02d}s" if resolution % 60 else "")
+
+class TranscriptCompressor:
+    """
+    Shrinks a transcript for prompting while keeping what was said and by whom.
+
+    Filler words, repeated words and content-free sentences such as audio
+    checks are removed, as are short replies like "Sure." unless they answer
+    a question; a sentence that exactly repeats the one before it is
+    dropped; consecutive turns by the same speaker are merged into one line; speaker
+    names are replaced by short aliases listed once in a legend; and
+    timestamps are coarsened and only printed when they change.
+    """
+
+    def __init__(self, resolution: int = TIMESTAMP_RESOLUTION, remove_noise: bool = True):
+        self.resolution = resolution
+        self.remove_noise = remove_noise
+
+    def clean_text(self, text: str, stats: CompressionStats, after_question: bool = False) -> List[Tuple[str, str]]:
+        """
+        Strip disfluencies from an utterance and return its remaining sentences with their normalized words.
+
+        ``after_question`` says whether the sentence heard just before ends in a question, so a
+        short reply opening the utterance is kept as an answer.
+        """
+        text, fillers = FILLER_RE.subn(" ", text or "")
+        text, hedges = HEDGE_RE.subn(" ", text)
+        stats.fillers_removed += fillers + hedges
+
+        def collapse(match):
+            if match.group(1).lower() in STUTTER_EXCEPTIONS:
+                return match.group(0)
+            stats.fillers_removed += 1
+            return match.group(1)
+        text = STUTTER_RE.sub(collapse, text)
+
+        sentences = []
+        for sentence in _SENTENCE_RE.findall(text):
+            sentence = " ".join(sentence.split()).lstrip(",;: ")
+            key = " ".join(re.findall(r"[a-z']+", sentence.lower()))
+            if not key:
+                continue
+            if self.remove_noise and (key in NOISE_SENTENCES or (key in SHORT_REPLIES and not after_question)):
+                stats.noise_removed += 1
+                continue
+            sentences.append((key, sentence))
+            after_question = sentence.endswith("?")
+        return sentences
+
+    def compress(self, transcript_entries: List[Dict[str, Any]],
+                 original_text: Optional[str] = None) -> CompressedTranscript:
+        """
+        Compress transcript entries in the MeetStream client's format.
+
+        ``original_text`` is the verbatim prompt text the compressed text
+        replaces, used to report the token reduction. It is returned
+        unchanged when compression would not make it shorter.
+        """
+        stats = CompressionStats(utterances=len(transcript_entries))
+
+        # Clean each utterance and merge consecutive turns by the same speaker
+        turns = []
+        after_question = False
+        for entry in transcript_entries:
+            speaker = entry.get("speaker") or "Unknown"
+            sentences = self.clean_text(entry.get("text", ""), stats, after_question)
+            if not sentences:
+                continue
+            after_question = sentences[-1][1].endswith("?")
+            start = entry.get("start")
+            if start is None:
+                start = parse_timestamp(entry.get("timestamp", "00:00"))
+
+            if turns and turns[-1]["speaker"] == speaker:
+                turn = turns[-1]
+            else:
+                turn = {"speaker": speaker, "start": start, "sentences": [], "last_key": ""}
+                turns.append(turn)
+            for key, sentence in sentences:
+                # Drop a sentence only when it is exactly what the speaker just said
+                if key == turn["last_key"]:
+                    stats.duplicates_removed += 1
+                    continue
+                turn["sentences"].append(sentence)
+                turn["last_key"] = key
+
+        # Alias speakers in order of first appearance
+        aliases = {}
+        for turn in turns:
+            if turn["speaker"] not in aliases:
+                aliases[turn["speaker"]] = f"S{len(aliases) + 1}"
+        stats.speakers = {alias: speaker for speaker, alias in aliases.items()}
+        stats.turns = len(turns)
+
+        lines = ["MEETING TRANSCRIPT:"]
+        if aliases:
+            lines.append("Speakers: " + "; ".join(f"{alias}={speaker}" for speaker, alias in aliases.items()))
+        lines.append("")
+        last_label = None
+        for turn in turns:
+            label = format_coarse_time(turn["start"], self.resolution)
+            prefix = f"[{label}] " if label != last_label else ""
+            last_label = label
+            lines.append(f"{prefix}{aliases[turn['speaker']]}: {' '.join(turn['sentences'])}")
+        text = "\n".join(lines) + "\n"
+
+        stats.compressed_tokens = estimate_tokens([{"content": text}])
+        stats.original_tokens = estimate_tokens([{"content": original_text}]) if original_text else stats.compressed_tokens
+        if original_text and stats.compressed_tokens >= stats.original_tokens:
+            stats.compressed_tokens = stats.original_tokens
+            stats.used_original = True
+            return CompressedTranscript(text=original_text, stats=stats)
+        return CompressedTranscript(text=text, stats=stats)
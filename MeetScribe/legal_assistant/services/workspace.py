@@ -0,0 +1,135 @@
+"""
+The legal workspace shared by every session in this process, read as immutable snapshots.
+"""
+import threading
+from typing import Dict, Any, Optional, Callable
+
+from models.legal_tasks import LegalTaskManager, LegalAction, LegalInsight, MeetingRecord, WRITE_METHODS
+from services.session_store import SessionSnapshotStore, get_session_store
+
+# Name the workspace is saved under in the snapshot store, alongside per-session UI snapshots
+WORKSPACE_SNAPSHOT_ID = "shared_workspace"
+
+class SharedWorkspace:
+    """
+    One task manager shared by all sessions, updated copy-on-write.
+
+    Readers get the current snapshot, a frozen task manager that never
+    changes, so they need no locking and every page renders from a
+    consistent state. A writer applies its change to a copy of the snapshot
+    under a lock and publishes the copy as the new snapshot. The copy shares
+    whatever the change does not touch, and a change that raises leaves the
+    published snapshot as it was.
+    """
+
+    def __init__(self, store: Optional[SessionSnapshotStore] = None, snapshot_id: str = WORKSPACE_SNAPSHOT_ID):
+        self.store = store
+        self.snapshot_id = snapshot_id
+        self._write_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        state = store.restore(snapshot_id) if store else None
+        manager = LegalTaskManager.from_dict(state) if state else LegalTaskManager()
+        manager.freeze()
+        self._current = manager
+        self._saved_revision = manager.revision
+
+    def snapshot(self) -> LegalTaskManager:
+        """Return the current read-only task manager."""
+        return self._current
+
+    @property
+    def revision(self) -> int:
+        return self._current.revision
+
+    def update(self, change: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Apply ``change(task_manager, *args, **kwargs)`` and publish the result.
+
+        Returns whatever ``change`` returns. Writers are serialized, so each
+        change sees every change published before it.
+        """
+        with self._write_lock:
+            draft = self._current.copy()
+            result = change(draft, *args, **kwargs)
+            if draft.revision != self._current.revision:
+                draft.freeze()
+                self._current = draft
+            return result
+
+    def reset(self, manager: Optional[LegalTaskManager] = None):
+        """Replace the whole workspace, with an empty one by default."""
+        with self._write_lock:
+            manager = manager or LegalTaskManager()
+            manager.revision = self._current.revision + 1
+            manager.freeze()
+            self._current = manager
+
+    def import_state(self, state: Dict[str, Dict[str, Any]]) -> int:
+        """Add the records of a ``LegalTaskManager.to_dict`` snapshot that the workspace lacks; returns how many."""
+        def merge(manager: LegalTaskManager) -> int:
+            added = 0
+            for record in state.get("meetings", {}).values():
+                if manager.get_meeting_by_id(record.get("id")) is None:
+                    added += 1
+                    manager.add_meeting(MeetingRecord(**record))
+            for record in state.get("actions", {}).values():
+                if manager.get_action_by_id(record.get("id")) is None:
+                    added += 1
+                    manager.add_action(LegalAction(**record))
+            for record in state.get("insights", {}).values():
+                if manager.get_insight_by_id(record.get("id")) is None:
+                    added += 1
+                    manager.add_insight(LegalInsight(**record))
+            return added
+
+        return self.update(merge)
+
+    def save(self) -> bool:
+        """Write the current snapshot to the store if it changed since the last save."""
+        if self.store is None:
+            return False
+        with self._save_lock:
+            snapshot = self._current
+            if snapshot.revision == self._saved_revision:
+                return False
+            self.store.save(self.snapshot_id, snapshot.to_dict())
+            self._saved_revision = snapshot.revision
+            return True
+
+class WorkspaceView:
+    """
+    A session's view of the shared workspace for one script run.
+
+    Reads go to the snapshot taken when the view was created, so a page
+    shows one consistent state even while other sessions write. Calling one
+    of the task manager's write methods applies it to the shared workspace,
+    after which the view reads the resulting snapshot.
+    """
+
+    def __init__(self, workspace: SharedWorkspace):
+        self.workspace = workspace
+        self.snapshot = workspace.snapshot()
+
+    def __getattr__(self, name: str):
+        if name not in WRITE_METHODS:
+            return getattr(self.snapshot, name)
+
+        method = getattr(LegalTaskManager, name)
+
+        def write(*args, **kwargs):
+            result = self.workspace.update(method, *args, **kwargs)
+            self.snapshot = self.workspace.snapshot()
+            return result
+        return write
+
+_workspace = None
+_workspace_lock = threading.Lock()
+
+def get_workspace() -> SharedWorkspace:
+    """Return the workspace shared by every session in this process."""
+    global _workspace
+    with _workspace_lock:
+        if _workspace is None:
+            _workspace = SharedWorkspace(get_session_store())
+        return _workspace
@@ -0,0 +1,30 @@
+"""
+Shared pytest setup: import the app's modules and isolate their process-wide state.
+"""
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+@pytest.fixture(autouse=True)
+def trace_exporter(monkeypatch, tmp_path):
+    """Export every test's spans to its own temporary file instead of the app's trace log."""
+    import utils.tracing as tracing
+
+    exporter = tracing.FileSpanExporter(str(tmp_path / "spans.jsonl"))
+    monkeypatch.setattr(tracing, "_exporter", exporter)
+    return exporter
+
+@pytest.fixture
+def workspace(monkeypatch):
+    """Give the test its own metrics recorder and an unsaved shared workspace."""
+    import services.llm_metrics as llm_metrics
+    import services.workspace as shared_workspace
+
+    monkeypatch.setattr(llm_metrics, "_metrics", llm_metrics.MetricsRecorder(jsonl_path=None))
+    monkeypatch.setattr(shared_workspace, "_workspace", shared_workspace.SharedWorkspace())
+    return shared_workspace.get_workspace()
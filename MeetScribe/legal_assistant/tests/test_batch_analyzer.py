@@ -0,0 +1,105 @@
+"""
+Batch analysis end to end against the local stand-in for the OpenAI Batch API.
+"""
+import json
+
+import openai
+import pytest
+
+import backfill
+from config import LEGAL_DOMAINS
+from models.legal_tasks import LegalTaskManager, MeetingRecord
+from services.ai_processor import AIProcessor
+from services.batch_analyzer import BatchAnalyzer, BatchJob, batch_custom_id
+from services.llm_metrics import get_metrics
+from services.local_batch_server import LocalBatchServer, canned_reply
+
+TRANSCRIPTS = {
+    "m1": {"transcript": [
+        {"speaker": "Ana", "text": "The vendor contract renewal needs a new NDA clause.", "timestamp": "00:00:05"}
+    ]},
+    "m2": {"transcript": [
+        {"speaker": "Ben", "text": "Just lunch plans, nothing else today.", "timestamp": "00:00:02"}
+    ]}
+}
+
+def _add_meeting(workspace, meeting_id, date):
+    workspace.update(LegalTaskManager.add_meeting, MeetingRecord(
+        id=meeting_id, title=f"Meeting {meeting_id}", date=date, bot_id=meeting_id, participants=[], duration=0,
+        transcript_summary="", domains_processed=[], has_action_items=False, has_insights=False,
+        created_at=f"{date}T09:00:00"
+    ))
+
+@pytest.fixture
+def server():
+    with LocalBatchServer(processing_delay=0.2) as server:
+        yield server
+
+@pytest.fixture
+def analyzer(server, tmp_path, workspace):
+    client = openai.OpenAI(api_key="local", base_url=server.url)
+    return BatchAnalyzer(AIProcessor(compress_transcripts=False, session_id="test"), client=client,
+                         batch_dir=str(tmp_path), poll_interval=0.05)
+
+def test_prepare_writes_stable_custom_ids(analyzer):
+    job = analyzer.prepare(TRANSCRIPTS, name="ids")
+    with open(job.input_path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+
+    custom_ids = [line["custom_id"] for line in lines]
+    assert len(custom_ids) == len(set(custom_ids))
+    assert batch_custom_id("m1", "summary") in custom_ids
+    assert batch_custom_id("m1", "domain:contracts") in custom_ids
+    # Triage skips every domain of the meeting with no legal content
+    assert [c for c in custom_ids if c.startswith("m2/")] == [batch_custom_id("m2", "summary")]
+    assert all(line["url"] == "/v1/chat/completions" for line in lines)
+    assert BatchJob.load(job.manifest_path).meetings["m2"]["skipped"] == list(LEGAL_DOMAINS)
+
+def test_batch_round_trip_ingests_results(analyzer, workspace):
+    for meeting_id in TRANSCRIPTS:
+        _add_meeting(workspace, meeting_id, "2025-01-10")
+
+    job = analyzer.prepare(TRANSCRIPTS, name="round_trip")
+    analyzer.submit(job)
+    batch = analyzer.wait(job, timeout=10)
+    assert batch.status == "completed"
+    assert BatchJob.load(job.manifest_path).status == "completed"
+
+    results = analyzer.collect(job, batch)
+    contracts = results["m1"]["domains"]["contracts"]
+    assert contracts["action_items"][0].startswith("Review stand-in finding")
+    assert results["m1"]["summary"].startswith("Stand-in summary")
+    assert results["m1"]["stats"]["batch_id"] == job.batch_id
+    assert results["m2"]["domains"]["contracts"]["skipped"]
+
+    usage = get_metrics().meeting_summary("m1")
+    assert usage["calls"] == results["m1"]["stats"]["llm_calls"]
+    assert usage["errors"] == 0
+
+    backfill.ingest(results, TRANSCRIPTS)
+    snapshot = workspace.snapshot()
+    meeting = snapshot.get_meeting_by_id("m1")
+    assert meeting.date == "2025-01-10"
+    assert meeting.transcript_summary == results["m1"]["summary"]
+    actions = snapshot.get_actions_by_meeting("m1")
+    assert actions and all(action.created_at.startswith("2025-01-10") for action in actions)
+
+def test_failed_requests_become_error_results(server, analyzer):
+    def responder(body):
+        if "response_format" not in body:
+            raise RuntimeError("summary unavailable")
+        return "not json"
+    server.responder = responder
+
+    job = analyzer.prepare({"m1": TRANSCRIPTS["m1"]}, name="errors")
+    analyzer.submit(job)
+    results = analyzer.collect(job, analyzer.wait(job, timeout=10))["m1"]
+
+    assert results["summary"] == "Error processing with AI: summary unavailable"
+    assert results["domains"]["contracts"] == "not json"
+    assert results["stats"]["json_outcomes"]["lost"] >= 1
+
+def test_canned_reply_is_deterministic():
+    body = {"messages": [{"role": "user", "content": "x"}], "response_format": {"type": "json_object"}}
+    assert canned_reply(body) == canned_reply(dict(body))
+    assert json.loads(canned_reply(body))["action_items"]
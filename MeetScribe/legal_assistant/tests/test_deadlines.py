@@ -0,0 +1,31 @@
+"""
+Deadline parsing, in particular month names that are also ordinary words.
+"""
+from datetime import date
+
+import pytest
+
+from utils.deadlines import parse_deadline
+
+ANCHOR = date(2026, 1, 10)
+
+@pytest.mark.parametrize("text, expected", [
+    ("File the response by 15 May", date(2026, 5, 15)),
+    ("Due on 3 may", date(2026, 5, 3)),
+    ("Deliver the 3rd of May", date(2026, 5, 3)),
+    ("Board approval 3 May 2027", date(2027, 5, 3)),
+    ("Sign before 2 March", date(2026, 3, 2)),
+    ("Clause 2 may be waived, but reply by 20 May", date(2026, 5, 20)),
+    ("May 15", date(2026, 5, 15)),
+    ("15 June", date(2026, 6, 15)),
+])
+def test_day_month_dates(text, expected):
+    assert parse_deadline(text, ANCHOR) == expected
+
+@pytest.mark.parametrize("text", [
+    "Section 3 may apply to the renewal",
+    "Items 4 may need a second review",
+    "The 2 may differ on indemnity terms",
+])
+def test_may_as_a_verb_is_not_a_date(text):
+    assert parse_deadline(text, ANCHOR) is None
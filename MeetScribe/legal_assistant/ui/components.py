@@ -10,11 +10,38 @@ import time
 from datetime import datetime
 
 from config import LEGAL_DOMAINS
-from models.legal_tasks import LegalAction, LegalInsight, MeetingRecord
+from models.legal_tasks import LegalAction, LegalInsight, MeetingRecord, ACTION_STATUSES
+from models.rollups import ALL
+from utils.time_index import format_seconds
+
+def page_controls(total: int, key: str, page_sizes: List[int]) -> Tuple[int, int]:
+    """Display page size and page number controls; returns the ``[start, end)`` range of the current page."""
+    size_col, page_col, info_col = st.columns([1, 1, 2])
+    with size_col:
+        page_size = st.selectbox("Per page", options=page_sizes, key=f"{key}_page_size")
+    
+    page_count = max((total + page_size - 1) // page_size, 1)
+    page_key = f"{key}_page"
+    
+    # Keep the page in range when filters shrink the list
+    if st.session_state.get(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+    with page_col:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key=page_key)
+    
+    start = (page - 1) * page_size
+    end = min(start + page_size, total)
+    with info_col:
+        st.caption(f"Showing {start + 1 if total else 0}-{end} of {total}")
+    return start, end
 
 class Dashboard:
     """Dashboard UI components for displaying legal insights."""
     
+    # Window of the "Due Soon" list and how many actions each deadline list shows
+    DUE_SOON_DAYS = 14
+    MAX_DEADLINE_ROWS = 10
+    
     @staticmethod
     def header():
         """Display the application header."""
@@ -37,7 +64,8 @@ class Dashboard:
             # Main navigation
             selected = st.radio(
                 "Go to",
-                options=["Dashboard", "Join Meeting", "Meeting History", "Action Items", "Legal Insights", "Settings"],
+                options=["Dashboard", "Join Meeting", "Meeting History", "Action Items", "Legal Insights",
+                         "Ask the Archive", "Settings"],
                 index=0
             )
             
@@ -159,6 +187,86 @@ class Dashboard:
         
         st.plotly_chart(fig, use_container_width=True)
     
+    @staticmethod
+    def trend_charts(task_manager):
+        """Display actions or insights over time, read from the task manager's rollups."""
+        rollups = task_manager.rollups
+        if not rollups.total("action") and not rollups.total("insight"):
+            return
+        
+        st.subheader("Trends")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            kind = st.selectbox("Show", options=["action", "insight"], key="trend_kind",
+                                format_func=lambda k: "Action Items" if k == "action" else "Legal Insights")
+        with col2:
+            granularity = st.selectbox("Per", options=["day", "week", "month"], index=1, key="trend_granularity",
+                                       format_func=str.title)
+        
+        level_label = "Priority" if kind == "action" else "Importance"
+        dimensions = {"domain": "Domain", "level": level_label}
+        if kind == "action":
+            dimensions["status"] = "Status"
+        with col3:
+            dimension = st.selectbox("Break down by", options=list(dimensions), key=f"trend_dimension_{kind}",
+                                     format_func=dimensions.get)
+        
+        # Narrow to one domain, or to one status or importance when breaking down by domain
+        filter_dimension = "domain"
+        if dimension == "domain":
+            filter_dimension = "status" if kind == "action" else "level"
+        filter_options = [ALL] + rollups.dimension_values(kind, filter_dimension)
+        with col4:
+            filter_value = st.selectbox(
+                dimensions.get(filter_dimension, filter_dimension.title()), options=filter_options,
+                key=f"trend_filter_{kind}_{filter_dimension}",
+                format_func=lambda v: "All" if v == ALL else LEGAL_DOMAINS.get(v, v)
+            )
+        
+        breakdown = rollups.breakdown(kind, granularity, dimension, {filter_dimension: filter_value})
+        rows = [
+            {
+                "Period": bucket,
+                dimensions[dimension]: LEGAL_DOMAINS.get(value, value),
+                "Count": count
+            }
+            for value, series in breakdown.items()
+            for bucket, count in series
+        ]
+        if not rows:
+            st.info("No records match this selection.")
+            return
+        
+        fig = px.bar(pd.DataFrame(rows), x="Period", y="Count", color=dimensions[dimension], barmode="stack")
+        fig.update_layout(height=400, xaxis_title="", xaxis_type="category")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    @staticmethod
+    def deadline_overview(task_manager, today=None):
+        """Display the overdue actions and the actions due in the next few days."""
+        overdue = task_manager.overdue(today)
+        due_soon = task_manager.due_within(Dashboard.DUE_SOON_DAYS, today)
+        if not overdue and not due_soon:
+            return
+        
+        today = today or datetime.now().date()
+        # The anchor is the target of the summary reminder toast's link
+        st.subheader("Deadlines", anchor="deadlines")
+        col1, col2 = st.columns(2)
+        
+        for col, title, actions in ((col1, "Overdue", overdue), (col2, f"Due in the Next {Dashboard.DUE_SOON_DAYS} Days", due_soon)):
+            with col:
+                st.markdown(f"**{title}** ({len(actions)})")
+                if not actions:
+                    st.caption("Nothing here.")
+                for action in actions[:Dashboard.MAX_DEADLINE_ROWS]:
+                    days_left = (datetime.strptime(action.due_date, "%Y-%m-%d").date() - today).days
+                    when = f"{-days_left}d overdue" if days_left < 0 else ("today" if days_left == 0 else f"in {days_left}d")
+                    domain_name = LEGAL_DOMAINS.get(action.domain, action.domain)
+                    st.markdown(f"- {action.due_date} ({when}) · **{action.title}** · {action.priority.upper()} · {domain_name}")
+                if len(actions) > Dashboard.MAX_DEADLINE_ROWS:
+                    st.caption(f"and {len(actions) - Dashboard.MAX_DEADLINE_ROWS} more")
+    
     @staticmethod
     def recent_meetings_table(task_manager):
         """Display a table of recent meetings."""
@@ -201,6 +309,9 @@ class Dashboard:
 class MeetingUI:
     """UI components for meeting-related functionality."""
     
+    # Transcript entries per markdown element in the live transcript
+    LIVE_BLOCK_SIZE = 50
+    
     @staticmethod
     def join_meeting_form():
         """Display form for joining a meeting."""
@@ -334,6 +445,40 @@ class MeetingUI:
         
         return None
     
+    @staticmethod
+    def bot_status_card(bot: Dict[str, Any], selected: bool = False) -> Optional[str]:
+        """Display a registry snapshot of one bot; returns "refresh", "leave" or "view" when clicked."""
+        bot_id = bot["bot_id"]
+        with st.container(border=True):
+            col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
+            
+            with col1:
+                label = bot.get("bot_name") or "Bot"
+                st.markdown(f"**{label}** `{bot_id}`" + (" · viewing" if selected else ""))
+                
+                status = bot.get("status", "Unknown")
+                if bot.get("last_polled"):
+                    checked = f"checked {int(max(time.time() - bot['last_polled'], 0))}s ago"
+                else:
+                    checked = "checking..."
+                st.caption(f"Status: {status} · {checked}")
+                if bot.get("message"):
+                    st.caption(bot["message"])
+                if bot.get("error"):
+                    st.caption(f"⚠️ {bot['error']}")
+            
+            with col2:
+                if st.button("Refresh", key=f"bot_refresh_{bot_id}"):
+                    return "refresh"
+            with col3:
+                if st.button("Transcript", key=f"bot_view_{bot_id}", disabled=selected):
+                    return "view"
+            with col4:
+                if st.button("Leave", key=f"bot_leave_{bot_id}", type="primary"):
+                    return "leave"
+        
+        return None
+    
     @staticmethod
     def transcript_view(transcript_data):
         """Display the meeting transcript."""
@@ -369,34 +514,51 @@ class MeetingUI:
         if "summary" in transcript_data:
             st.subheader("Meeting Summary")
             st.write(transcript_data["summary"])
+    
+    @staticmethod
+    def transcript_lines(container, entries: List[Dict[str, Any]]):
+        """Write transcript entries into a container, a block of markdown per LIVE_BLOCK_SIZE entries."""
+        for start in range(0, len(entries), MeetingUI.LIVE_BLOCK_SIZE):
+            container.markdown("\n\n".join(
+                f"**{entry.get('speaker', 'Unknown')}** *[{entry.get('timestamp', '00:00')}]*  \n{entry.get('text', '')}"
+                for entry in entries[start:start + MeetingUI.LIVE_BLOCK_SIZE]
+            ))
 
 
 class ActionItemsUI:
     """UI components for displaying and managing action items."""
     
+    PAGE_SIZES = [10, 25, 50, 100]
+    TABLE_PAGE_SIZES = [100, 500, 1000]
+    MAX_SELECTED_CARDS = 10
+    
+    STATUS_BADGES = {
+        "pending": "🟠 Pending",
+        "in_progress": "🔵 In Progress",
+        "completed": "🟢 Completed",
+        "cancelled": "⚫ Cancelled"
+    }
+    
     @staticmethod
     def action_list(task_manager, filtered_domains=None):
         """Display a list of action items with filtering and sorting options."""
         st.subheader("Legal Action Items")
         
-        # Get all actions
-        all_actions = task_manager.actions
-        
-        if not all_actions:
+        if not task_manager.actions:
             st.info("No action items have been generated yet. Join a meeting to get started.")
             return
         
-        # Filter by domain if specified
-        if filtered_domains:
-            all_actions = [a for a in all_actions if a.domain in filtered_domains]
+        # Report the last bulk update, which reruns the page when applied
+        if "bulk_update_message" in st.session_state:
+            st.success(st.session_state.pop("bulk_update_message"))
         
         # Filter and sort controls
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns([3, 3, 3, 2])
         
         with col1:
             status_filter = st.multiselect(
                 "Status",
-                options=["pending", "in_progress", "completed", "cancelled"],
+                options=list(ACTION_STATUSES),
                 default=["pending", "in_progress"]
             )
         
@@ -413,11 +575,16 @@ class ActionItemsUI:
                 options=["Priority (High to Low)", "Priority (Low to High)", "Status", "Created (Newest)", "Created (Oldest)"]
             )
         
-        # Apply filters
-        filtered_actions = [
-            action for action in all_actions 
-            if action.status in status_filter and action.priority in priority_filter
-        ]
+        with col4:
+            view_mode = st.radio("View", options=["Cards", "Table"], horizontal=True, key="action_view_mode")
+        
+        # Filter on the task manager's indexes and sort before creating any per-action widgets
+        query = {
+            "domains": filtered_domains or None,
+            "statuses": status_filter,
+            "priorities": priority_filter
+        }
+        filtered_actions = task_manager.query_actions(**query)
         
         # Apply sorting
         if sort_by == "Priority (High to Low)":
@@ -434,10 +601,102 @@ class ActionItemsUI:
         elif sort_by == "Created (Oldest)":
             filtered_actions.sort(key=lambda x: x.created_at)
         
-        # Display actions
-        for action in filtered_actions:
+        if not filtered_actions:
+            st.info("No action items match the selected filters.")
+            return
+        
+        all_matching = f"All matching filters ({len(filtered_actions)})"
+        
+        if view_mode == "Table":
+            selected_actions = ActionItemsUI.action_table(filtered_actions, task_manager)
+            ActionItemsUI.bulk_update_form(task_manager, {
+                f"Selected rows ({len(selected_actions)})": {"action_ids": [a.id for a in selected_actions]},
+                all_matching: {"query": query}
+            })
+            return
+        
+        # Display only the current page, as one-line rows that open into full cards
+        start, end = page_controls(len(filtered_actions), "action_list", ActionItemsUI.PAGE_SIZES)
+        page = filtered_actions[start:end]
+        ActionItemsUI.bulk_update_form(task_manager, {
+            f"This page ({len(page)})": {"action_ids": [a.id for a in page]},
+            all_matching: {"query": query}
+        })
+        for action in page:
+            ActionItemsUI.action_row(action, task_manager)
+    
+    @staticmethod
+    def bulk_update_form(task_manager, scopes: Dict[str, Dict[str, Any]]):
+        """Apply one status or assignee change to a chosen set of actions with a single rerun."""
+        with st.expander("Bulk Update"):
+            with st.form("bulk_action_update"):
+                scope = st.radio("Apply to", options=list(scopes.keys()), horizontal=True)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    status = st.selectbox(
+                        "Set status",
+                        options=["No change"] + list(ACTION_STATUSES),
+                        format_func=lambda s: ActionItemsUI.STATUS_BADGES.get(s, s)
+                    )
+                with col2:
+                    assignee = st.text_input("Set assignee", placeholder="Leave blank to keep the current assignee")
+                
+                if st.form_submit_button("Apply"):
+                    updated = task_manager.bulk_update_actions(
+                        status=None if status == "No change" else status,
+                        assignee=assignee.strip() or None,
+                        **scopes[scope]
+                    )
+                    if updated:
+                        st.session_state.bulk_update_message = f"Updated {len(updated)} action items."
+                        st.rerun()
+                    else:
+                        st.warning("No action items were updated.")
+    
+    @staticmethod
+    def action_row(action, task_manager):
+        """Display a one-line summary of an action; the full card is only rendered when opened."""
+        domain_name = LEGAL_DOMAINS.get(action.domain, action.domain)
+        label = f"{ActionItemsUI.STATUS_BADGES.get(action.status, action.status)} · **{action.title}** · {action.priority.upper()} · {domain_name}"
+        if action.due_date:
+            label += f" · Due {action.due_date}"
+        elif action.deadline:
+            label += f" · Due {action.deadline}"
+        
+        if st.toggle(label, key=f"action_open_{action.id}"):
             ActionItemsUI.action_card(action, task_manager)
     
+    @staticmethod
+    def action_table(actions, task_manager):
+        """Display actions as a table with row selection; returns the selected actions."""
+        start, end = page_controls(len(actions), "action_table", ActionItemsUI.TABLE_PAGE_SIZES)
+        page = actions[start:end]
+        
+        df = pd.DataFrame([
+            {
+                "Title": action.title,
+                "Domain": LEGAL_DOMAINS.get(action.domain, action.domain),
+                "Priority": action.priority,
+                "Status": action.status,
+                "Deadline": action.deadline or "",
+                "Due": action.due_date or "",
+                "Assignee": action.assignee or "Unassigned",
+                "Created": action.created_at[:10]
+            }
+            for action in page
+        ])
+        event = st.dataframe(df, hide_index=True, use_container_width=True, on_select="rerun",
+                             selection_mode="multi-row", key=f"action_table_{start}")
+        
+        selected_actions = [page[row] for row in event.selection.rows]
+        if selected_actions:
+            if len(selected_actions) > ActionItemsUI.MAX_SELECTED_CARDS:
+                st.caption(f"Showing the first {ActionItemsUI.MAX_SELECTED_CARDS} of {len(selected_actions)} selected actions.")
+            for action in selected_actions[:ActionItemsUI.MAX_SELECTED_CARDS]:
+                ActionItemsUI.action_card(action, task_manager)
+        return selected_actions
+    
     @staticmethod
     def action_card(action, task_manager):
         """Display a single action item as a card."""
@@ -448,14 +707,6 @@ class ActionItemsUI:
             "low": "#36A2EB"
         }
         
-        # Set status badges
-        status_badges = {
-            "pending": "🟠 Pending",
-            "in_progress": "🔵 In Progress",
-            "completed": "🟢 Completed",
-            "cancelled": "⚫ Cancelled"
-        }
-        
         # Create card using Streamlit components
         with st.container():
             # Card header with priority indicator
@@ -467,9 +718,11 @@ class ActionItemsUI:
                 st.markdown(f"*{domain_name}*")
             
             with header_col2:
-                st.markdown(f"**Status:** {status_badges.get(action.status, action.status)}")
+                st.markdown(f"**Status:** {ActionItemsUI.STATUS_BADGES.get(action.status, action.status)}")
                 if action.deadline:
                     st.markdown(f"**Deadline:** {action.deadline}")
+                if action.due_date:
+                    st.markdown(f"**Due:** {action.due_date}")
             
             with header_col3:
                 priority_color = priority_colors.get(action.priority, "#777777")
@@ -520,24 +773,21 @@ class ActionItemsUI:
 class InsightsUI:
     """UI components for displaying legal insights."""
     
+    PAGE_SIZES = [10, 25, 50, 100]
+    TABLE_PAGE_SIZES = [100, 500, 1000]
+    MAX_SELECTED_CARDS = 10
+    
     @staticmethod
     def insights_list(task_manager, filtered_domains=None):
         """Display a list of legal insights with filtering options."""
         st.subheader("Legal Insights")
         
-        # Get all insights
-        all_insights = task_manager.insights
-        
-        if not all_insights:
+        if not task_manager.insights:
             st.info("No insights have been generated yet. Join a meeting to get started.")
             return
         
-        # Filter by domain if specified
-        if filtered_domains:
-            all_insights = [i for i in all_insights if i.domain in filtered_domains]
-        
         # Filter and sort controls
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns([3, 3, 2])
         
         with col1:
             importance_filter = st.multiselect(
@@ -552,11 +802,14 @@ class InsightsUI:
                 options=["Importance (High to Low)", "Importance (Low to High)", "Created (Newest)", "Created (Oldest)"]
             )
         
-        # Apply filters
-        filtered_insights = [
-            insight for insight in all_insights 
-            if insight.importance in importance_filter
-        ]
+        with col3:
+            view_mode = st.radio("View", options=["Cards", "Table"], horizontal=True, key="insight_view_mode")
+        
+        # Filter on the task manager's indexes and sort before creating any per-insight widgets
+        filtered_insights = task_manager.query_insights(
+            domains=filtered_domains or None,
+            importances=importance_filter
+        )
         
         # Apply sorting
         if sort_by == "Importance (High to Low)":
@@ -570,10 +823,55 @@ class InsightsUI:
         elif sort_by == "Created (Oldest)":
             filtered_insights.sort(key=lambda x: x.created_at)
         
-        # Display insights
-        for insight in filtered_insights:
+        if not filtered_insights:
+            st.info("No insights match the selected filters.")
+            return
+        
+        if view_mode == "Table":
+            InsightsUI.insights_table(filtered_insights)
+            return
+        
+        # Display only the current page, as one-line rows that open into full cards
+        start, end = page_controls(len(filtered_insights), "insight_list", InsightsUI.PAGE_SIZES)
+        for insight in filtered_insights[start:end]:
+            InsightsUI.insight_row(insight)
+    
+    @staticmethod
+    def insight_row(insight):
+        """Display a one-line summary of an insight; the full card is only rendered when opened."""
+        domain_name = LEGAL_DOMAINS.get(insight.domain, insight.domain)
+        label = f"**{insight.title}** · {insight.importance.upper()} · {domain_name}"
+        
+        if st.toggle(label, key=f"insight_open_{insight.id}"):
             InsightsUI.insight_card(insight)
     
+    @staticmethod
+    def insights_table(insights):
+        """Display insights as a table; selected rows are shown as full cards below it."""
+        start, end = page_controls(len(insights), "insight_table", InsightsUI.TABLE_PAGE_SIZES)
+        page = insights[start:end]
+        
+        df = pd.DataFrame([
+            {
+                "Title": insight.title,
+                "Domain": LEGAL_DOMAINS.get(insight.domain, insight.domain),
+                "Importance": insight.importance,
+                "Tags": ", ".join(insight.tags),
+                "Meetings": len(insight.source_meetings),
+                "Created": insight.created_at[:10]
+            }
+            for insight in page
+        ])
+        event = st.dataframe(df, hide_index=True, use_container_width=True, on_select="rerun",
+                             selection_mode="multi-row", key=f"insight_table_{start}")
+        
+        selected_rows = event.selection.rows
+        if selected_rows:
+            if len(selected_rows) > InsightsUI.MAX_SELECTED_CARDS:
+                st.caption(f"Showing the first {InsightsUI.MAX_SELECTED_CARDS} of {len(selected_rows)} selected insights.")
+            for row in selected_rows[:InsightsUI.MAX_SELECTED_CARDS]:
+                InsightsUI.insight_card(page[row])
+    
     @staticmethod
     def insight_card(insight):
         """Display a single insight as a card."""
@@ -643,8 +941,10 @@ class InsightsUI:
 class MeetingDetailsUI:
     """UI components for displaying detailed meeting information."""
     
+    TRANSCRIPT_PAGE_SIZE = 50
+    
     @staticmethod
-    def meeting_details(meeting_id, task_manager):
+    def meeting_details(meeting_id, task_manager, transcript_archive=None):
         """Display detailed information about a specific meeting."""
         meeting = task_manager.get_meeting_by_id(meeting_id)
         
@@ -657,7 +957,7 @@ class MeetingDetailsUI:
         st.write(f"Meeting Date: {meeting.date}")
         
         # Tabs for different views
-        tab1, tab2, tab3 = st.tabs(["Summary", "Action Items", "Insights"])
+        tab1, tab2, tab3, tab4 = st.tabs(["Summary", "Action Items", "Insights", "Transcript"])
         
         with tab1:
             MeetingDetailsUI.summary_tab(meeting, task_manager)
@@ -667,6 +967,9 @@ class MeetingDetailsUI:
         
         with tab3:
             MeetingDetailsUI.insights_tab(meeting_id, task_manager)
+        
+        with tab4:
+            MeetingDetailsUI.transcript_tab(meeting_id, transcript_archive)
     
     @staticmethod
     def summary_tab(meeting, task_manager):
@@ -740,6 +1043,91 @@ class MeetingDetailsUI:
             )
             
             st.plotly_chart(fig, use_container_width=True)
+        
+        # Deadlines mentioned in the meeting, with the dates they were normalized to
+        if meeting.deadlines:
+            st.subheader("Deadlines")
+            deadline_rows = []
+            for entry in meeting.deadlines:
+                linked = task_manager.get_action_by_id(entry.get("action_id")) if entry.get("action_id") else None
+                deadline_rows.append({
+                    "Due": entry.get("due_date") or "Unparsed",
+                    "Deadline": entry.get("text", ""),
+                    "Domain": LEGAL_DOMAINS.get(entry.get("domain"), entry.get("domain", "")),
+                    "Action": linked.title if linked else ""
+                })
+            st.dataframe(pd.DataFrame(deadline_rows), hide_index=True, use_container_width=True)
+        
+        MeetingDetailsUI.speaker_analytics_section(meeting)
+    
+    @staticmethod
+    def speaker_analytics_section(meeting):
+        """Display talk time, turns and interruptions precomputed at ingest."""
+        analytics = meeting.speaker_analytics
+        if not analytics or not analytics.get("speakers"):
+            return
+        
+        st.subheader("Speaker Analytics")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Participants", len(meeting.participants))
+        with col2:
+            st.metric("Duration", format_seconds(meeting.duration))
+        
+        # Per-speaker table
+        df = pd.DataFrame([
+            {
+                "Speaker": speaker,
+                "Talk Time": format_seconds(stats["talk_time"]),
+                "Share": f"{stats['talk_share'] * 100:.0f}%",
+                "Turns": stats["turns"],
+                "Interruptions": stats["interruptions"]
+            }
+            for speaker, stats in analytics["speakers"].items()
+        ])
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        
+        # Talk time per speaker over the meeting
+        timeline = analytics.get("timeline", {})
+        bucket_seconds = timeline.get("bucket_seconds", 60)
+        timeline_data = [
+            {"Minute": i * bucket_seconds / 60, "Speaker": speaker, "Seconds": seconds}
+            for speaker, series in timeline.get("series", {}).items()
+            for i, seconds in enumerate(series)
+        ]
+        if timeline_data:
+            fig = px.area(
+                pd.DataFrame(timeline_data),
+                x="Minute",
+                y="Seconds",
+                color="Speaker",
+                title="Talk Time Over the Meeting"
+            )
+            fig.update_layout(height=350, yaxis_title="Seconds spoken")
+            st.plotly_chart(fig, use_container_width=True)
+    
+    @staticmethod
+    def domain_result_panel(domain_key, domain_result, domain_ids, task_manager):
+        """Display one domain's results as soon as its analysis finishes."""
+        domain_name = LEGAL_DOMAINS.get(domain_key, domain_key)
+        action_count = len(domain_ids.get("action_ids", []))
+        insight_count = len(domain_ids.get("insight_ids", []))
+        
+        if isinstance(domain_result, dict) and domain_result.get("skipped"):
+            st.markdown(f"⚪ **{domain_name}**: no relevant content")
+            return
+        
+        with st.expander(f"✅ {domain_name}: {action_count} actions, {insight_count} insights"):
+            if isinstance(domain_result, dict):
+                st.write(domain_result.get("summary", ""))
+            else:
+                st.write(domain_result)
+            
+            for action_id in domain_ids.get("action_ids", []):
+                action = task_manager.get_action_by_id(action_id)
+                if action:
+                    st.markdown(f"- **{action.priority.upper()}** {action.title}")
     
     @staticmethod
     def actions_tab(meeting_id, task_manager):
@@ -765,4 +1153,131 @@ class MeetingDetailsUI:
         
         # Display each insight
         for insight in insights:
-            InsightsUI.insight_card(insight)
\ No newline at end of file
+            InsightsUI.insight_card(insight)
+    
+    @staticmethod
+    def transcript_tab(meeting_id, transcript_archive):
+        """Display the archived meeting transcript one page at a time."""
+        if transcript_archive is None or not transcript_archive.has(meeting_id):
+            st.info("No transcript has been archived for this meeting.")
+            return
+        
+        total = transcript_archive.count(meeting_id)
+        page_size = MeetingDetailsUI.TRANSCRIPT_PAGE_SIZE
+        page_count = max((total + page_size - 1) // page_size, 1)
+        page_key = f"transcript_page_{meeting_id}"
+        
+        # Jump to the page holding the utterance in progress at a given minute
+        jump_col, page_col = st.columns(2)
+        with jump_col:
+            jump_minute = st.number_input("Jump to minute", min_value=0, value=0, step=1,
+                                          key=f"transcript_jump_{meeting_id}")
+            if st.button("Go", key=f"transcript_go_{meeting_id}"):
+                time_index = transcript_archive.time_index(meeting_id)
+                st.session_state[page_key] = time_index.locate(jump_minute * 60) // page_size + 1
+        with page_col:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key=page_key)
+        st.caption(f"{total} utterances, page {page} of {page_count}")
+        
+        # Only the blocks covering this page are decompressed
+        start = (page - 1) * page_size
+        for entry in transcript_archive.read(meeting_id, start, start + page_size):
+            speaker = entry.get("speaker", "Unknown")
+            timestamp = entry.get("timestamp", "00:00:00")
+            st.markdown(f"**{speaker}** *[{timestamp}]* {entry.get('text', '')}")
+
+
+class ArchiveUI:
+    """UI components for question answering over past meetings."""
+    
+    @staticmethod
+    def answer(result: Dict[str, Any]):
+        """Display an answer and the passages it was based on."""
+        st.markdown(f"**Q:** {result.get('question', '')}")
+        st.markdown(result["answer"])
+        
+        citations = result.get("citations", [])
+        if not citations:
+            return
+        
+        st.markdown("**Sources**")
+        st.caption(f"{len(citations)} passages, about {result.get('context_tokens', 0):,} tokens, were sent to the model.")
+        for citation in citations:
+            where = f" at {citation['timestamp']}" if citation.get("timestamp") else ""
+            who = f" · {citation['speaker']}" if citation.get("speaker") else ""
+            marker = "" if citation.get("cited") else " (not cited)"
+            label = f"[{citation['number']}] {citation['title']}{where}{who} · {citation['kind']}{marker}"
+            with st.expander(label):
+                st.write(citation["text"])
+                if st.button("Open Meeting", key=f"archive_open_{citation['number']}_{citation['ref']}"):
+                    st.session_state.selected_meeting = citation["meeting_id"]
+                    st.session_state.current_page = "Meeting Details"
+                    st.rerun()
+
+
+class TraceUI:
+    """UI components for viewing request traces."""
+    
+    @staticmethod
+    def trace_browser(traces: List[List[Dict[str, Any]]]):
+        """Let the user pick a recent trace and show it as a waterfall."""
+        if not traces:
+            st.info("No traces have been recorded yet.")
+            return
+        
+        # Label each trace by its root span and total duration
+        labels = []
+        for spans in traces:
+            root = next((s for s in spans if not s.get("parentSpanId")), spans[0])
+            start = min(s["startTimeUnixNano"] for s in spans)
+            end = max(s["endTimeUnixNano"] or s["startTimeUnixNano"] for s in spans)
+            started_at = datetime.fromtimestamp(start / 1e9).strftime("%H:%M:%S")
+            labels.append(f"{started_at} · {root['name']} · {(end - start) / 1e6:.0f} ms · {len(spans)} spans")
+        
+        selected = st.selectbox("Trace", range(len(traces)), format_func=lambda i: labels[i])
+        TraceUI.trace_waterfall(traces[selected])
+    
+    @staticmethod
+    def trace_waterfall(spans: List[Dict[str, Any]]):
+        """Display the spans of one trace as a waterfall chart."""
+        origin = min(s["startTimeUnixNano"] for s in spans)
+        parents = {s["spanId"]: s.get("parentSpanId") for s in spans}
+        
+        def depth(span_id):
+            level = 0
+            parent = parents.get(span_id)
+            while parent in parents:
+                level += 1
+                parent = parents.get(parent)
+            return level
+        
+        rows = []
+        for s in spans:
+            end = s["endTimeUnixNano"] or s["startTimeUnixNano"]
+            rows.append({
+                "label": f"{'· ' * depth(s['spanId'])}{s['name']} [{s['spanId'][:4]}]",
+                "offset": (s["startTimeUnixNano"] - origin) / 1e6,
+                "duration": (end - s["startTimeUnixNano"]) / 1e6,
+                "status": s.get("status", "OK"),
+                "attributes": s.get("attributes", {})
+            })
+        
+        fig = go.Figure(go.Bar(
+            y=[row["label"] for row in rows],
+            x=[row["duration"] for row in rows],
+            base=[row["offset"] for row in rows],
+            orientation="h",
+            marker_color=["#FF6384" if row["status"] == "ERROR" else "#36A2EB" for row in rows],
+            hovertext=[
+                f"{row['duration']:.1f} ms<br>" + "<br>".join(f"{k}: {v}" for k, v in row["attributes"].items())
+                for row in rows
+            ],
+            hoverinfo="text"
+        ))
+        fig.update_layout(
+            height=max(200, 28 * len(rows) + 80),
+            xaxis_title="Milliseconds from trace start",
+            yaxis=dict(autorange="reversed"),
+            margin=dict(l=10, r=10, t=10, b=40)
+        )
+        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
@@ -3,15 +3,36 @@ Page definitions for the Legal Assistant application.
 """
 import streamlit as st
 from typing import Dict, Any, List, Optional
-import time
 import uuid
 from datetime import datetime
 
 from config import LEGAL_DOMAINS
-from ui.components import Dashboard, MeetingUI, ActionItemsUI, InsightsUI, MeetingDetailsUI
+from ui.components import Dashboard, MeetingUI, ActionItemsUI, InsightsUI, MeetingDetailsUI, TraceUI, ArchiveUI
 from services.meetstream import MeetStreamClient
-from services.ai_processor import AIProcessor
-from models.legal_tasks import LegalTaskManager, MeetingRecord
+from services.bot_registry import get_bot_registry
+from services.ai_processor import AIProcessor, get_json_outcome_counts, DEFAULT_CASCADE_MODEL
+from services.transcript_archive import TranscriptArchive
+from services.archive_search import get_archive_search
+from services.llm_metrics import get_metrics
+from services.llm_hedging import get_hedge_policy
+from services.session_store import get_session_store
+from services.reminders import ReminderScheduler, reminder_summary, MAX_REMINDER_TOASTS
+from services.workspace import get_workspace, WorkspaceView
+from services.live_transcript import LiveTranscript
+from models.legal_tasks import MeetingRecord
+from utils.tracing import traced, get_exporter
+
+# Session state keys saved with the session snapshot; the task manager lives in the shared workspace
+SNAPSHOT_UI_KEYS = ("current_page", "selected_meeting", "bot_id", "domain_filters", "reminders_acknowledged")
+
+# Auto-refresh choices for the live transcript in seconds, where 0 turns it off
+LIVE_REFRESH_OPTIONS = (0, 2, 5, 10, 30, 60)
+LIVE_REFRESH_SECONDS = 5
+LIVE_TRANSCRIPT_HEIGHT = 400
+
+def new_meeting_id() -> str:
+    """Return an ID for a new meeting that no other session can pick, as all sessions share one workspace."""
+    return f"meeting_{uuid.uuid4().hex}"
 
 class PageManager:
     """
@@ -19,34 +40,118 @@ class PageManager:
     """
     
     def __init__(self):
+        # Identify this browser session to the shared LLM scheduler. The ID is kept in
+        # the URL so a reconnecting browser picks up its saved snapshot.
+        if "session_id" not in st.session_state:
+            session_id = st.query_params.get("session", "")
+            if not (session_id.isalnum() and len(session_id) == 32):
+                session_id = uuid.uuid4().hex
+                st.query_params["session"] = session_id
+            st.session_state.session_id = session_id
+        
         # Initialize services
         self.meetstream = MeetStreamClient()
-        self.ai_processor = AIProcessor()
+        self.ai_processor = AIProcessor(session_id=st.session_state.session_id, hedge_policy=get_hedge_policy())
+        self.transcript_archive = TranscriptArchive()
+        self.bot_registry = get_bot_registry()
+        self.session_store = get_session_store()
+        
+        # Bots are grouped by the browser session that started them
+        self.workspace_id = st.session_state.session_id
         
-        # Initialize or get task manager from session state
-        if "task_manager" not in st.session_state:
-            st.session_state.task_manager = LegalTaskManager()
-        self.task_manager = st.session_state.task_manager
+        # All sessions read and update one shared workspace; session state only holds UI state
+        self.workspace = get_workspace()
+        if "snapshot_marker" not in st.session_state:
+            self._restore_session()
+        self.task_manager = WorkspaceView(self.workspace)
         
         # Initialize session state variables if not already set
         if "current_page" not in st.session_state:
             st.session_state.current_page = "Dashboard"
         
+        # The bot whose live transcript is shown on the Join Meeting page
         if "bot_id" not in st.session_state:
             st.session_state.bot_id = None
+        elif st.session_state.bot_id and not self.bot_registry.get(st.session_state.bot_id):
+            self.bot_registry.register(self.workspace_id, st.session_state.bot_id)
         
         if "domain_filters" not in st.session_state:
             st.session_state.domain_filters = {domain: True for domain in LEGAL_DOMAINS.keys()}
+        
+        # Search index over the workspace's meetings, grown as new meetings are archived
+        self.archive_search = get_archive_search()
+        
+        # Deadline reminders are checked against the due-date index on each rerun
+        if "reminder_scheduler" not in st.session_state:
+            st.session_state.reminder_scheduler = ReminderScheduler(
+                acknowledged=st.session_state.get("reminders_acknowledged")
+            )
+        self.reminder_scheduler = st.session_state.reminder_scheduler
+    
+    def _restore_session(self):
+        """Restore the session's UI state from its saved snapshot."""
+        state = self.session_store.restore(st.session_state.session_id) or {}
+        for key, value in state.get("ui", {}).get("state", {}).items():
+            if key in SNAPSHOT_UI_KEYS and key not in st.session_state:
+                st.session_state[key] = value
+        
+        # Snapshots from before the workspace was shared also hold the session's own records
+        if any(state.get(collection) for collection in ("meetings", "actions", "insights")):
+            added = self.workspace.import_state(state)
+            print(f"Imported {added} records from session {st.session_state.session_id} into the shared workspace")
+            st.session_state.snapshot_marker = None
+        else:
+            # Nothing has changed since the snapshot, so the next save can be skipped
+            st.session_state.snapshot_marker = self._snapshot_marker()
+    
+    def _snapshot_marker(self):
+        """Identify the UI state as of the last save."""
+        return repr({key: st.session_state.get(key) for key in SNAPSHOT_UI_KEYS})
+    
+    def save_session(self):
+        """Save the shared workspace and this session's UI state to disk if either changed since the last save."""
+        try:
+            self.workspace.save()
+        except (OSError, ValueError) as e:
+            print(f"Failed to save workspace snapshot: {str(e)}")
+        
+        marker = self._snapshot_marker()
+        if st.session_state.get("snapshot_marker") == marker:
+            return
+        
+        state = {"ui": {"state": {key: st.session_state.get(key) for key in SNAPSHOT_UI_KEYS}}}
+        try:
+            self.session_store.save(st.session_state.session_id, state)
+            st.session_state.snapshot_marker = marker
+        except (OSError, ValueError) as e:
+            print(f"Failed to save session snapshot: {str(e)}")
     
+    @traced()
     def render(self):
         """Render the current page based on session state."""
         # Always show the header and sidebar
         Dashboard.header()
         selected_navigation = Dashboard.sidebar()
         
-        # Update current page based on navigation selection
-        if selected_navigation:
+        # Navigate when the sidebar selection changes, so pages opened by buttons, such as
+        # Meeting Details, are not replaced by the unchanged selection on the next rerun
+        if selected_navigation and selected_navigation != st.session_state.get("navigation_selected"):
             st.session_state.current_page = selected_navigation
+        st.session_state.navigation_selected = selected_navigation
+        
+        # Raise reminders for actions entering their lead window or going overdue,
+        # folded into one toast when there are many, as on a session's first run
+        reminders = self.reminder_scheduler.check(self.task_manager)
+        if len(reminders) > MAX_REMINDER_TOASTS:
+            overdue = any(reminder.kind == "overdue" for reminder in reminders)
+            st.toast(f"Deadline reminders: {reminder_summary(reminders)}. "
+                     f"[See the deadline overview](?session={st.session_state.session_id}#deadlines)",
+                     icon="⚠️" if overdue else "⏰")
+        else:
+            for reminder in reminders:
+                st.toast(reminder.message, icon="⏰" if reminder.kind == "upcoming" else "⚠️")
+        # Saved with the session snapshot, so a reconnecting session is not reminded again
+        st.session_state.reminders_acknowledged = self.reminder_scheduler.acknowledged
         
         # Render the appropriate page
         if st.session_state.current_page == "Dashboard":
@@ -59,6 +164,8 @@ class PageManager:
             self.render_action_items()
         elif st.session_state.current_page == "Legal Insights":
             self.render_legal_insights()
+        elif st.session_state.current_page == "Ask the Archive":
+            self.render_ask_archive()
         elif st.session_state.current_page == "Settings":
             self.render_settings()
         elif st.session_state.current_page == "Meeting Details":
@@ -66,6 +173,7 @@ class PageManager:
         else:
             self.render_dashboard()  # Default to dashboard
     
+    @traced()
     def render_dashboard(self):
         """Render the dashboard page."""
         st.subheader("Legal Department Dashboard")
@@ -82,166 +190,29 @@ class PageManager:
         with col2:
             Dashboard.priority_distribution_chart(self.task_manager)
         
+        # Counts over time, read from the precomputed rollups
+        Dashboard.trend_charts(self.task_manager)
+        
+        # Overdue and upcoming deadlines, read from the due-date index
+        Dashboard.deadline_overview(self.task_manager)
+        
         # Recent meetings table
         Dashboard.recent_meetings_table(self.task_manager)
     
     """
     Update to fix the 'experimental_rerun' error in Streamlit
     """
+    @traced()
     def render_join_meeting(self):
         """Render the join meeting page."""
         st.subheader("Join a Meeting")
         
-        # If bot is already in a meeting
-        if st.session_state.bot_id:
-            bot_status = None
-            try:
-                bot_status = self.meetstream.get_bot_status(st.session_state.bot_id)
-            except Exception as e:
-                st.error(f"Error getting bot status: {str(e)}")
-            
-            # Display meeting status
-            with st.container():
-                st.success("Bot successfully joined the meeting!")
-                st.write(f"Bot ID: {st.session_state.bot_id}")
-                
-                if bot_status:
-                    st.write(f"Status: {bot_status.get('status', 'Unknown')}")
-                    if "message" in bot_status:
-                        st.write(f"Message: {bot_status['message']}")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("Refresh Status"):
-                        st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
-                with col2:
-                    if st.button("Leave Meeting", type="primary"):
-                        try:
-                            # Remove the bot
-                            remove_result = self.meetstream.remove_bot(st.session_state.bot_id)
-                            st.success("Bot successfully left the meeting!")
-                            
-                            # Try to get the transcript 
-                            try:
-                                transcript_data = self.meetstream.get_transcript(st.session_state.bot_id)
-                                
-                                # Process transcript with AI
-                                if transcript_data and "transcript" in transcript_data and transcript_data["transcript"]:
-                                    st.info("Processing meeting transcript with AI...")
-                                    
-                                    # Create meeting record
-                                    meeting_id = f"meeting_{int(time.time())}"
-                                    meeting_title = f"Legal Meeting on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-                                    
-                                    # Process with AI
-                                    ai_results = self.ai_processor.process_transcript(transcript_data)
-                                    process_results = self.task_manager.process_ai_results(meeting_id, meeting_title, ai_results)
-                                    
-                                    st.success(f"Meeting analyzed successfully! Generated {len(process_results.get('action_ids', []))} action items and {len(process_results.get('insight_ids', []))} insights.")
-                                    
-                                    # Go to meeting details page
-                                    st.session_state.bot_id = None
-                                    st.session_state.selected_meeting = meeting_id
-                                    st.session_state.current_page = "Meeting Details"
-                                    st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
-                                else:
-                                    st.warning("No transcript content was found to process.")
-                                    st.session_state.bot_id = None
-                                    st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
-                            except Exception as e:
-                                st.warning(f"Could not process transcript: {str(e)}")
-                                st.session_state.bot_id = None
-                                st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
-                        except Exception as e:
-                            st.error(f"Error removing bot from meeting: {str(e)}")
-                            st.session_state.bot_id = None
-                            st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
-            
-            # Show the transcript
-            st.divider()
-            st.subheader("Meeting Transcript (Live)")
-            
-            try:
-                with st.spinner("Loading transcript..."):
-                    transcript_data = self.meetstream.get_transcript(st.session_state.bot_id)
-                
-                if transcript_data and "transcript" in transcript_data and transcript_data["transcript"]:
-                    st.success(f"Transcript available with {len(transcript_data['transcript'])} entries!")
-                    
-                    # Create a container for the transcript with scrollable height
-                    with st.container():
-                        # Add a light background to the transcript area
-                        st.markdown("""
-                        <style>
-                        .transcript-container {
-                            background-color: #f9f9f9;
-                            border-radius: 10px;
-                            padding: 15px;
-                            margin-bottom: 20px;
-                            max-height: 400px;
-                            overflow-y: auto;
-                        }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        
-                        st.markdown('<div class="transcript-container">', unsafe_allow_html=True)
-                        
-                        # Display each transcript entry
-                        for entry in transcript_data["transcript"]:
-                            col1, col2 = st.columns([1, 5])
-                            with col1:
-                                speaker = entry.get("speaker", "Unknown")
-                                timestamp = entry.get("timestamp", "00:00:00")
-                                st.markdown(f"**{speaker}** *[{timestamp}]*")
-                            with col2:
-                                st.write(entry.get("text", ""))
-                            st.divider()
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    # Add a button to process the transcript without leaving the meeting
-                    if st.button("Process This Transcript for Insights"):
-                        try:
-                            st.info("Processing meeting transcript with AI...")
-                            
-                            # Create meeting record
-                            meeting_id = f"meeting_{int(time.time())}"
-                            meeting_title = f"Live Meeting on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-                            
-                            # Process with AI
-                            ai_results = self.ai_processor.process_transcript(transcript_data)
-                            process_results = self.task_manager.process_ai_results(meeting_id, meeting_title, ai_results)
-                            
-                            st.success(f"Meeting analyzed successfully! Generated {len(process_results.get('action_ids', []))} action items and {len(process_results.get('insight_ids', []))} insights.")
-                            
-                            # Show a button to view the processed meeting
-                            if st.button("View Analysis Results"):
-                                st.session_state.selected_meeting = meeting_id
-                                st.session_state.current_page = "Meeting Details"
-                                st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
-                                
-                        except Exception as e:
-                            st.error(f"Error processing transcript: {str(e)}")
-                else:
-                    st.info("""
-                    Waiting for transcript content... 
-                    
-                    Speak in the meeting to generate content for transcription.
-                    Once you've spoken, click "Refresh Status" to see the transcript.
-                    """)
-                    
-                    # Show a progress bar to indicate waiting
-                    progress_bar = st.progress(0)
-                    for i in range(100):
-                        time.sleep(0.01)  # Quick animation for feedback
-                        progress_bar.progress(i + 1)
-                    
-            except Exception as e:
-                st.warning("Could not retrieve transcript. Make sure there is speech in the meeting.")
-                st.code(str(e), language="python")
+        # Bot statuses come from the registry's background poller, so this never blocks on MeetStream
+        bots = self.bot_registry.snapshot(self.workspace_id)
+        if bots:
+            self._render_bot_fleet(bots)
         
-        # If no bot is in a meeting, show the join form
-        else:
+        with st.expander("Join another meeting" if bots else "Join a meeting", expanded=not bots):
             with st.form("join_meeting_form"):
                 st.write("Enter meeting details to join:")
                 
@@ -274,6 +245,7 @@ class PageManager:
                             )
                         
                         if "bot_id" in result:
+                            self.bot_registry.register(self.workspace_id, result["bot_id"], meeting_link, bot_name)
                             st.session_state.bot_id = result["bot_id"]
                             st.success(f"Successfully joined meeting with bot ID: {result['bot_id']}")
                             st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
@@ -281,17 +253,202 @@ class PageManager:
                             st.error(f"Failed to join meeting: {result}")
                     except Exception as e:
                         st.error(f"Error joining meeting: {str(e)}")
+        
+        # Show the live transcript of the selected bot
+        if st.session_state.bot_id and self.bot_registry.get(st.session_state.bot_id):
+            st.divider()
+            st.subheader("Meeting Transcript (Live)")
+            st.caption(f"Bot ID: {st.session_state.bot_id}")
             
-            # Show additional tips
-            with st.expander("Tips for successful meeting analysis"):
-                st.markdown("""
-                - Ensure there is clear speech in the meeting for transcription
-                - Speak about legal topics such as compliance, contracts, or legal risks
-                - Mention specific dates, actions, or requirements to get better insights
-                - Click "Refresh Status" if the transcript doesn't appear immediately
-                - Process the transcript to generate legal insights and action items
-                """)
+            self._render_live_transcript(st.session_state.bot_id)
+            
+            # Add a button to process the transcript without leaving the meeting
+            if st.button("Process This Transcript for Insights"):
+                try:
+                    with st.spinner("Loading transcript..."):
+                        transcript_data = self.meetstream.get_transcript(st.session_state.bot_id)
+                    if not transcript_data.get("transcript"):
+                        st.warning("There is no transcript to process yet. Speak in the meeting to generate content for transcription.")
+                    else:
+                        st.info("Processing meeting transcript with AI...")
+                        
+                        # Create meeting record
+                        meeting_id = new_meeting_id()
+                        meeting_title = f"Live Meeting on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                        
+                        # Process with AI
+                        ai_results, process_results = self._analyze_transcript(meeting_id, meeting_title, transcript_data, priority="live")
+                        
+                        st.success(f"Meeting analyzed successfully! Generated {len(process_results.get('action_ids', []))} action items and {len(process_results.get('insight_ids', []))} insights.")
+
+                        skipped_calls = ai_results.get("stats", {}).get("skipped_calls", 0)
+                        if skipped_calls:
+                            st.caption(f"Skipped {skipped_calls} of {len(LEGAL_DOMAINS)} domain analyses with no relevant content.")
+                        
+                        hedged_calls = ai_results.get("stats", {}).get("hedged_calls", 0)
+                        if hedged_calls:
+                            st.caption(f"Sent a duplicate request for {hedged_calls} slow domain analyses.")
+                        
+                        compression = ai_results.get("stats", {}).get("compression")
+                        if compression:
+                            st.caption(f"Transcript compressed from ~{compression['original_tokens']:,} to ~{compression['compressed_tokens']:,} tokens ({compression['reduction']:.0%} smaller).")
+
+                        # Show a button to view the processed meeting
+                        if st.button("View Analysis Results"):
+                            st.session_state.selected_meeting = meeting_id
+                            st.session_state.current_page = "Meeting Details"
+                            st.rerun()  # Use st.rerun() instead of st.experimental_rerun()
+                        
+                except Exception as e:
+                    st.error(f"Error processing transcript: {str(e)}")
+        
+        
+        # Show additional tips
+        with st.expander("Tips for successful meeting analysis"):
+            st.markdown("""
+            - Ensure there is clear speech in the meeting for transcription
+            - Speak about legal topics such as compliance, contracts, or legal risks
+            - Mention specific dates, actions, or requirements to get better insights
+            - The transcript refreshes on its own; click "Refresh Transcript" to fetch new speech right away
+            - Process the transcript to generate legal insights and action items
+            """)
+    
+    def _render_live_transcript(self, bot_id: str):
+        """
+        Show a bot's transcript, appending new utterances as they come in.
+        
+        The utterances fetched so far are drawn once per page run. A fragment
+        then polls MeetStream on its own timer and writes only the new
+        utterances into the transcript container, which keeps what it already
+        shows, so neither the rest of the page nor the earlier utterances are
+        rendered again.
+        """
+        live = st.session_state.get("live_transcript")
+        if live is None or live.bot_id != bot_id:
+            live = st.session_state.live_transcript = LiveTranscript(bot_id)
+        
+        interval = st.select_slider(
+            "Auto-refresh", options=LIVE_REFRESH_OPTIONS, value=LIVE_REFRESH_SECONDS, key="live_refresh_interval",
+            format_func=lambda seconds: f"Every {seconds}s" if seconds else "Off"
+        )
+        transcript_box = st.container(height=LIVE_TRANSCRIPT_HEIGHT)
+        MeetingUI.transcript_lines(transcript_box, live.entries)
+        
+        def refresh():
+            shown = live.offset
+            try:
+                new_entries = live.poll(self.meetstream)
+            except Exception as e:
+                print(f"Failed to poll transcript for bot {bot_id}: {str(e)}")
+                st.warning("Could not retrieve transcript. Make sure there is speech in the meeting.")
+                new_entries = []
+            
+            # The transcript started over, so the container no longer matches it
+            if live.offset < shown:
+                st.rerun()
+            MeetingUI.transcript_lines(transcript_box, new_entries)
+            
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                if live.entries:
+                    updated = datetime.fromtimestamp(live.polled_at).strftime("%H:%M:%S")
+                    st.caption(f"{len(live.entries)} utterances · updated {updated}")
+                else:
+                    st.caption("Waiting for transcript content. Speak in the meeting to generate content for transcription.")
+            with col2:
+                # Clicking a button inside the fragment reruns only the fragment
+                st.button("Refresh Transcript")
+        
+        st.fragment(refresh, run_every=interval or None)()
+
+    
+    def _render_bot_fleet(self, bots: List[Dict[str, Any]]):
+        """Render the workspace's active bots with per-bot and fleet-wide actions."""
+        st.markdown(f"### Active Bots ({len(bots)})")
+        
+        for bot in bots:
+            action = MeetingUI.bot_status_card(bot, selected=bot["bot_id"] == st.session_state.bot_id)
+            if action == "refresh":
+                self.bot_registry.refresh(bot["bot_id"])
+                st.rerun()
+            elif action == "view":
+                st.session_state.bot_id = bot["bot_id"]
+                st.rerun()
+            elif action == "leave":
+                self._leave_meetings([bot["bot_id"]])
+        
+        if len(bots) > 1:
+            bot_ids = [bot["bot_id"] for bot in bots]
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Leave All Meetings", type="primary"):
+                    self._leave_meetings(bot_ids)
+            with col2:
+                if st.button("Process All Transcripts"):
+                    meeting_ids = self._process_bot_transcripts(bot_ids, "Live Meeting")
+                    if meeting_ids:
+                        st.success(f"Analyzed {len(meeting_ids)} meetings. See Meeting History for the results.")
     
+    def _leave_meetings(self, bot_ids: List[str]):
+        """Remove bots from their meetings, analyze their transcripts and open the results."""
+        with st.spinner("Leaving meetings..." if len(bot_ids) > 1 else "Leaving meeting..."):
+            removed = self.bot_registry.remove_bots(bot_ids)
+        
+        left = []
+        for bot_id, result in removed.items():
+            if "error" in result:
+                st.error(f"Error removing bot {bot_id} from meeting: {result['error']}")
+                self.bot_registry.unregister(bot_id)
+            else:
+                left.append(bot_id)
+        if left:
+            st.success("Bot successfully left the meeting!" if len(left) == 1 else f"{len(left)} bots left their meetings.")
+        
+        meeting_ids = self._process_bot_transcripts(left, "Legal Meeting")
+        
+        if st.session_state.bot_id in bot_ids:
+            st.session_state.bot_id = None
+        
+        # Go to the meeting details page, or the history when several meetings were analyzed
+        if len(meeting_ids) == 1:
+            st.session_state.selected_meeting = meeting_ids[0]
+            st.session_state.current_page = "Meeting Details"
+        elif meeting_ids:
+            st.session_state.current_page = "Meeting History"
+        st.rerun()
+    
+    def _process_bot_transcripts(self, bot_ids: List[str], title_prefix: str) -> List[str]:
+        """Fetch the transcripts of several bots in parallel and analyze each; returns the new meeting ids."""
+        if not bot_ids:
+            return []
+        
+        with st.spinner("Fetching transcripts..." if len(bot_ids) > 1 else "Fetching transcript..."):
+            transcripts = self.bot_registry.fetch_transcripts(bot_ids)
+        
+        meeting_ids = []
+        for i, (bot_id, transcript_data) in enumerate(transcripts.items()):
+            if "error" in transcript_data:
+                st.warning(f"Could not process transcript: {transcript_data['error']}")
+                continue
+            if not transcript_data.get("transcript"):
+                st.warning("No transcript content was found to process.")
+                continue
+            
+            st.info("Processing meeting transcript with AI...")
+            
+            # Create meeting record
+            meeting_id = new_meeting_id()
+            meeting_title = f"{title_prefix} on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            
+            # Process with AI
+            ai_results, process_results = self._analyze_transcript(meeting_id, meeting_title, transcript_data, priority="live")
+            
+            st.success(f"Meeting analyzed successfully! Generated {len(process_results.get('action_ids', []))} action items and {len(process_results.get('insight_ids', []))} insights.")
+            meeting_ids.append(meeting_id)
+        
+        return meeting_ids
+    
+    @traced()
     def render_meeting_history(self):
         """Render the meeting history page."""
         st.subheader("Meeting History")
@@ -331,6 +488,7 @@ class PageManager:
             
             st.divider()
     
+    @traced()
     def render_action_items(self):
         """Render the action items page."""
         st.subheader("Legal Action Items")
@@ -341,6 +499,7 @@ class PageManager:
         # Display action items list with filtering
         ActionItemsUI.action_list(self.task_manager, active_domains)
     
+    @traced()
     def render_legal_insights(self):
         """Render the legal insights page."""
         st.subheader("Legal Insights")
@@ -351,6 +510,35 @@ class PageManager:
         # Display insights list with filtering
         InsightsUI.insights_list(self.task_manager, active_domains)
     
+    @traced()
+    def render_ask_archive(self):
+        """Render the question answering page over past meetings."""
+        st.subheader("Ask the Meeting Archive")
+        
+        # Index transcripts, actions and insights added since the last visit
+        self.archive_search.sync(self.task_manager)
+        if not len(self.archive_search.index):
+            st.info("No meetings have been analyzed yet. Analyze a meeting to start asking questions about it.")
+            return
+        st.caption(f"{len(self.archive_search.index):,} passages indexed from {len(self.task_manager.meetings)} meetings.")
+        
+        with st.form("ask_archive_form"):
+            question = st.text_input("Question", placeholder="What did we commit to on the vendor SaaS renewals?")
+            top_k = st.slider("Passages to retrieve", min_value=3, max_value=20, value=8)
+            submitted = st.form_submit_button("Ask")
+        
+        if submitted and question.strip():
+            # Only the best matching passages are sent to the model, never whole transcripts
+            passages = self.archive_search.search(question, top_k)
+            meeting_titles = {meeting.id: meeting.title for meeting in self.task_manager.meetings}
+            with st.spinner("Searching the archive and drafting an answer..."):
+                result = self.ai_processor.answer_question(question, passages, meeting_titles)
+            st.session_state.archive_answer = dict(result, question=question)
+        
+        if st.session_state.get("archive_answer"):
+            ArchiveUI.answer(st.session_state.archive_answer)
+    
+    @traced()
     def render_settings(self):
         """Render the settings page."""
         st.subheader("Application Settings")
@@ -369,6 +557,80 @@ class PageManager:
         with st.expander("OpenAI API Settings"):
             st.text_input("API Key", value="sk-proj-bv5SVUAncVdkNdYJB70UehV0HyHL4PG...", type="password", disabled=True)
             st.selectbox("Model", options=["gpt-4", "gpt-3.5-turbo"], index=0, disabled=True)
+            st.text_input("Triage Model", value=DEFAULT_CASCADE_MODEL, disabled=True,
+                          help="Assesses every domain first; only relevant or uncertain domains are escalated to the main model.")
+        
+        with st.expander("AI Response Quality"):
+            st.caption("Outcomes of structured domain calls since the server started.")
+            json_outcomes = get_json_outcome_counts()
+            cols = st.columns(len(json_outcomes))
+            for col, (outcome, count) in zip(cols, json_outcomes.items()):
+                with col:
+                    st.metric(outcome.capitalize(), count)
+        
+        with st.expander("Hedged Requests"):
+            st.caption("Domain calls still running past the recent p95 latency get a duplicate request; "
+                       "the first reply is used.")
+            hedging = get_hedge_policy().summary()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Hedged", hedging["hedged"])
+            with col2:
+                st.metric("Duplicate Won", hedging["hedge_won"])
+            with col3:
+                st.metric("Over Budget", hedging["over_budget"])
+            for model, delay in hedging["delays"].items():
+                st.caption(f"{model}: " + (f"hedging after {delay:.1f}s" if delay else "collecting latencies"))
+        
+        with st.expander("LLM Usage and Cost"):
+            metrics = get_metrics()
+            meeting_titles = {meeting.id: meeting.title for meeting in self.task_manager.meetings}
+            usage_rows = []
+            for meeting_id in metrics.meeting_ids():
+                usage = metrics.meeting_summary(meeting_id)
+                usage_rows.append({
+                    "Meeting": meeting_titles.get(meeting_id, meeting_id),
+                    "Calls": usage["calls"],
+                    "Prompt Tokens": usage["prompt_tokens"],
+                    "Cached Tokens": usage["cached_tokens"],
+                    "Cache Hit %": round(usage["cache_hit_rate"] * 100, 1),
+                    "Completion Tokens": usage["completion_tokens"],
+                    "Retries": usage["retries"],
+                    "Errors": usage["errors"],
+                    "Latency (s)": usage["latency_total"],
+                    "Cost (USD)": usage["cost"]
+                })
+            
+            if usage_rows:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Calls", sum(row["Calls"] for row in usage_rows))
+                with col2:
+                    st.metric("Tokens", sum(row["Prompt Tokens"] + row["Completion Tokens"] for row in usage_rows))
+                with col3:
+                    st.metric("Estimated Cost", f"${sum(row['Cost (USD)'] for row in usage_rows):.4f}")
+                
+                st.markdown("**Per Meeting**")
+                st.dataframe(usage_rows, hide_index=True, use_container_width=True)
+                
+                st.markdown("**Recent Calls**")
+                st.dataframe(metrics.recent_records(50), hide_index=True, use_container_width=True)
+            else:
+                st.info("No LLM calls have been recorded yet.")
+            
+            prometheus_text = metrics.prometheus_text()
+            st.download_button("Download Prometheus Metrics", prometheus_text,
+                               file_name="meetscribe_llm_metrics.prom", mime="text/plain")
+            if metrics.jsonl_path:
+                st.caption(f"Every call is also appended to {metrics.jsonl_path}")
+        
+        with st.expander("Request Traces"):
+            exporter = get_exporter()
+            if exporter is None:
+                st.info("Tracing is turned off.")
+            else:
+                st.caption(f"Spans are written to {exporter.path}")
+                TraceUI.trace_browser(exporter.read_traces())
         
         # Webhook Settings
         st.markdown("### Webhook Settings")
@@ -395,12 +657,18 @@ class PageManager:
                 st.success("Demo data loaded successfully!")
                 st.rerun()
             
-            if st.button("Clear All Data"):
-                st.session_state.task_manager = LegalTaskManager()
-                self.task_manager = st.session_state.task_manager
+            # The workspace is shared, so clearing it affects every user and needs confirming first
+            confirm_clear = st.checkbox("I understand this deletes all meetings, actions and insights for every user",
+                                        key="confirm_clear_data")
+            if st.button("Clear All Data", disabled=not confirm_clear):
+                self.workspace.reset()
+                self.archive_search.reset()
+                self.task_manager = WorkspaceView(self.workspace)
+                del st.session_state["confirm_clear_data"]
                 st.success("All data cleared successfully!")
                 st.rerun()
     
+    @traced()
     def render_meeting_details(self):
         """Render the meeting details page."""
         meeting_id = st.session_state.get("selected_meeting")
@@ -413,8 +681,58 @@ class PageManager:
             st.session_state.current_page = "Meeting History"
             st.rerun()
         
+        # Re-run analysis from the archived transcript without calling MeetStream
+        meeting = self.task_manager.get_meeting_by_id(meeting_id)
+        if meeting and self.transcript_archive.has(meeting_id) and st.button("Re-run Analysis"):
+            transcript_data = self.transcript_archive.load(meeting_id)
+            transcript_data["speaker_analytics"] = meeting.speaker_analytics
+            self._analyze_transcript(meeting_id, meeting.title, transcript_data, priority="interactive")
+            st.rerun()
+        
         # Show meeting details
-        MeetingDetailsUI.meeting_details(meeting_id, self.task_manager)
+        MeetingDetailsUI.meeting_details(meeting_id, self.task_manager, self.transcript_archive)
+    
+    @traced()
+    def _analyze_transcript(self, meeting_id: str, meeting_title: str, transcript_data: Dict[str, Any],
+                            priority: str = "interactive"):
+        """
+        Run AI analysis on a transcript, store the results and archive the transcript.
+        
+        The summary is rendered as it streams in, and each domain's actions and
+        insights are stored and shown as soon as that domain finishes.
+        """
+        process_results = {"action_ids": [], "insight_ids": [], "meeting_id": meeting_id}
+        self.task_manager.begin_meeting(meeting_id, meeting_title, transcript_data)
+        
+        st.markdown("#### Executive Summary")
+        summary_placeholder = st.empty()
+        domain_container = st.container()
+        summary_parts = []
+        
+        def on_event(event):
+            if event["type"] == "summary_delta":
+                summary_parts.append(event["text"])
+                summary_placeholder.markdown("".join(summary_parts) + " ▌")
+            elif event["type"] == "summary":
+                summary_placeholder.markdown(event["summary"] or "")
+            elif event["type"] == "domain":
+                domain_ids = self.task_manager.ingest_domain_results(meeting_id, event["domain"], event["result"])
+                for key in ("action_ids", "insight_ids"):
+                    process_results[key].extend(i for i in domain_ids[key] if i not in process_results[key])
+                with domain_container:
+                    MeetingDetailsUI.domain_result_panel(event["domain"], event["result"], domain_ids, self.task_manager)
+        
+        ai_results = self.ai_processor.process_transcript(transcript_data, on_event=on_event, priority=priority,
+                                                          meeting_id=meeting_id)
+        self.task_manager.complete_meeting(meeting_id, ai_results.get("summary", ai_results.get("error")))
+        
+        # Keep the transcript locally so it can be re-read without calling MeetStream
+        try:
+            self.transcript_archive.write(meeting_id, transcript_data)
+        except (OSError, ValueError) as e:
+            print(f"Failed to archive transcript for {meeting_id}: {str(e)}")
+        
+        return ai_results, process_results
     
     def _load_demo_data(self):
         """Load demo data for testing the application."""
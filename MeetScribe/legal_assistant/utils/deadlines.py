@@ -0,0 +1,266 @@
+"""
+Normalization of free-text deadlines into calendar dates.
+"""
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+MONTHS["sept"] = 9
+WEEKDAYS = {name.lower(): i for i, name in enumerate(calendar.day_name)}
+WEEKDAYS.update({name.lower()[:3]: i for i, name in enumerate(calendar.day_name)})
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "fourteen": 14, "fifteen": 15, "thirty": 30, "sixty": 60, "ninety": 90
+}
+
+_MONTH = r"(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+_WEEKDAY = r"(" + "|".join(name.lower() for name in calendar.day_name) + r")"
+_NUMBER = r"(\d+|" + "|".join(NUMBER_WORDS) + r")"
+
+_ISO_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_NUMERIC_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b")
+_MONTH_DAY_RE = re.compile(r"\b" + _MONTH + r"\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4}))?")
+_DAY_MONTH_RE = re.compile(r"\b(\d{1,2})(st|nd|rd|th)?\s+(of\s+)?" + _MONTH + r"(?:,?\s+(\d{4}))?")
+# Month names that are also verbs ("Section 3 may apply"), read after a bare number only with a cue
+_VERB_MONTHS = frozenset(["may", "march"])
+_DATE_CUE_RE = re.compile(r"\b(?:by|on|due|before|until|till|from|after)\s+$")
+_RELATIVE_RE = re.compile(r"\b(?:in|within|next)\s+" + _NUMBER +
+                          r"\s+(business\s+|working\s+|calendar\s+)?(day|week|month|year)s?\b")
+_FROM_NOW_RE = re.compile(r"\b" + _NUMBER + r"\s+(business\s+|working\s+)?(day|week|month|year)s?\s+"
+                          r"(?:from\s+(?:now|today|the\s+meeting)|out)\b")
+_PERIOD_END_RE = re.compile(r"\b(?:end\s+of\s+(?:the\s+)?(this\s+|next\s+)?(week|month|quarter|year)"
+                            r"|\b(eow|eom|eoq|eoy))\b")
+_MONTH_END_RE = re.compile(r"\bend\s+of\s+" + _MONTH + r"(?:\s+(\d{4}))?")
+_QUARTER_RE = re.compile(r"\b(?:end\s+of\s+)?q([1-4])(?:\s+(\d{4}))?\b")
+_WEEKDAY_RE = re.compile(r"\b(next\s+|this\s+)?" + _WEEKDAY + r"\b")
+_NEXT_PERIOD_RE = re.compile(r"\bnext\s+(week|month|quarter|year)\b")
+_DAY_WORD_RE = re.compile(r"\b(today|tonight|eod|end\s+of\s+(?:the\s+)?day|tomorrow)\b")
+
+# Words that describe when something is due rather than what is due; ignored when linking deadlines to actions
+DEADLINE_STOPWORDS = frozenset([
+    "a", "an", "and", "as", "at", "be", "before", "by", "complete", "completed", "date",
+    "day", "days", "deadline", "due", "end", "expire", "expires", "for", "from", "in", "is",
+    "later", "month", "months", "must", "need", "needed", "needs", "next", "no", "now", "of",
+    "on", "or", "quarter", "should", "than", "the", "this", "to", "today", "tomorrow", "until",
+    "week", "weeks", "will", "with", "within", "year", "years"
+]) | frozenset(MONTHS) | frozenset(WEEKDAYS) | frozenset(NUMBER_WORDS)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def _as_date(value: Union[date, datetime, str, None]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if value:
+        try:
+            return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+        except ValueError:
+            pass
+    return date.today()
+
+def _number(token: str) -> int:
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+def _year(token: Optional[str]) -> Optional[int]:
+    if not token:
+        return None
+    year = int(token)
+    return year + 2000 if year < 100 else year
+
+def _month_end(year: int, month: int) -> date:
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+def add_months(day: date, months: int) -> date:
+    """Move a date by whole months, clamping to the end of shorter months."""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def add_business_days(day: date, days: int) -> date:
+    """Move a date forward by working days, skipping weekends."""
+    while days > 0:
+        day += timedelta(days=1)
+        if day.weekday() < 5:
+            days -= 1
+    return day
+
+def _calendar_date(year: Optional[int], month: int, day: int, anchor: date) -> Optional[date]:
+    """Build a date, taking a missing year as the next occurrence on or after the anchor."""
+    try:
+        if year is not None:
+            return date(year, month, day)
+        candidate = date(anchor.year, month, day)
+        return candidate if candidate >= anchor else date(anchor.year + 1, month, day)
+    except ValueError:
+        return None
+
+def _offset(anchor: date, amount: int, unit: str, business: bool) -> date:
+    if unit == "day":
+        return add_business_days(anchor, amount) if business else anchor + timedelta(days=amount)
+    if unit == "week":
+        return anchor + timedelta(weeks=amount)
+    if unit == "month":
+        return add_months(anchor, amount)
+    return add_months(anchor, 12 * amount)
+
+def _period_end(anchor: date, period: str, next_period: bool) -> date:
+    if period == "week":
+        # Work weeks end on Friday
+        friday = anchor + timedelta(days=(4 - anchor.weekday()) % 7)
+        return friday + timedelta(weeks=1) if next_period else friday
+    if period == "month":
+        month_start = add_months(anchor.replace(day=1), 1 if next_period else 0)
+        return _month_end(month_start.year, month_start.month)
+    if period == "quarter":
+        start = add_months(anchor.replace(day=1), 3 if next_period else 0)
+        return _month_end(start.year, ((start.month - 1) // 3) * 3 + 3)
+    return date(anchor.year + (1 if next_period else 0), 12, 31)
+
+def _match_absolute(text: str, anchor: date) -> Optional[date]:
+    match = _ISO_RE.search(text)
+    if match:
+        return _calendar_date(int(match.group(1)), int(match.group(2)), int(match.group(3)), anchor)
+
+    match = _MONTH_DAY_RE.search(text)
+    if match:
+        return _calendar_date(_year(match.group(3)), MONTHS[match.group(1)], int(match.group(2)), anchor)
+
+    for match in _DAY_MONTH_RE.finditer(text):
+        day, ordinal, of, month, year = match.groups()
+        if (month not in _VERB_MONTHS or ordinal or of or year
+                or _DATE_CUE_RE.search(text, 0, match.start())):
+            return _calendar_date(_year(year), MONTHS[month], int(day), anchor)
+
+    match = _NUMERIC_RE.search(text)
+    if match:
+        # Numeric dates are read month first
+        return _calendar_date(_year(match.group(3)), int(match.group(1)), int(match.group(2)), anchor)
+
+    match = _MONTH_END_RE.search(text)
+    if match:
+        year = _year(match.group(2))
+        month = MONTHS[match.group(1)]
+        if year is None:
+            year = anchor.year if month >= anchor.month else anchor.year + 1
+        return _month_end(year, month)
+
+    match = _QUARTER_RE.search(text)
+    if match:
+        quarter = int(match.group(1))
+        year = _year(match.group(2))
+        if year is None:
+            year = anchor.year if quarter >= (anchor.month - 1) // 3 + 1 else anchor.year + 1
+        return _month_end(year, quarter * 3)
+    return None
+
+def _match_relative(text: str, anchor: date) -> Optional[date]:
+    for pattern in (_RELATIVE_RE, _FROM_NOW_RE):
+        match = pattern.search(text)
+        if match:
+            return _offset(anchor, _number(match.group(1)), match.group(3), bool(match.group(2)))
+
+    match = _PERIOD_END_RE.search(text)
+    if match:
+        if match.group(3):
+            period = {"eow": "week", "eom": "month", "eoq": "quarter", "eoy": "year"}[match.group(3)]
+            return _period_end(anchor, period, False)
+        return _period_end(anchor, match.group(2), (match.group(1) or "").strip() == "next")
+
+    match = _NEXT_PERIOD_RE.search(text)
+    if match:
+        # "Next week" and friends mean the start of that period
+        period = match.group(1)
+        if period == "week":
+            return anchor + timedelta(days=7 - anchor.weekday())
+        if period == "month":
+            return add_months(anchor.replace(day=1), 1)
+        if period == "quarter":
+            return _period_end(anchor, "quarter", False) + timedelta(days=1)
+        return date(anchor.year + 1, 1, 1)
+
+    match = _DAY_WORD_RE.search(text)
+    if match:
+        return anchor + timedelta(days=1) if match.group(1) == "tomorrow" else anchor
+
+    match = _WEEKDAY_RE.search(text)
+    if match:
+        days_ahead = (WEEKDAYS[match.group(2)] - anchor.weekday()) % 7 or 7
+        if (match.group(1) or "").strip() == "next" and days_ahead < 7 - anchor.weekday():
+            # "Next Friday" said on a Monday means the Friday of the following week
+            days_ahead += 7
+        return anchor + timedelta(days=days_ahead)
+    return None
+
+def parse_deadline(text: Optional[str], anchor: Union[date, datetime, str, None] = None) -> Optional[date]:
+    """
+    Parse a free-text deadline into a date.
+
+    Handles absolute dates (``2025-05-15``, ``May 15, 2025``, ``15 May``,
+    ``5/15``, ``end of June``, ``Q3``) and expressions relative to ``anchor``
+    (``within 2 weeks``, ``in 5 business days``, ``end of month``, ``next
+    Friday``, ``tomorrow``). Relative expressions and dates without a year are
+    resolved against the anchor, normally the meeting date. Returns None when
+    no date can be found.
+    """
+    if not text or not isinstance(text, str):
+        return None
+    anchor_date = _as_date(anchor)
+    lowered = text.lower()
+    return _match_absolute(lowered, anchor_date) or _match_relative(lowered, anchor_date)
+
+def deadline_text(entry: Any) -> str:
+    """Flatten a ``deadlines`` entry, a string or a dict of date and task, into one line of text."""
+    if isinstance(entry, dict):
+        parts = [str(entry.get(key)) for key in ("task", "description", "title", "date", "deadline", "due_date")
+                 if entry.get(key)]
+        return " - ".join(parts)
+    return str(entry) if entry is not None else ""
+
+def subject_tokens(text: str) -> Set[str]:
+    """Return the words of a deadline or action that say what it is about, with dates and filler removed."""
+    tokens = set()
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in DEADLINE_STOPWORDS or token.isdigit() or len(token) < 3:
+            continue
+        # Fold simple plurals and verb forms so "updates" matches "update"
+        tokens.add(token[:-1] if token.endswith("s") and len(token) > 4 else token)
+    return tokens
+
+def match_deadline(entry_text: str, candidates: List[Tuple[str, str]], min_overlap: float = 0.25) -> Optional[str]:
+    """
+    Pick the candidate a deadline is about.
+
+    ``candidates`` are ``(id, text)`` pairs. Each is scored by the share of
+    the smaller word set the two texts have in common; the best candidate at
+    or above ``min_overlap`` wins.
+    """
+    entry_tokens = subject_tokens(entry_text)
+    if not entry_tokens:
+        return None
+
+    best_id, best_score = None, 0.0
+    for candidate_id, candidate_text in candidates:
+        tokens = subject_tokens(candidate_text)
+        if not tokens:
+            continue
+        score = len(entry_tokens & tokens) / min(len(entry_tokens), len(tokens))
+        if score > best_score:
+            best_id, best_score = candidate_id, score
+    return best_id if best_score >= min_overlap else None
+
+def normalize_deadlines(entries: List[Any], anchor: Union[date, datetime, str, None] = None) -> List[Dict[str, Any]]:
+    """Turn a domain's ``deadlines`` list into ``{"text", "due_date"}`` dicts with ISO dates where parseable."""
+    normalized = []
+    for entry in entries or []:
+        text = deadline_text(entry)
+        if not text:
+            continue
+        due = parse_deadline(text, anchor)
+        normalized.append({"text": text, "due_date": due.isoformat() if due else None})
+    return normalized
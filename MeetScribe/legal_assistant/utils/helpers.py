@@ -1,12 +1,12 @@
 """
 Helper utilities for the Legal Assistant application.
 """
-import streamlit as st
-import json
 import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from utils.time_index import TranscriptTimeIndex, format_seconds
+
 def generate_unique_id(prefix: str = "") -> str:
     """Generate a unique ID with an optional prefix."""
     return f"{prefix}{uuid.uuid4().hex[:8]}"
@@ -14,19 +14,12 @@ def generate_unique_id(prefix: str = "") -> str:
 def format_timestamp(timestamp: str) -> str:
     """Format a timestamp into a readable format."""
     # Handle various timestamp formats
-    if ":" in timestamp:  # Already in MM:SS or HH:MM:SS format
+    if isinstance(timestamp, str) and ":" in timestamp:  # Already in MM:SS or HH:MM:SS format
         return timestamp
     
     try:
         # Try to convert from seconds
-        seconds = float(timestamp)
-        minutes, seconds = divmod(seconds, 60)
-        hours, minutes = divmod(minutes, 60)
-        
-        if hours > 0:
-            return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
-        else:
-            return f"{int(minutes):02d}:{int(seconds):02d}"
+        return format_seconds(float(timestamp))
     except (ValueError, TypeError):
         # If conversion fails, return the original
         return timestamp
@@ -51,65 +44,8 @@ def calculate_meeting_duration(transcript_data: Dict[str, Any]) -> int:
     if not transcript:
         return 0
     
-    # Try to get the last timestamp
-    try:
-        last_entry = transcript[-1]
-        last_timestamp = last_entry.get("timestamp", "00:00:00")
-        
-        # Convert HH:MM:SS to seconds
-        parts = last_timestamp.split(":")
-        if len(parts) == 3:
-            hours, minutes, seconds = parts
-            total_seconds = int(hours) * 3600 + int(minutes) * 60 + int(seconds)
-        elif len(parts) == 2:
-            minutes, seconds = parts
-            total_seconds = int(minutes) * 60 + int(seconds)
-        else:
-            total_seconds = 0
-        
-        return total_seconds
-    except (IndexError, ValueError):
-        return 0
-
-def save_to_local_storage(key: str, data: Any) -> bool:
-    """Save data to browser's local storage."""
-    try:
-        # Convert data to JSON string
-        if not isinstance(data, str):
-            data = json.dumps(data)
-        
-        # Use Streamlit's JavaScript to save to local storage
-        js = f"""
-        <script>
-        localStorage.setItem("{key}", JSON.stringify({data}));
-        </script>
-        """
-        st.components.v1.html(js, height=0)
-        return True
-    except Exception:
-        return False
-
-def load_from_local_storage(key: str) -> Optional[Any]:
-    """Load data from browser's local storage."""
-    try:
-        # Use Streamlit's JavaScript to load from local storage
-        js = f"""
-        <script>
-        const data = localStorage.getItem("{key}");
-        const communicationElement = document.getElementById("data-{key}");
-        communicationElement.textContent = data;
-        </script>
-        <div id="data-{key}" style="display:none;"></div>
-        """
-        component = st.components.v1.html(js, height=0)
-        
-        # Get data from the hidden div
-        data = component.get("data-" + key)
-        if data:
-            return json.loads(data)
-        return None
-    except Exception:
-        return None
+    # Use the numeric start/end seconds, falling back to display timestamps
+    return int(round(TranscriptTimeIndex.from_entries(transcript).duration))
 
 def format_legal_reference(reference_type: str, reference_id: str) -> str:
     """Format a legal reference with proper citation style."""
@@ -151,6 +87,9 @@ def extract_key_metrics_from_transcript(transcript_data: Dict[str, Any]) -> Dict
     # Calculate duration
     metrics["duration"] = calculate_meeting_duration(transcript_data)
     
+    # Prefer talk time computed at ingest over the word-count estimate below
+    speaker_analytics = transcript_data.get("speaker_analytics")
+    
     # Count participants and speaking time
     speakers = {}
     keyword_map = {
@@ -164,15 +103,17 @@ def extract_key_metrics_from_transcript(transcript_data: Dict[str, Any]) -> Dict
     keyword_counts = {k: 0 for k in keyword_map.keys()}
     
     for entry in transcript:
-        # Count speakers
-        speaker = entry.get("speaker", "Unknown")
-        if speaker not in speakers:
-            speakers[speaker] = 0
-        
-        # Add speaking time (rough estimate)
         text = entry.get("text", "")
-        word_count = len(text.split())
-        speakers[speaker] += word_count
+        
+        if not speaker_analytics:
+            # Count speakers
+            speaker = entry.get("speaker", "Unknown")
+            if speaker not in speakers:
+                speakers[speaker] = 0
+            
+            # Add speaking time (rough estimate)
+            word_count = len(text.split())
+            speakers[speaker] += word_count
         
         # Count keywords
         lower_text = text.lower()
@@ -181,6 +122,12 @@ def extract_key_metrics_from_transcript(transcript_data: Dict[str, Any]) -> Dict
                 if keyword in lower_text:
                     keyword_counts[category] += 1
     
+    if speaker_analytics:
+        speakers = {
+            speaker: stats["talk_time"]
+            for speaker, stats in speaker_analytics.get("speakers", {}).items()
+        }
+    
     metrics["participant_count"] = len(speakers)
     metrics["speaking_distribution"] = speakers
     metrics["keywords"] = keyword_counts
@@ -0,0 +1,75 @@
+"""
+Local repair of almost-valid JSON returned by language models.
+"""
+import json
+import re
+from typing import Any, Dict, Optional, Tuple
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+def _first_balanced_object(text: str) -> Optional[str]:
+    """Return the first ``{...}`` span whose braces balance, ignoring braces inside strings."""
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        start = text.find("{", start + 1)
+    return None
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        value = json.loads(text)
+    except (ValueError, TypeError):
+        return None
+    return value if isinstance(value, dict) else None
+
+def parse_json_response(text: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Parse a JSON object from model output, repairing common mistakes.
+
+    Returns ``(value, repaired)``. ``value`` is None when no object could be
+    recovered; ``repaired`` is True when the text was not valid JSON as-is.
+    Repairs are: stripping code fences, extracting the first balanced object
+    from surrounding prose and removing trailing commas.
+    """
+    if not isinstance(text, str):
+        return None, False
+
+    value = _loads_object(text.strip())
+    if value is not None:
+        return value, False
+
+    candidate = text
+    fence = _FENCE_RE.search(candidate)
+    if fence:
+        candidate = fence.group(1)
+
+    balanced = _first_balanced_object(candidate)
+    if balanced is not None:
+        candidate = balanced
+
+    for attempt in (candidate, _TRAILING_COMMA_RE.sub(r"\1", candidate)):
+        value = _loads_object(attempt.strip())
+        if value is not None:
+            return value, True
+
+    return None, True
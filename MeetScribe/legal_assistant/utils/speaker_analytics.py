@@ -0,0 +1,105 @@
+"""
+Per-speaker talk-time analytics computed from word-level transcript timing.
+"""
+import numpy as np
+from typing import Dict, Any, List
+
+DEFAULT_TIMELINE_BUCKET_SECONDS = 60
+
+def _flatten_words(entries: List[Dict[str, Any]], speaker_codes: Dict[str, int]):
+    """Collect word timings and utterance bounds from transcript entries as flat lists."""
+    word_speakers, word_starts, word_ends = [], [], []
+    utterance_speakers, utterance_starts, utterance_ends = [], [], []
+
+    for entry in entries:
+        speaker = entry.get("speaker", "Unknown")
+        code = speaker_codes.setdefault(speaker, len(speaker_codes))
+
+        # Raw MeetStream entries carry words; processed entries only utterance bounds
+        words = entry.get("words")
+        if words:
+            starts = [word.get("start", 0.0) for word in words]
+            ends = [word.get("end", word.get("start", 0.0)) for word in words]
+        elif entry.get("start") is not None:
+            starts = [entry["start"]]
+            ends = [entry.get("end", entry["start"])]
+        else:
+            continue
+
+        word_speakers.extend([code] * len(starts))
+        word_starts.extend(starts)
+        word_ends.extend(ends)
+        utterance_speakers.append(code)
+        utterance_starts.append(starts[0])
+        utterance_ends.append(max(ends))
+
+    return (word_speakers, word_starts, word_ends,
+            utterance_speakers, utterance_starts, utterance_ends)
+
+def compute_speaker_analytics(entries: List[Dict[str, Any]],
+                              bucket_seconds: int = DEFAULT_TIMELINE_BUCKET_SECONDS) -> Dict[str, Any]:
+    """
+    Compute talk time, turns, interruptions and a talk-time timeline per speaker.
+
+    Accepts raw MeetStream entries with word-level ``start``/``end`` times, or
+    processed entries with utterance ``start``/``end`` seconds. An interruption
+    is counted for a speaker who starts talking before the previous, different
+    speaker has finished.
+    """
+    speaker_codes = {}
+    (word_speakers, word_starts, word_ends,
+     utterance_speakers, utterance_starts, utterance_ends) = _flatten_words(entries or [], speaker_codes)
+
+    participants = list(speaker_codes.keys())
+    analytics = {
+        "duration": 0,
+        "participants": participants,
+        "speakers": {},
+        "timeline": {"bucket_seconds": bucket_seconds, "series": {}}
+    }
+    if not word_starts:
+        return analytics
+
+    speakers = np.asarray(word_speakers, dtype=np.int64)
+    starts = np.asarray(word_starts, dtype=np.float64)
+    ends = np.maximum(np.asarray(word_ends, dtype=np.float64), starts)
+    origin = starts.min()
+    speaker_count = len(participants)
+
+    # Talk time and word counts per speaker
+    durations = ends - starts
+    talk_time = np.bincount(speakers, weights=durations, minlength=speaker_count)
+    word_counts = np.bincount(speakers, minlength=speaker_count)
+
+    # A turn starts whenever the speaker differs from the previous utterance
+    u_speakers = np.asarray(utterance_speakers, dtype=np.int64)
+    u_starts = np.asarray(utterance_starts, dtype=np.float64)
+    u_ends = np.asarray(utterance_ends, dtype=np.float64)
+    changed = np.ones(len(u_speakers), dtype=bool)
+    changed[1:] = u_speakers[1:] != u_speakers[:-1]
+    turns = np.bincount(u_speakers[changed], minlength=speaker_count)
+
+    # Interruptions: a new speaker starts before everyone before them has stopped
+    prior_end = np.maximum.accumulate(u_ends)[:-1]
+    interrupted = changed[1:] & (u_starts[1:] < prior_end)
+    interruptions = np.bincount(u_speakers[1:][interrupted], minlength=speaker_count)
+
+    # Talk seconds per speaker per time bucket
+    buckets = ((starts - origin) // bucket_seconds).astype(np.int64)
+    bucket_count = int(buckets.max()) + 1
+    timeline = np.bincount(speakers * bucket_count + buckets, weights=durations,
+                           minlength=speaker_count * bucket_count).reshape(speaker_count, bucket_count)
+
+    total_talk = float(talk_time.sum())
+    analytics["duration"] = int(round(float(ends.max() - origin)))
+    for code, speaker in enumerate(participants):
+        analytics["speakers"][speaker] = {
+            "talk_time": round(float(talk_time[code]), 2),
+            "talk_share": round(float(talk_time[code]) / total_talk, 4) if total_talk else 0.0,
+            "turns": int(turns[code]),
+            "interruptions": int(interruptions[code]),
+            "words": int(word_counts[code])
+        }
+        analytics["timeline"]["series"][speaker] = np.round(timeline[code], 2).tolist()
+
+    return analytics
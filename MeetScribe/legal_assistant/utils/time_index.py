@@ -0,0 +1,102 @@
+"""
+Numeric time index for transcript utterances.
+"""
+import numpy as np
+from typing import Dict, Any, List, Tuple
+
+def format_seconds(seconds: float) -> str:
+    """Format seconds as MM:SS, or HH:MM:SS for an hour or more."""
+    total = int(max(seconds, 0))
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+def parse_timestamp(timestamp: str) -> float:
+    """Convert an MM:SS or HH:MM:SS timestamp to seconds."""
+    try:
+        seconds = 0.0
+        for part in str(timestamp).split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return 0.0
+
+class TranscriptTimeIndex:
+    """
+    Start and end seconds of every utterance in a transcript, held as NumPy arrays.
+
+    Utterances are expected in chronological order. Lookups use binary search
+    over the start times, and gap and overlap figures are computed over the
+    whole array at once.
+    """
+
+    def __init__(self, starts, ends):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.maximum(np.asarray(ends, dtype=np.float64), self.starts)
+
+    @classmethod
+    def from_entries(cls, entries: List[Dict[str, Any]]) -> "TranscriptTimeIndex":
+        """Build an index from processed transcript entries."""
+        starts = np.empty(len(entries), dtype=np.float64)
+        ends = np.empty(len(entries), dtype=np.float64)
+        for i, entry in enumerate(entries):
+            # Entries from older transcripts only carry display timestamps
+            start = entry.get("start")
+            if start is None:
+                start = parse_timestamp(entry.get("timestamp", "00:00"))
+            starts[i] = start
+            ends[i] = entry.get("end", start)
+        return cls(starts, ends)
+
+    @classmethod
+    def from_transcript(cls, transcript_data: Dict[str, Any]) -> "TranscriptTimeIndex":
+        """Build an index from a transcript in the MeetStream client's format."""
+        if isinstance(transcript_data, dict):
+            return cls.from_entries(transcript_data.get("transcript", []))
+        return cls.from_entries(transcript_data or [])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the first utterance's start to the last utterance's end."""
+        if not len(self.starts):
+            return 0.0
+        return float(self.ends.max() - self.starts.min())
+
+    def locate(self, seconds: float) -> int:
+        """Return the number of the utterance in progress at ``seconds``."""
+        if not len(self.starts):
+            return 0
+        return max(int(np.searchsorted(self.starts, seconds, side="right")) - 1, 0)
+
+    def window(self, start_seconds: float, end_seconds: float) -> Tuple[int, int]:
+        """Return the ``[lo, hi)`` range of utterances starting within a time window."""
+        lo = int(np.searchsorted(self.starts, start_seconds, side="left"))
+        hi = int(np.searchsorted(self.starts, end_seconds, side="left"))
+        return lo, max(hi, lo)
+
+    def chunks(self, window_seconds: float) -> List[Tuple[int, int]]:
+        """Split the utterances into consecutive ranges covering ``window_seconds`` each."""
+        if not len(self.starts):
+            return []
+        edges = np.arange(self.starts[0], self.starts[-1] + window_seconds, window_seconds)
+        bounds = np.searchsorted(self.starts, edges, side="left")
+        bounds = np.append(bounds, len(self.starts))
+        return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    def gaps(self) -> np.ndarray:
+        """Seconds between each utterance's end and the next start; negative values are overlaps."""
+        return self.starts[1:] - self.ends[:-1]
+
+    def overlaps(self) -> np.ndarray:
+        """Indices of utterances that begin before the previous one has ended."""
+        return np.nonzero(self.gaps() < 0)[0] + 1
+
+    def silence_seconds(self) -> float:
+        """Total silence between consecutive utterances."""
+        gaps = self.gaps()
+        return float(gaps[gaps > 0].sum())
@@ -0,0 +1,196 @@
+"""
+Lightweight tracing of the fetch, analyze, ingest and render path.
+
+Spans use OpenTelemetry's data model (trace and span ids, parent links, start
+and end times in Unix nanoseconds, attributes and a status) and are written as
+JSON lines by a local file exporter.
+"""
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable, Iterator
+
+TRACES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "traces")
+TRACE_FILE_PATH = os.path.join(TRACES_DIR, "spans.jsonl")
+
+# The trace file is rotated to ``<path>.1`` once it grows past this size, replacing the previous backup
+TRACE_MAX_BYTES = 10 * 1024 * 1024
+TRACE_READ_CHUNK = 64 * 1024
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.status = "OK"
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.thread = threading.current_thread().name
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException):
+        self.status = "ERROR"
+        self.attributes["exception.type"] = type(error).__name__
+        self.attributes["exception.message"] = str(error)[:500]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+            "thread": self.thread
+        }
+
+def _tail_lines(path: str, max_lines: int) -> List[str]:
+    """Return up to the last ``max_lines`` complete lines of a file, reading backwards from its end."""
+    if max_lines <= 0:
+        return []
+    try:
+        with open(path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b""
+            while position > 0 and data.count(b"\n") <= max_lines:
+                step = min(TRACE_READ_CHUNK, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+    except OSError:
+        return []
+
+    lines = data.split(b"\n")
+    if position > 0:
+        lines = lines[1:]  # the first line was cut off by the last chunk boundary
+    return [line.decode("utf-8", "replace") for line in lines[-max_lines - 1:] if line.strip()][-max_lines:]
+
+class FileSpanExporter:
+    """
+    Appends finished spans to a JSON lines file, rotating it by size.
+
+    Once the file passes ``max_bytes`` it is renamed to ``<path>.1``, replacing
+    the previous backup, so the traces on disk never take more than about
+    twice that. Reads take the tail of the files without blocking exports.
+    """
+
+    def __init__(self, path: str = TRACE_FILE_PATH, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def backup_path(self) -> str:
+        return self.path + ".1"
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+                    size = f.tell()
+                if size >= self.max_bytes:
+                    os.replace(self.path, self.backup_path)
+            except OSError as e:
+                print(f"Failed to export span: {str(e)}")
+
+    def read_traces(self, limit: int = 20, max_spans: int = 5000) -> List[List[Dict[str, Any]]]:
+        """Return the most recent traces, newest first, each as a list of spans ordered by start time."""
+        # Exports only ever append or rename, so a read sees whole lines apart from
+        # possibly a half-written last one, which fails to parse and is skipped
+        lines = _tail_lines(self.path, max_spans)
+        if len(lines) < max_spans:
+            lines = _tail_lines(self.backup_path, max_spans - len(lines)) + lines
+        if not lines:
+            return []
+
+        # A rotation between the two reads shows the same spans in both files
+        traces = OrderedDict()
+        seen = set()
+        for line in lines:
+            try:
+                span = json.loads(line)
+            except ValueError:
+                continue
+            if span["spanId"] in seen:
+                continue
+            seen.add(span["spanId"])
+            traces.setdefault(span["traceId"], []).append(span)
+
+        recent = list(traces.values())[-limit:]
+        recent.reverse()
+        return [sorted(spans, key=lambda s: s["startTimeUnixNano"]) for spans in recent]
+
+_exporter: Optional[FileSpanExporter] = FileSpanExporter()
+
+def get_exporter() -> Optional[FileSpanExporter]:
+    return _exporter
+
+def set_exporter(exporter: Optional[FileSpanExporter]):
+    """Replace the span exporter; None turns tracing off."""
+    global _exporter
+    _exporter = exporter
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the current span, or as a new trace."""
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    trace_id = parent.trace_id if parent else secrets.token_hex(16)
+    new_span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+    token = _current_span.set(new_span)
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.record_exception(e)
+        raise
+    finally:
+        new_span.end_ns = time.time_ns()
+        _current_span.reset(token)
+        exporter.export(new_span)
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator that wraps each call of a function in a span named after it."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def propagate(fn: Callable) -> Callable:
+    """Bind ``fn`` to the caller's context so spans it opens on another thread join the caller's trace."""
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return wrapper